@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+Assistant Runs
+Runs the finder's OpenAI Assistant without a fixed 1-second polling loop.
+Runs are streamed, so completion is noticed as soon as the server sends it;
+if the stream can't be opened or drops, the run is polled with adaptive
+backoff instead. Threads are pooled and reused across calls, and runs that
+time out are cancelled and their thread discarded.
+"""
+
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+from timing import span
+
+ASSISTANT_ID = os.getenv('OPENAI_ASSISTANT_ID', 'asst_FCWGkak9AJ9iyGdQJAGmAlF4')
+
+# Give up on (and cancel) a run after this long, in seconds
+ASSISTANT_RUN_TIMEOUT_SECONDS = float(os.getenv('ASSISTANT_RUN_TIMEOUT_SECONDS', '60'))
+
+# Retire a pooled thread after this many runs (keeps thread history bounded)
+ASSISTANT_THREAD_MAX_RUNS = int(os.getenv('ASSISTANT_THREAD_MAX_RUNS', '50'))
+
+# Poll backoff when streaming isn't available: first wait, growth factor, cap (seconds)
+POLL_INITIAL_SECONDS = 0.2
+POLL_BACKOFF = 1.5
+POLL_MAX_SECONDS = 2.0
+
+TERMINAL_STATUSES = ('completed', 'failed', 'cancelled', 'expired', 'incomplete', 'requires_action')
+
+# Each run only sees its own prompt, so a reused thread's history costs no tokens
+RUN_TRUNCATION = {"type": "last_messages", "last_messages": 1}
+
+
+class AssistantRunError(Exception):
+    """The run failed, was cancelled or timed out"""
+
+
+class _StreamLost(Exception):
+    """The event stream ended before the run did; carries the run id to poll"""
+
+    def __init__(self, run_id: Optional[str], cause: Exception):
+        super().__init__(str(cause))
+        self.run_id = run_id
+
+
+def _message_text(message) -> str:
+    return ''.join(block.text.value for block in message.content if getattr(block, 'type', '') == 'text')
+
+
+def _run_error(run) -> AssistantRunError:
+    error_msg = f"Assistant run failed with status: {run.status}"
+    if getattr(run, 'last_error', None):
+        error_msg += f" - {run.last_error}"
+    return AssistantRunError(error_msg)
+
+
+class AssistantThreadPool:
+    """Idle assistant threads, handed to one run at a time (a thread can't hold two active runs)"""
+
+    def __init__(self, max_runs: int = ASSISTANT_THREAD_MAX_RUNS):
+        self.max_runs = max_runs
+        self._idle: List[Tuple[str, int]] = []  # (thread_id, runs so far)
+        self._lock = threading.Lock()
+        self.created = 0
+        self.reused = 0
+        self.discarded = 0
+
+    def acquire(self, client) -> Tuple[str, int]:
+        with self._lock:
+            if self._idle:
+                self.reused += 1
+                return self._idle.pop()
+        thread = client.beta.threads.create()
+        with self._lock:
+            self.created += 1
+        return thread.id, 0
+
+    def release(self, client, thread_id: str, runs: int, reusable: bool) -> None:
+        """Return a thread to the pool, or delete it if it failed or has done max_runs"""
+        if reusable and runs < self.max_runs:
+            with self._lock:
+                self._idle.append((thread_id, runs))
+            return
+        with self._lock:
+            self.discarded += 1
+        try:
+            client.beta.threads.delete(thread_id)
+        except Exception as e:
+            print(f"⚠️  Could not delete assistant thread {thread_id}: {e}")
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "idle": len(self._idle),
+                "created": self.created,
+                "reused": self.reused,
+                "discarded": self.discarded,
+            }
+
+
+class AssistantRunner:
+    """Send one prompt to the assistant and return its reply"""
+
+    def __init__(self, assistant_id: str = ASSISTANT_ID, timeout: float = ASSISTANT_RUN_TIMEOUT_SECONDS,
+                 pool: Optional[AssistantThreadPool] = None):
+        self.assistant_id = assistant_id
+        self.timeout = timeout
+        self.pool = pool or AssistantThreadPool()
+
+    def complete(self, client, prompt: str) -> str:
+        """Run the assistant on prompt in a pooled thread; raises AssistantRunError on failure or timeout"""
+        thread_id, runs = self.pool.acquire(client)
+        reusable = False
+        try:
+            client.beta.threads.messages.create(thread_id=thread_id, role="user", content=prompt)
+            with span('llm_assistant_run'):
+                text = self._run(client, thread_id, time.monotonic() + self.timeout)
+            reusable = True
+            return text
+        finally:
+            self.pool.release(client, thread_id, runs + 1, reusable)
+
+    def _run(self, client, thread_id: str, deadline: float) -> str:
+        try:
+            return self._stream_run(client, thread_id, deadline)
+        except _StreamLost as e:
+            print(f"⚠️  Assistant run stream unavailable ({e}) - polling instead")
+            if e.run_id is None:
+                run = client.beta.threads.runs.create(
+                    thread_id=thread_id, assistant_id=self.assistant_id, truncation_strategy=RUN_TRUNCATION
+                )
+                return self._poll_run(client, thread_id, run, deadline)
+            run = client.beta.threads.runs.retrieve(thread_id=thread_id, run_id=e.run_id)
+            return self._poll_run(client, thread_id, run, deadline)
+
+    def _stream_run(self, client, thread_id: str, deadline: float) -> str:
+        """
+        Create the run with stream=True and read events until it ends
+
+        A watchdog fires at the deadline even if no event arrives: it cancels
+        the run and closes the stream, so a stalled stream can't block the
+        read past ASSISTANT_RUN_TIMEOUT_SECONDS.
+        """
+        run_id = None
+        text = None
+        try:
+            stream = client.beta.threads.runs.create(
+                thread_id=thread_id,
+                assistant_id=self.assistant_id,
+                truncation_strategy=RUN_TRUNCATION,
+                stream=True,
+                timeout=max(1.0, deadline - time.monotonic()),
+            )
+        except Exception as e:
+            raise _StreamLost(None, e)
+
+        timed_out = threading.Event()
+
+        def on_deadline() -> None:
+            timed_out.set()
+            self._cancel(client, thread_id, run_id)
+            stream.close()
+
+        watchdog = threading.Timer(max(0.0, deadline - time.monotonic()), on_deadline)
+        watchdog.daemon = True
+        watchdog.start()
+        try:
+            for event in stream:
+                if timed_out.is_set():
+                    break
+                if event.event == 'thread.run.created':
+                    run_id = event.data.id
+                elif event.event == 'thread.message.completed':
+                    text = _message_text(event.data)
+                elif event.event == 'thread.run.completed':
+                    if text is None:
+                        return self._latest_reply(client, thread_id, event.data.id)
+                    return text
+                elif (event.event.startswith('thread.run.') and not event.event.startswith('thread.run.step.')
+                      and getattr(event.data, 'status', None) in TERMINAL_STATUSES):
+                    self._cancel(client, thread_id, event.data)
+                    raise _run_error(event.data)
+                elif event.event == 'error':
+                    raise AssistantRunError(f"Assistant stream error: {event.data}")
+        except AssistantRunError:
+            if timed_out.is_set():
+                raise self._timeout_error()
+            raise
+        except Exception as e:
+            if timed_out.is_set() or time.monotonic() > deadline:
+                raise self._timeout_error()
+            raise _StreamLost(run_id, e)
+        finally:
+            watchdog.cancel()
+            stream.close()
+        if timed_out.is_set():
+            raise self._timeout_error()
+        raise _StreamLost(run_id, Exception("stream ended before the run completed"))
+
+    def _timeout_error(self) -> AssistantRunError:
+        return AssistantRunError(f"Assistant run timed out after {self.timeout:g}s")
+
+    def _poll_run(self, client, thread_id: str, run, deadline: float) -> str:
+        """Poll with growing waits (fast runs are seen quickly, slow ones cost few requests)"""
+        wait = POLL_INITIAL_SECONDS
+        while run.status not in TERMINAL_STATUSES:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                self._cancel(client, thread_id, run)
+                raise self._timeout_error()
+            time.sleep(min(wait, remaining))
+            wait = min(wait * POLL_BACKOFF, POLL_MAX_SECONDS)
+            run = client.beta.threads.runs.retrieve(thread_id=thread_id, run_id=run.id)
+        if run.status != 'completed':
+            self._cancel(client, thread_id, run)
+            raise _run_error(run)
+        return self._latest_reply(client, thread_id, run.id)
+
+    def _latest_reply(self, client, thread_id: str, run_id: str) -> str:
+        messages = client.beta.threads.messages.list(thread_id=thread_id, run_id=run_id, order='desc', limit=1)
+        if not messages.data:
+            raise AssistantRunError("No response from assistant")
+        return _message_text(messages.data[0])
+
+    def _cancel(self, client, thread_id: str, run) -> None:
+        """Cancel a run that is still active (run object or id); best effort"""
+        if run is None:
+            return
+        if getattr(run, 'status', None) in TERMINAL_STATUSES and run.status != 'requires_action':
+            return
+        run_id = run if isinstance(run, str) else run.id
+        try:
+            client.beta.threads.runs.cancel(thread_id=thread_id, run_id=run_id)
+            print(f"🛑 Cancelled assistant run {run_id}")
+        except Exception as e:
+            print(f"⚠️  Could not cancel assistant run {run_id}: {e}")
+
+
+# Shared by every request in this process
+assistant_runner = AssistantRunner()
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Batch Scoring
+Column-wise (NumPy) computation of match scores, estimated engagement metrics,
+evaluator scores and interest quotients. Callers pass arrays of follower
+counts, tiers and match flags; every derived metric is one array expression,
+so scoring thousands of influencers takes milliseconds.
+"""
+
+from typing import Dict, List, Optional, Sequence
+import numpy as np
+from follower_count import parse_follower_count
+
+# Estimated engagement per tier: (engagement rate %, likes ratio, comments ratio)
+TIER_ENGAGEMENT = {
+    'Top/Macro': (1.5, 0.015, 0.001),
+    'Mid-tier': (2.5, 0.025, 0.002),
+    'Micro': (4.0, 0.04, 0.003),
+    'Nano': (6.0, 0.06, 0.005),
+}
+DEFAULT_ENGAGEMENT = (3.0, 0.03, 0.002)
+
+# match_score starts here; each flag set on an influencer adds its boost
+BASE_MATCH_SCORE = 70
+MATCH_BOOSTS = {
+    'matches_industry': 10,
+    'matches_location': 5,
+    'has_email': 5,            # better contactability
+    'has_contact_link': 5,
+    'has_use_case': 5,         # clear collaboration purpose
+    'is_top_macro': 10,        # more reach
+    'has_real_data': 15,       # real data from social APIs
+}
+MIN_MATCH_SCORE = 10
+MAX_MATCH_SCORE = 100
+
+_TIER_NAMES = list(TIER_ENGAGEMENT)
+_TIER_TABLE = np.array(list(TIER_ENGAGEMENT.values()) + [DEFAULT_ENGAGEMENT])  # last row = any other tier
+
+
+def has_real_email(email) -> bool:
+    """Email that isn't a made-up example.com placeholder"""
+    email = str(email or '')
+    return bool(email.strip()) and '@' in email and 'example.com' not in email.lower()
+
+
+def influencer_columns(influencers: Sequence[Dict]) -> Dict[str, np.ndarray]:
+    """Follower counts, tiers and boost flags of influencer dicts as arrays"""
+    return {
+        'follower_count': np.array([
+            parse_follower_count(inf.get('follower_count')) or parse_follower_count(inf.get('followers'))
+            for inf in influencers
+        ], dtype=np.float64),
+        'tier': np.array([inf.get('tier') or 'Emerging' for inf in influencers], dtype=object),
+        'has_email': np.array([has_real_email(inf.get('email')) for inf in influencers], dtype=bool),
+        'has_contact_link': np.array([bool(str(inf.get('contact_link') or '').strip()) for inf in influencers], dtype=bool),
+        'has_use_case': np.array([bool(str(inf.get('use_case') or '').strip()) for inf in influencers], dtype=bool),
+        'has_real_data': np.array([
+            bool(inf.get('real_instagram') or inf.get('real_twitter') or inf.get('real_linkedin'))
+            for inf in influencers
+        ], dtype=bool),
+    }
+
+
+def tier_codes(tiers: np.ndarray) -> np.ndarray:
+    """Row of _TIER_TABLE for each tier name"""
+    codes = np.full(len(tiers), len(_TIER_NAMES), dtype=np.intp)
+    for code, name in enumerate(_TIER_NAMES):
+        codes[tiers == name] = code
+    return codes
+
+
+def estimated_metrics(follower_counts: np.ndarray, tiers: np.ndarray) -> Dict[str, np.ndarray]:
+    """Estimated engagement rate, likes/comments per post and reach from tier averages"""
+    rates = _TIER_TABLE[tier_codes(tiers)]
+    engagement_rate, likes_ratio, comments_ratio = rates[:, 0], rates[:, 1], rates[:, 2]
+    return {
+        'engagement_rate': np.round(engagement_rate, 2),
+        'avg_likes_per_post': (follower_counts * likes_ratio).astype(np.int64),
+        'avg_comments_per_post': (follower_counts * comments_ratio).astype(np.int64),
+        'estimated_reach': (follower_counts * (engagement_rate / 100)).astype(np.int64),
+    }
+
+
+def match_scores(columns: Dict[str, np.ndarray], keyword_boost: Optional[np.ndarray] = None,
+                 rank_penalty: bool = True) -> np.ndarray:
+    """
+    match_score per influencer
+
+    BASE_MATCH_SCORE plus keyword_boost plus MATCH_BOOSTS for each flag
+    column present (is_top_macro is derived from 'tier'), minus the list
+    position when rank_penalty is set, clipped to 10-100.
+    """
+    size = len(columns['follower_count'])
+    scores = np.full(size, float(BASE_MATCH_SCORE))
+    if keyword_boost is not None:
+        scores += keyword_boost
+    flags = dict(columns)
+    if 'tier' in columns:
+        flags['is_top_macro'] = columns['tier'] == 'Top/Macro'
+    for name, boost in MATCH_BOOSTS.items():
+        if name in flags:
+            scores += boost * flags[name].astype(bool)
+    if rank_penalty:
+        scores -= np.arange(size)
+    return np.clip(np.trunc(scores), MIN_MATCH_SCORE, MAX_MATCH_SCORE).astype(np.int64)
+
+
+def score_influencers(influencers: List[Dict], keyword_boost: Optional[np.ndarray] = None,
+                      flags: Optional[Dict[str, np.ndarray]] = None,
+                      rank_penalty: bool = True) -> List[Dict]:
+    """
+    Set match_score, estimated metrics and data_source on influencer dicts
+
+    flags adds boost columns computed by the caller (e.g. matches_industry).
+    Estimated metrics only fill fields that are empty, and only for
+    influencers without real Instagram/Twitter data.
+    """
+    if not influencers:
+        return influencers
+    columns = influencer_columns(influencers)
+    columns.update(flags or {})
+    scores = match_scores(columns, keyword_boost, rank_penalty).tolist()
+    estimates = {name: values.tolist() for name, values in estimated_metrics(columns['follower_count'], columns['tier']).items()}
+    real_data = columns['has_real_data'].tolist()
+    for i, inf in enumerate(influencers):
+        inf['match_score'] = scores[i]
+        if not inf.get('real_instagram') and not inf.get('real_twitter'):
+            for name, values in estimates.items():
+                if not inf.get(name):
+                    inf[name] = values[i]
+        inf['data_source'] = 'real' if real_data[i] else 'estimated'
+    return influencers
+
+
+def evaluation_scores(platform_counts: np.ndarray) -> Dict[str, np.ndarray]:
+    """InfluencerEvaluator's outreach/reactions/views/engagement/overall scores from social platform counts"""
+    platform_counts = np.asarray(platform_counts)
+    outreach = np.minimum(100, platform_counts * 20)
+    reactions = np.where(platform_counts >= 3, 70, 50)
+    views = np.where(platform_counts >= 2, 65, 40)
+    mean = np.round((outreach + reactions + views) / 3, 2)
+    return {
+        'outreach_score': outreach,
+        'reactions_score': reactions,
+        'views_score': views,
+        'engagement_rate': mean,
+        'overall_score': mean,
+    }
+
+
+def interest_quotients(engagement: np.ndarray, content_quality: np.ndarray, relevance: np.ndarray) -> np.ndarray:
+    """Interest Quotient = engagement x content quality x relevance / 10000, rounded to 2 places"""
+    return np.round(np.asarray(engagement, dtype=np.float64) * content_quality * relevance / 10000, 2)
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Follower Count Parser Benchmark
+Compares parse_follower_count (cold and memoized) with the inline K/M parsing
+it replaced, on follower strings from the bundled influencer CSV
+
+Usage: python bench_follower_count.py [iterations]
+"""
+
+import csv
+import os
+import sys
+import timeit
+from follower_count import _parse_text, parse_follower_count
+
+CSV_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '800_influencers_balanced.csv')
+
+EXTRA_SAMPLES = ['1.2M', '12,500', '50K+', '3 lakh', '1.5 crore', '1,20,000', '250K', '5K', '45,000']
+
+
+def legacy_parse(value) -> float:
+    """The inline parsing previously copied across the finder, filters and tiering"""
+    followers_str = str(value if value is not None else '0').upper()
+    try:
+        clean_str = followers_str.replace(',', '').replace(' ', '').strip()
+        if 'K' in clean_str:
+            return float(clean_str.replace('K', '')) * 1000
+        elif 'M' in clean_str:
+            return float(clean_str.replace('M', '')) * 1000000
+        else:
+            return float(clean_str) if clean_str else 0
+    except:
+        return 0
+
+
+def load_samples():
+    samples = list(EXTRA_SAMPLES)
+    if os.path.exists(CSV_PATH):
+        with open(CSV_PATH, newline='', encoding='utf-8') as f:
+            samples.extend(row.get('followers', '') for row in csv.DictReader(f))
+    return samples
+
+
+def bench(label: str, fn, samples, iterations: int, setup=None) -> float:
+    def run():
+        for value in samples:
+            fn(value)
+
+    timer = timeit.Timer(run, setup=setup or (lambda: None))
+    best = min(timer.repeat(repeat=5, number=iterations))
+    per_call_ns = best / (iterations * len(samples)) * 1e9
+    print(f"   {label:<32} {per_call_ns:8.1f} ns/call")
+    return per_call_ns
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    samples = load_samples()
+    print(f"📊 {len(samples)} follower values x {iterations} iterations (best of 5)")
+
+    bench("legacy inline K/M parsing", legacy_parse, samples, iterations)
+    bench("parse_follower_count (cold)", parse_follower_count, samples, 1, setup=_parse_text.cache_clear)
+    bench("parse_follower_count (memoized)", parse_follower_count, samples, iterations)
+    bench("int follower_count (ingested)", parse_follower_count, [parse_follower_count(s) for s in samples], iterations)
+
+    disagreements = [s for s in samples if legacy_parse(s) and int(legacy_parse(s)) != parse_follower_count(s)]
+    unparsed_by_legacy = [s for s in samples if s and not legacy_parse(s) and parse_follower_count(s)]
+    print(f"✅ Values legacy parsing got wrong or dropped: {len(disagreements) + len(unparsed_by_legacy)}"
+          f" (e.g. {(unparsed_by_legacy + disagreements)[:5]})")
+
+
+if __name__ == '__main__':
+    main()
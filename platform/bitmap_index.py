@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Bitmap Index
+One bitmap (a Python int, bit n = row n) per value of each categorical column.
+Multi-filter queries are bitwise AND across columns / OR within a column, and
+facet counts are popcounts of (matching rows & value bitmap).
+"""
+
+import threading
+from typing import Dict, Iterable, List, Optional
+import numpy as np
+
+
+def bitmap_from_rows(rows: Iterable[int], size: int) -> int:
+    """Bitmap with the given row bits set"""
+    bits = np.zeros(size, dtype=np.uint8)
+    rows = np.fromiter(rows, dtype=np.int64)
+    if not len(rows):
+        return 0
+    bits[rows] = 1
+    return int.from_bytes(np.packbits(bits, bitorder='little').tobytes(), 'little')
+
+
+def bitmap_rows(bitmap: int, size: int) -> List[int]:
+    """Row numbers set in bitmap, ascending"""
+    if not bitmap:
+        return []
+    packed = np.frombuffer(bitmap.to_bytes((size + 7) // 8, 'little'), dtype=np.uint8)
+    return np.flatnonzero(np.unpackbits(packed, bitorder='little')[:size]).tolist()
+
+
+class BitmapIndex:
+    """
+    Per-column value -> row bitmap
+
+    Rows are appended in order. New rows are buffered as row lists and folded
+    into the bitmaps on the next read, so bulk loads build each bitmap once.
+    """
+
+    def __init__(self, columns: Iterable[str]):
+        self.columns = tuple(columns)
+        self.size = 0
+        self._bitmaps: Dict[str, Dict[str, int]] = {column: {} for column in self.columns}
+        self._pending: Dict[str, Dict[str, List[int]]] = {column: {} for column in self.columns}
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self.size
+
+    def add(self, values: Dict[str, str]) -> int:
+        """Append a row with one value per column ('' = no value); returns its row number"""
+        with self._lock:
+            row = self.size
+            for column in self.columns:
+                value = values.get(column) or ''
+                if value:
+                    self._pending[column].setdefault(value, []).append(row)
+            self.size += 1
+            self._dirty = True
+            return row
+
+    def _flush(self) -> None:
+        """Fold buffered rows into the bitmaps (caller holds the lock)"""
+        if not self._dirty:
+            return
+        for column, pending in self._pending.items():
+            bitmaps = self._bitmaps[column]
+            for value, rows in pending.items():
+                bitmaps[value] = bitmaps.get(value, 0) | bitmap_from_rows(rows, self.size)
+            pending.clear()
+        self._dirty = False
+
+    def all_rows(self) -> int:
+        return (1 << self.size) - 1
+
+    def values(self, column: str) -> List[str]:
+        with self._lock:
+            self._flush()
+            return list(self._bitmaps[column])
+
+    def any_of(self, column: str, values: Iterable[str]) -> int:
+        """Rows whose column holds any of values (OR of their bitmaps)"""
+        with self._lock:
+            self._flush()
+            bitmaps = self._bitmaps[column]
+            result = 0
+            for value in values:
+                result |= bitmaps.get(value, 0)
+            return result
+
+    def query(self, filters: Dict[str, Iterable[str]], mask: Optional[int] = None) -> int:
+        """
+        Rows matching every column filter (AND across columns, OR within one)
+
+        mask optionally restricts the result further (e.g. a range or keyword
+        bitmap built with bitmap_from_rows).
+        """
+        result = self.all_rows() if mask is None else mask
+        for column, values in filters.items():
+            if not result:
+                break
+            result &= self.any_of(column, values)
+        return result
+
+    def facet_counts(self, column: str, mask: Optional[int] = None) -> Dict[str, int]:
+        """Rows per value of column among mask (all rows if None), largest first, zero counts dropped"""
+        with self._lock:
+            self._flush()
+            bitmaps = self._bitmaps[column]
+            if mask is None:
+                counts = {value: bitmap.bit_count() for value, bitmap in bitmaps.items()}
+            else:
+                counts = {value: (bitmap & mask).bit_count() for value, bitmap in bitmaps.items()}
+        return dict(sorted(((v, c) for v, c in counts.items() if c), key=lambda item: (-item[1], item[0])))
+
+    def facets(self, filters: Dict[str, Iterable[str]], mask: Optional[int] = None,
+               columns: Optional[Iterable[str]] = None) -> Dict[str, Dict[str, int]]:
+        """
+        Facet counts for each column under the current filters
+
+        Each column is counted with every filter except its own, so selecting
+        one value still shows the counts for its alternatives.
+        """
+        facets = {}
+        for column in (self.columns if columns is None else columns):
+            others = {name: values for name, values in filters.items() if name != column}
+            facets[column] = self.facet_counts(column, self.query(others, mask))
+        return facets
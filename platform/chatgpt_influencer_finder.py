@@ -7,7 +7,19 @@ No database or CSV files needed
 
 import os
 import json
-from typing import List, Dict, Optional
+from contextlib import closing
+from typing import Iterator, List, Dict, Optional, Tuple
+import time
+from assistant_runs import assistant_runner
+from client_registry import get_influencer_store, get_llm_cache, get_openai_client
+from finder_shards import FINDER_SHARD_SIZE, plan_shards, run_shards, stream_shards
+from follower_count import parse_follower_count
+from influencer_store import normalize_name
+from json_stream import JSONObjectStream, salvage_json_objects
+from llm_cache import cached_completion, cached_stream
+from metrics import FALLBACK_RESPONSES, LLM_RESPONSE_RECOVERIES, track_llm_call
+from range_index import tier_for_count
+from timing import record, span
 
 # Load environment variables from .env file
 try:
@@ -35,6 +47,14 @@ except:
         HAS_LANGCHAIN = False
         HAS_OPENAI = False
 
+FINDER_MODEL = "gpt-4o-mini"  # Fast and accurate model
+FINDER_TEMPERATURE = 0.7  # More natural, like normal ChatGPT conversation
+
+FINDER_SYSTEM_PROMPT = "You are helpful and knowledgeable about social media influencers. You know real influencers across Instagram, YouTube, Twitter, LinkedIn, and other platforms."
+
+# Names listed in the prompt's "already have" exclusion (longer lists mostly cost tokens)
+MAX_EXCLUDED_NAMES = 50
+
 
 class ChatGPTInfluencerFinder:
     """Find influencers using ChatGPT API based on client requirements"""
@@ -77,8 +97,8 @@ class ChatGPTInfluencerFinder:
             try:
                 if HAS_LANGCHAIN:
                     self.llm = ChatOpenAI(
-                        model_name="gpt-4o-mini",  # Fast and accurate model
-                        temperature=0.7,  # More natural, like normal ChatGPT conversation
+                        model_name=FINDER_MODEL,
+                        temperature=FINDER_TEMPERATURE,
                         openai_api_key=self.openai_api_key
                     )
                     print("✅ ChatGPT initialized with LangChain")
@@ -99,7 +119,8 @@ class ChatGPTInfluencerFinder:
             print(f"   Looking for .env at: {os.path.join(os.path.dirname(__file__), '.env')}")
             self.llm = None
     
-    def find_influencers(self, filters: Dict, limit: int = 10) -> List[Dict]:
+    def find_influencers(self, filters: Dict, limit: int = 10, exclude_names: Optional[List[str]] = None,
+                         shard_hint: Optional[str] = None) -> List[Dict]:
         """
         Find influencers based on client requirements using ChatGPT
         
@@ -112,6 +133,11 @@ class ChatGPTInfluencerFinder:
                 - product_type: Type of product to promote
                 - min_followers: Minimum followers (optional)
             limit: Maximum number of influencers to return
+            exclude_names: Influencers we already have; ChatGPT is asked to
+                skip them and any it returns anyway are dropped
+            shard_hint: Extra condition for one shard of a split search
+                (e.g. "with 100,000-1,000,000 followers"); searches for more
+                than FINDER_SHARD_SIZE influencers are split into parallel shards
         
         Returns:
             List of influencer dictionaries
@@ -120,120 +146,291 @@ class ChatGPTInfluencerFinder:
             print("❌ ChatGPT API not available - using fallback influencers")
             print("💡 To use ChatGPT API, set OPENAI_API_KEY in .env file")
             print(f"   Expected location: {os.path.join(os.path.dirname(__file__), '.env')}")
-            return self._get_fallback_influencers(filters, limit)
+            return self._get_fallback_influencers(filters, limit, reason='llm_unavailable')
+        
+        if shard_hint is None and limit > FINDER_SHARD_SIZE:
+            return self._find_sharded(filters, limit, exclude_names)
         
         try:
             # Debug: Print what filters we received
             print(f"📋 Filters received: {json.dumps(filters, indent=2)}")
             
             # Build prompt for ChatGPT
-            prompt = self._build_finder_prompt(filters, limit)
+            with span('prompt_build'):
+                prompt = self._build_finder_prompt(filters, limit, exclude_names, shard_hint)
             
             # Debug: Print the prompt being sent (first 500 chars)
             print(f"📝 Prompt being sent to ChatGPT (first 500 chars):\n{prompt[:500]}...")
             
-            # Use OpenAI Assistant API with the specified assistant ID
-            if self.llm == "openai_direct":
-                import openai
-                try:
-                    from openai import OpenAI
-                    client = OpenAI(api_key=self.openai_api_key)
-                    
-                    # Use the specified assistant ID
-                    assistant_id = "asst_FCWGkak9AJ9iyGdQJAGmAlF4"
-                    print(f"🤖 Using Assistant API with ID: {assistant_id}")
-                    
-                    # Create a thread
-                    thread = client.beta.threads.create()
-                    
-                    # Add the user message to the thread
-                    client.beta.threads.messages.create(
-                        thread_id=thread.id,
-                        role="user",
-                        content=prompt
-                    )
-                    
-                    # Run the assistant
-                    run = client.beta.threads.runs.create(
-                        thread_id=thread.id,
-                        assistant_id=assistant_id
+            response_text = self._request_completion(prompt, filters)
+            if response_text is None:
+                return self._get_fallback_influencers(filters, limit, reason='llm_error')
+            
+            # Parse response (complete objects are salvaged from a truncated or malformed array)
+            with span('json_parse'):
+                influencers, truncated = self._parse_response(response_text, filters)
+            
+            if exclude_names:
+                excluded = {normalize_name(name) for name in exclude_names}
+                influencers = [inf for inf in influencers if normalize_name(inf.get('full_name')) not in excluded]
+            
+            # A cut-off or partly malformed response lost objects, so ask for just that many more
+            if truncated and len(influencers) < limit:
+                known = list(exclude_names or []) + [inf.get('full_name') for inf in influencers]
+                influencers += self._find_missing(filters, limit - len(influencers), known, shard_hint)
+            
+            # Record them (assigns stable ids) so later lookups don't need another search
+            self._record_influencers(influencers)
+            
+            # Limit results
+            return influencers[:limit]
+            
+        except Exception as e:
+            print(f"⚠️  Error finding influencers with ChatGPT: {e}")
+            return self._get_fallback_influencers(filters, limit, reason='error')
+    
+    def _request_completion(self, prompt: str, filters: Dict) -> Optional[str]:
+        """
+        ChatGPT's answer to a finder prompt (Assistant API, then chat completions), or None if every path failed
+        
+        Each path goes through the shared LLM response cache under its own key
+        (the Assistant's includes its id). Only replies with at least one usable
+        influencer are stored, so a refusal or garbled answer isn't replayed.
+        """
+        cache = get_llm_cache()
+        usable = lambda text: self._has_influencers(text, filters)
+        
+        # Use OpenAI Assistant API with the specified assistant ID
+        if self.llm == "openai_direct":
+            import openai
+            client = get_openai_client(self.openai_api_key)
+            
+            def run_assistant() -> str:
+                # Streamed run in a pooled thread; cancelled if it outlives the timeout
+                with track_llm_call('assistant'):
+                    return assistant_runner.complete(client, prompt)
+            
+            def chat_completion() -> str:
+                with track_llm_call('chat_completions'):
+                    response = client.chat.completions.create(
+                        model=FINDER_MODEL,
+                        messages=[
+                            {"role": "system", "content": FINDER_SYSTEM_PROMPT},
+                            {"role": "user", "content": prompt}
+                        ],
+                        temperature=FINDER_TEMPERATURE,
+                        max_tokens=4000,
                     )
+                return response.choices[0].message.content
+            
+            try:
+                print(f"🤖 Using Assistant API with ID: {assistant_runner.assistant_id}")
+                response_text = cached_completion(
+                    cache, f"assistant:{assistant_runner.assistant_id}", None, '', prompt, run_assistant, usable
+                )
+                print(f"✅ Assistant API returned response ({len(response_text)} chars)")
                     
-                    # Wait for the run to complete (with timeout)
-                    import time
-                    max_wait = 60  # 60 second timeout
-                    waited = 0
-                    while run.status in ['queued', 'in_progress'] and waited < max_wait:
-                        time.sleep(1)
-                        waited += 1
-                        run = client.beta.threads.runs.retrieve(
-                            thread_id=thread.id,
-                            run_id=run.id
-                        )
-                    
-                    if run.status == 'completed':
-                        # Get the messages from the thread
-                        messages = client.beta.threads.messages.list(thread_id=thread.id)
-                        # Get the assistant's response (first message is the latest)
-                        if messages.data and len(messages.data) > 0:
-                            response_text = messages.data[0].content[0].text.value
-                            print(f"✅ Assistant API returned response ({len(response_text)} chars)")
-                        else:
-                            raise Exception("No response from assistant")
-                    else:
-                        error_msg = f"Assistant run failed with status: {run.status}"
-                        if hasattr(run, 'last_error') and run.last_error:
-                            error_msg += f" - {run.last_error}"
-                        print(f"⚠️  {error_msg}")
-                        raise Exception(error_msg)
-                        
-                except Exception as e:
-                    print(f"⚠️  OpenAI Assistant API error: {e}")
-                    import traceback
-                    traceback.print_exc()
-                    # Fallback to regular chat completions
-                    print("🔄 Falling back to regular chat completions API...")
-                    try:
-                        client = OpenAI(api_key=self.openai_api_key)
-                        response = client.chat.completions.create(
-                            model="gpt-4o-mini",
-                            messages=[
-                                {"role": "system", "content": "You are helpful and knowledgeable about social media influencers. You know real influencers across Instagram, YouTube, Twitter, LinkedIn, and other platforms."},
-                                {"role": "user", "content": prompt}
-                            ],
-                            temperature=0.7,
-                            max_tokens=4000,
-                        )
-                        response_text = response.choices[0].message.content
-                        print("✅ Used fallback chat completions API")
-                    except Exception as e2:
-                        print(f"⚠️  Fallback also failed: {e2}")
-                        return self._get_fallback_influencers(filters, limit)
-            else:
+            except Exception as e:
+                print(f"⚠️  OpenAI Assistant API error: {e}")
+                import traceback
+                traceback.print_exc()
+                # Fallback to regular chat completions
+                print("🔄 Falling back to regular chat completions API...")
                 try:
-                    # Use invoke with natural conversation style - like normal ChatGPT
+                    response_text = cached_completion(
+                        cache, FINDER_MODEL, FINDER_TEMPERATURE, FINDER_SYSTEM_PROMPT, prompt, chat_completion, usable
+                    )
+                    print("✅ Used fallback chat completions API")
+                except Exception as e2:
+                    print(f"⚠️  Fallback also failed: {e2}")
+                    return None
+        else:
+            def invoke() -> str:
+                # Use invoke with natural conversation style - like normal ChatGPT
+                with track_llm_call('langchain'):
                     response = self.llm.invoke([
-                        SystemMessage(content="You are helpful and knowledgeable about social media influencers. You know real influencers across Instagram, YouTube, Twitter, LinkedIn, and other platforms."),
+                        SystemMessage(content=FINDER_SYSTEM_PROMPT),
                         HumanMessage(content=prompt)
                     ], timeout=45)  # Increased timeout for better results
-                    response_text = response.content
-                except Exception as e:
-                    print(f"⚠️  LangChain API error: {e}")
-                    import traceback
-                    traceback.print_exc()
-                    return self._get_fallback_influencers(filters, limit)
+                return response.content
             
-            # Parse response
-            influencers = self._parse_chatgpt_response(response_text, filters)
-            
-            # Limit results
-            return influencers[:limit]
+            try:
+                response_text = cached_completion(
+                    cache, FINDER_MODEL, FINDER_TEMPERATURE, FINDER_SYSTEM_PROMPT, prompt, invoke, usable
+                )
+            except Exception as e:
+                print(f"⚠️  LangChain API error: {e}")
+                import traceback
+                traceback.print_exc()
+                return None
+        
+        return response_text
+    
+    def _has_influencers(self, response_text: str, filters: Dict) -> bool:
+        """True if a reply holds at least one influencer that passes the filters (worth caching)"""
+        return any(
+            self._safe_normalize(inf, idx, filters) is not None
+            for idx, inf in enumerate(salvage_json_objects(response_text), 1)
+        )
+    
+    def _find_missing(self, filters: Dict, count: int, exclude_names: List[str],
+                      shard_hint: Optional[str] = None) -> List[Dict]:
+        """Follow-up search for the influencers a truncated response was missing (one attempt, no fallbacks)"""
+        print(f"🔁 Requesting the {count} influencers missing from a truncated response")
+        with span('prompt_build'):
+            prompt = self._build_finder_prompt(filters, count, exclude_names, shard_hint)
+        response_text = self._request_completion(prompt, filters)
+        if response_text is None:
+            return []
+        with span('json_parse'):
+            found, _ = self._parse_response(response_text, filters)
+        excluded = {normalize_name(name) for name in exclude_names}
+        return [
+            inf for inf in found
+            if not inf.get('is_fallback') and normalize_name(inf.get('full_name')) not in excluded
+        ][:count]
+    
+    def stream_influencers(self, filters: Dict, limit: int = 10, exclude_names: Optional[List[str]] = None,
+                           shard_hint: Optional[str] = None) -> Iterator[Dict]:
+        """
+        Streaming variant of find_influencers: yields each influencer as soon
+        as ChatGPT has finished writing its JSON object
+        
+        Uses token streaming from the chat completions API (the Assistant API
+        only returns whole messages). Each yielded influencer is normalized and
+        recorded in the local store. A stream cut off mid-array is followed by
+        one request for the missing count; large searches stream their shards
+        concurrently. Falls back to placeholder
+        influencers if the stream fails before anything was yielded.
+        """
+        if not self.llm:
+            print("❌ ChatGPT API not available - using fallback influencers")
+            yield from self._get_fallback_influencers(filters, limit, reason='llm_unavailable')
+            return
+        
+        if shard_hint is None and limit > FINDER_SHARD_SIZE:
+            yield from self._stream_sharded(filters, limit, exclude_names)
+            return
+        
+        seen = {normalize_name(name) for name in exclude_names or []}
+        known = list(exclude_names or [])
+        start = time.perf_counter()
+        yielded = 0
+        # A response cut off mid-array gets one follow-up asking for just the missing count
+        for attempt in range(2):
+            with span('prompt_build'):
+                prompt = self._build_finder_prompt(filters, limit - yielded, known, shard_hint)
+            parser = JSONObjectStream()
+            try:
+                with track_llm_call('chat_completions_stream'), closing(self._stream_completion(prompt, filters)) as chunks:
+                    for chunk in chunks:
+                        for raw in parser.feed(chunk):
+                            # A malformed object is skipped rather than ending the stream
+                            inf = self._safe_normalize(raw, yielded + 1, filters)
+                            if inf is None or normalize_name(inf.get('full_name')) in seen:
+                                continue
+                            seen.add(normalize_name(inf.get('full_name')))
+                            known.append(inf.get('full_name'))
+                            self._record_influencers([inf])
+                            if not yielded:
+                                record('llm_first_influencer', (time.perf_counter() - start) * 1000)
+                                print(f"⚡ First influencer streamed after {time.perf_counter() - start:.2f}s")
+                            yielded += 1
+                            yield inf
+                            if yielded >= limit:
+                                return
+            except Exception as e:
+                print(f"⚠️  Streaming ChatGPT response failed after {yielded} influencers: {e}")
+                if not yielded:
+                    yield from self._get_fallback_influencers(filters, limit, reason='llm_error')
+                return
             
+            if not (parser.pending or parser.skipped) or not parser.parsed or attempt:
+                break
+            LLM_RESPONSE_RECOVERIES.inc(outcome='salvaged')
+            print(f"🔁 Streamed response was cut off - requesting the {limit - yielded} missing influencers")
+        
+        print(f"✅ Streamed {yielded} influencers in {time.perf_counter() - start:.2f}s")
+        if not yielded and not parser.parsed:
+            print("⚠️  No influencer objects in the streamed response")
+            LLM_RESPONSE_RECOVERIES.inc(outcome='failed')
+            yield from self._get_fallback_influencers(filters, limit, reason='parse_error')
+    
+    def _find_sharded(self, filters: Dict, limit: int, exclude_names: Optional[List[str]]) -> List[Dict]:
+        """find_influencers for a large limit: parallel shard searches merged without duplicates"""
+        shards = plan_shards(filters, limit)
+        print(f"🧩 Splitting search for {limit} influencers into {len(shards)} parallel shards")
+        with span('llm_shards'):
+            merged = run_shards(
+                shards, lambda f, n, hint: self.find_influencers(f, n, exclude_names, shard_hint=hint or ''),
+                exclude_names
+            )
+        if not merged:
+            return self._get_fallback_influencers(filters, limit, reason='llm_error')
+        return merged[:limit]
+    
+    def _stream_sharded(self, filters: Dict, limit: int, exclude_names: Optional[List[str]]) -> Iterator[Dict]:
+        """stream_influencers for a large limit: shards stream concurrently, merged as results arrive"""
+        shards = plan_shards(filters, limit)
+        print(f"🧩 Streaming search for {limit} influencers from {len(shards)} parallel shards")
+        yielded = 0
+        with closing(stream_shards(
+            shards, lambda f, n, hint: self.stream_influencers(f, n, exclude_names, shard_hint=hint or ''),
+            exclude_names
+        )) as merged:
+            for inf in merged:
+                yielded += 1
+                yield inf
+                if yielded >= limit:
+                    return
+        if not yielded:
+            yield from self._get_fallback_influencers(filters, limit, reason='llm_error')
+    
+    def _stream_completion(self, prompt: str, filters: Dict) -> Iterator[str]:
+        """Text chunks of the finder completion, from the shared LLM response cache when it has been asked before"""
+        return cached_stream(get_llm_cache(), FINDER_MODEL, FINDER_TEMPERATURE, FINDER_SYSTEM_PROMPT, prompt,
+                             lambda: self._stream_llm(prompt),
+                             lambda text: self._has_influencers(text, filters))
+    
+    def _stream_llm(self, prompt: str) -> Iterator[str]:
+        """Text chunks of the finder completion as the model writes them"""
+        messages = [
+            {"role": "system", "content": FINDER_SYSTEM_PROMPT},
+            {"role": "user", "content": prompt}
+        ]
+        if self.llm == "openai_direct":
+            client = get_openai_client(self.openai_api_key)
+            response = client.chat.completions.create(
+                model=FINDER_MODEL,
+                messages=messages,
+                temperature=FINDER_TEMPERATURE,
+                max_tokens=4000,
+                stream=True,
+            )
+            try:
+                for chunk in response:
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        yield chunk.choices[0].delta.content
+            finally:
+                # Stops the HTTP stream when the caller has enough influencers
+                response.close()
+        else:
+            for chunk in self.llm.stream([
+                SystemMessage(content=FINDER_SYSTEM_PROMPT),
+                HumanMessage(content=prompt)
+            ], timeout=45):
+                yield chunk.content
+    
+    def _record_influencers(self, influencers: List[Dict]) -> None:
+        """Upsert found influencers into the local store, setting their stable 'id'"""
+        try:
+            with span('store_upsert'):
+                get_influencer_store().upsert_many(influencers)
         except Exception as e:
-            print(f"⚠️  Error finding influencers with ChatGPT: {e}")
-            return self._get_fallback_influencers(filters, limit)
+            print(f"⚠️  Could not record influencers in the local store: {e}")
     
-    def _build_finder_prompt(self, filters: Dict, limit: int) -> str:
+    def _build_finder_prompt(self, filters: Dict, limit: int, exclude_names: Optional[List[str]] = None,
+                             shard_hint: Optional[str] = None) -> str:
         """Build a natural, conversational prompt like normal ChatGPT - this is the key to accuracy!"""
         
         industry = filters.get('industry', '').strip() if filters.get('industry') else ''
@@ -275,37 +472,19 @@ class ChatGPTInfluencerFinder:
             if platform_list and platform_list.lower() not in ['any', '']:
                 query_parts.append(f"on {platform_list}")
         
+        # Parse "25K", "25000", "2 lakh" etc. once (unparseable values mean 10K)
+        min_followers_int = parse_follower_count(min_followers, default=10000) if min_followers else 0
+        
         if min_followers:
             # Format followers nicely
             if isinstance(min_followers, (int, float)):
-                min_followers_int = int(min_followers)
                 if min_followers_int >= 1000:
                     followers_str = f"{min_followers_int/1000:.0f}K" if min_followers_int % 1000 == 0 else f"{min_followers_int:,}"
                 else:
                     followers_str = str(min_followers_int)
             else:
-                # Parse string like "25K" or "25000"
-                min_followers_str = str(min_followers).upper().replace(',', '')
-                if 'K' in min_followers_str:
-                    min_followers_int = int(float(min_followers_str.replace('K', '')) * 1000)
-                elif 'M' in min_followers_str:
-                    min_followers_int = int(float(min_followers_str.replace('M', '')) * 1000000)
-                else:
-                    min_followers_int = int(min_followers_str) if min_followers_str.isdigit() else 10000
                 followers_str = f"{min_followers_int/1000:.0f}K" if min_followers_int >= 1000 and min_followers_int % 1000 == 0 else f"{min_followers_int:,}"
             
-            # Calculate a reasonable range (e.g., 25K means 20K-50K, not 1M+)
-            if isinstance(min_followers, (int, float)):
-                min_followers_int = int(min_followers)
-            else:
-                min_followers_str = str(min_followers).upper().replace(',', '')
-                if 'K' in min_followers_str:
-                    min_followers_int = int(float(min_followers_str.replace('K', '')) * 1000)
-                elif 'M' in min_followers_str:
-                    min_followers_int = int(float(min_followers_str.replace('M', '')) * 1000000)
-                else:
-                    min_followers_int = int(min_followers_str) if min_followers_str.isdigit() else 10000
-            
             # Define follower range - if user wants 25K, give them 20K-50K range, not celebrities
             if min_followers_int < 50000:
                 # Micro-influencer range: target ±50% or 20K-50K range
@@ -323,16 +502,6 @@ class ChatGPTInfluencerFinder:
         # Determine if user wants micro-influencers (not celebrities)
         wants_micro = False
         if min_followers:
-            if isinstance(min_followers, (int, float)):
-                min_followers_int = int(min_followers)
-            else:
-                min_followers_str = str(min_followers).upper().replace(',', '')
-                if 'K' in min_followers_str:
-                    min_followers_int = int(float(min_followers_str.replace('K', '')) * 1000)
-                elif 'M' in min_followers_str:
-                    min_followers_int = int(float(min_followers_str.replace('M', '')) * 1000000)
-                else:
-                    min_followers_int = int(min_followers_str) if min_followers_str.isdigit() else 10000
             wants_micro = min_followers_int < 100000  # Less than 100K = micro-influencer range
         
         prompt = f"""I need you to find {limit} REAL, VERIFIED social media influencers {natural_query}.
@@ -384,6 +553,8 @@ VERY IMPORTANT:
 - If you cannot find {limit} real matching influencers, return fewer REAL ones (not fake ones)
 - All social media handles must be REAL, existing accounts
 {f"- CRITICAL: Match the follower count range specified. If the range is around 25K, give influencers with 20K-50K followers, NOT celebrities with 1M+ followers. Avoid top-tier/celebrity influencers when a specific lower follower count is requested." if wants_micro else ""}
+{f"- This list is one part of a larger search: ONLY include influencers {shard_hint}" if shard_hint else ""}
+{f"- We already have these influencers, so DO NOT include them: {', '.join(exclude_names[:MAX_EXCLUDED_NAMES])}" if exclude_names else ""}
 
 Return ONLY the JSON array, no other text."""
         
@@ -391,6 +562,19 @@ Return ONLY the JSON array, no other text."""
     
     def _parse_chatgpt_response(self, response_text: str, filters: Dict) -> List[Dict]:
         """Parse ChatGPT response into influencer list"""
+        return self._parse_response(response_text, filters)[0]
+    
+    def _parse_response(self, response_text: str, filters: Dict) -> Tuple[List[Dict], bool]:
+        """
+        Parse ChatGPT response into (influencer list, truncated)
+        
+        If the JSON doesn't parse (cut off at max_tokens, a stray token, or
+        prose around the array), every complete object in it is kept.
+        truncated is True only if an object was left open or had to be
+        dropped, i.e. the reply lost influencers. Fallback influencers are
+        returned only when nothing could be recovered.
+        """
+        truncated = False
         try:
             # Try to extract JSON from response
             if '```json' in response_text:
@@ -401,98 +585,126 @@ Return ONLY the JSON array, no other text."""
                 json_str = response_text.strip()
             
             # Try to parse as JSON
-            influencers = json.loads(json_str)
+            try:
+                influencers = json.loads(json_str)
+            except json.JSONDecodeError as e:
+                parser = JSONObjectStream()
+                influencers = parser.feed(json_str)
+                if not influencers:
+                    raise
+                truncated = parser.pending or bool(parser.skipped)
+                if truncated:
+                    LLM_RESPONSE_RECOVERIES.inc(outcome='salvaged')
+                    print(f"🩹 Salvaged {len(influencers)} complete influencers from a cut-off or malformed response ({e})")
             
             # Ensure it's a list
             if not isinstance(influencers, list):
                 influencers = [influencers]
             
             # Validate and normalize influencer data
-            platforms = filters.get('platforms', [])
             normalized = []
             for idx, inf in enumerate(influencers, 1):
-                platform = inf.get('platform', 'Multiple')
-                
-                # STRICT platform filtering - only show influencers from selected platforms
-                if platforms:
-                    platforms_lower = [p.lower() for p in platforms] if isinstance(platforms, list) else [platforms.lower()]
-                    platform_lower = platform.lower()
-                    
-                    # Check if influencer has handles for selected platforms
-                    has_instagram = bool(inf.get('instagram_handle')) and any('instagram' in p for p in platforms_lower)
-                    has_twitter = bool(inf.get('twitter_handle')) and any('twitter' in p or 'x' in p for p in platforms_lower)
-                    has_linkedin = bool(inf.get('linkedin_handle')) and any('linkedin' in p for p in platforms_lower)
-                    has_youtube = bool(inf.get('youtube_handle')) and any('youtube' in p for p in platforms_lower)
-                    has_facebook = bool(inf.get('facebook_handle')) and any('facebook' in p for p in platforms_lower)
-                    
-                    # Also check if platform field matches
-                    platform_matches = any(
-                        req_platform in platform_lower or 
-                        platform_lower in req_platform
-                        for req_platform in platforms_lower
-                    )
-                    
-                    # Must have at least one matching platform handle OR platform field match
-                    matches_platform = has_instagram or has_twitter or has_linkedin or has_youtube or has_facebook or platform_matches
-                    
-                    # STRICT: Skip if doesn't match platform requirements
-                    if not matches_platform:
-                        print(f"⚠️  Skipping {inf.get('full_name', 'Unknown')} - doesn't match platform requirements: {platforms}")
-                        continue
-                
-                # Validate email - prefer real emails, avoid example.com
-                email = inf.get('email', '')
-                if not email or 'example.com' in email.lower():
-                    # Try to construct email from name/domain if available
-                    name = inf.get('full_name', inf.get('name', '')).lower().replace(' ', '')
-                    if name and len(name) > 2:
-                        email = f"contact@{name}.com"  # Better than example.com
-                    else:
-                        email = f"contact{idx}@influencer.com"  # Better than example.com
-                
-                normalized_inf = {
-                    'id': inf.get('id', idx),
-                    'full_name': inf.get('full_name', inf.get('name', 'Unknown Influencer')),
-                    'email': email,
-                    'industry': inf.get('industry', filters.get('industry', '')),
-                    'category': inf.get('category', inf.get('industry', filters.get('industry', ''))),
-                    'job_title': inf.get('job_title', inf.get('domain_niche', '')),
-                    'domain_niche': inf.get('domain_niche', inf.get('job_title', '')),
-                    'company_name': inf.get('company_name', inf.get('full_name', '')),
-                    'location': inf.get('location', filters.get('location', 'India')),
-                    'contact_type': inf.get('contact_type', 'Email'),
-                    'contact_link': inf.get('contact_link', inf.get('source_url', '')),
-                    'use_case': inf.get('use_case', 'Content collaboration'),
-                    'source_url': inf.get('source_url', inf.get('contact_link', '')),
-                    'bio': inf.get('bio', f"{inf.get('full_name', '')} - {inf.get('job_title', 'Content Creator')}"),
-                    'platform': platform,
-                    'followers': inf.get('followers', '10K'),
-                    'match_score': 85,  # Default match score
-                    # Platform-specific handles - clean and validate
-                    'instagram_handle': inf.get('instagram_handle', '').lstrip('@').strip(),
-                    'twitter_handle': inf.get('twitter_handle', '').lstrip('@').strip(),
-                    'linkedin_handle': inf.get('linkedin_handle', '').lstrip('in/').lstrip('/').strip(),
-                    'youtube_handle': inf.get('youtube_handle', '').lstrip('@').lstrip('/').strip(),
-                    'facebook_handle': inf.get('facebook_handle', '').strip()
-                }
-                normalized.append(normalized_inf)
-            
-            # Categorize influencers by tier
-            for inf in normalized:
-                inf['tier'] = self._categorize_influencer_tier(inf)
+                normalized_inf = self._safe_normalize(inf, idx, filters)
+                if normalized_inf is not None:
+                    normalized.append(normalized_inf)
             
-            return normalized
+            return normalized, truncated
             
         except json.JSONDecodeError as e:
+            LLM_RESPONSE_RECOVERIES.inc(outcome='failed')
             print(f"⚠️  Error parsing ChatGPT response as JSON: {e}")
             print(f"Response text: {response_text[:500]}")
-            return self._get_fallback_influencers(filters, 10)
+            return self._get_fallback_influencers(filters, 10, reason='parse_error'), False
         except Exception as e:
             print(f"⚠️  Error processing ChatGPT response: {e}")
-            return self._get_fallback_influencers(filters, 10)
+            return self._get_fallback_influencers(filters, 10, reason='parse_error'), False
     
-    def _get_fallback_influencers(self, filters: Dict, limit: int) -> List[Dict]:
-        """Fallback influencers if ChatGPT is not available"""
+    def _safe_normalize(self, inf, idx: int, filters: Dict) -> Optional[Dict]:
+        """_normalize_influencer, but a malformed object (not a dict, odd field types) gives None instead of raising"""
+        if not isinstance(inf, dict):
+            return None
+        try:
+            return self._normalize_influencer(inf, idx, filters)
+        except Exception as e:
+            print(f"⚠️  Skipping malformed influencer object {inf.get('full_name', '')!r}: {e}")
+            return None
+    
+    def _normalize_influencer(self, inf: Dict, idx: int, filters: Dict) -> Optional[Dict]:
+        """One parsed influencer in the shape the rest of the app expects, or None if it fails the platform filter"""
+        platforms = filters.get('platforms', [])
+        platform = inf.get('platform') or 'Multiple'
+        
+        # STRICT platform filtering - only show influencers from selected platforms
+        if platforms:
+            platforms_lower = [p.lower() for p in platforms] if isinstance(platforms, list) else [platforms.lower()]
+            platform_lower = platform.lower()
+            
+            # Check if influencer has handles for selected platforms
+            has_instagram = bool(inf.get('instagram_handle')) and any('instagram' in p for p in platforms_lower)
+            has_twitter = bool(inf.get('twitter_handle')) and any('twitter' in p or 'x' in p for p in platforms_lower)
+            has_linkedin = bool(inf.get('linkedin_handle')) and any('linkedin' in p for p in platforms_lower)
+            has_youtube = bool(inf.get('youtube_handle')) and any('youtube' in p for p in platforms_lower)
+            has_facebook = bool(inf.get('facebook_handle')) and any('facebook' in p for p in platforms_lower)
+            
+            # Also check if platform field matches
+            platform_matches = any(
+                req_platform in platform_lower or 
+                platform_lower in req_platform
+                for req_platform in platforms_lower
+            )
+            
+            # Must have at least one matching platform handle OR platform field match
+            matches_platform = has_instagram or has_twitter or has_linkedin or has_youtube or has_facebook or platform_matches
+            
+            # STRICT: Skip if doesn't match platform requirements
+            if not matches_platform:
+                print(f"⚠️  Skipping {inf.get('full_name', 'Unknown')} - doesn't match platform requirements: {platforms}")
+                return None
+        
+        # Validate email - prefer real emails, avoid example.com
+        email = inf.get('email') or ''
+        if not email or 'example.com' in str(email).lower():
+            # Try to construct email from name/domain if available
+            name = str(inf.get('full_name') or inf.get('name') or '').lower().replace(' ', '')
+            if name and len(name) > 2:
+                email = f"contact@{name}.com"  # Better than example.com
+            else:
+                email = f"contact{idx}@influencer.com"  # Better than example.com
+        
+        normalized_inf = {
+            'id': inf.get('id', idx),
+            'full_name': inf.get('full_name', inf.get('name', 'Unknown Influencer')),
+            'email': email,
+            'industry': inf.get('industry', filters.get('industry', '')),
+            'category': inf.get('category', inf.get('industry', filters.get('industry', ''))),
+            'job_title': inf.get('job_title', inf.get('domain_niche', '')),
+            'domain_niche': inf.get('domain_niche', inf.get('job_title', '')),
+            'company_name': inf.get('company_name', inf.get('full_name', '')),
+            'location': inf.get('location', filters.get('location', 'India')),
+            'contact_type': inf.get('contact_type', 'Email'),
+            'contact_link': inf.get('contact_link', inf.get('source_url', '')),
+            'use_case': inf.get('use_case', 'Content collaboration'),
+            'source_url': inf.get('source_url', inf.get('contact_link', '')),
+            'bio': inf.get('bio', f"{inf.get('full_name', '')} - {inf.get('job_title', 'Content Creator')}"),
+            'platform': platform,
+            'followers': inf.get('followers', '10K'),
+            # Parsed once here so downstream stages never re-parse the display string
+            'follower_count': parse_follower_count(inf.get('follower_count')) or parse_follower_count(inf.get('followers', '10K')),
+            'match_score': 85,  # Default match score
+            # Platform-specific handles - clean and validate
+            # (the model sometimes sends null for a missing handle)
+            'instagram_handle': (inf.get('instagram_handle') or '').lstrip('@').strip(),
+            'twitter_handle': (inf.get('twitter_handle') or '').lstrip('@').strip(),
+            'linkedin_handle': (inf.get('linkedin_handle') or '').lstrip('in/').lstrip('/').strip(),
+            'youtube_handle': (inf.get('youtube_handle') or '').lstrip('@').lstrip('/').strip(),
+            'facebook_handle': (inf.get('facebook_handle') or '').strip()
+        }
+        normalized_inf['tier'] = self._categorize_influencer_tier(normalized_inf)
+        return normalized_inf
+    
+    def _get_fallback_influencers(self, filters: Dict, limit: int, reason: str = 'unknown') -> List[Dict]:
+        """Fallback influencers if ChatGPT is not available (reason is reported in metrics)"""
+        FALLBACK_RESPONSES.inc(reason=reason)
         industry = filters.get('industry', '').strip() if filters.get('industry') else 'General'
         location = filters.get('location', '').strip() if filters.get('location') else 'India'
         
@@ -516,41 +728,20 @@ Return ONLY the JSON array, no other text."""
                 'bio': f'Content creator specializing in {industry}',
                 'platform': 'Multiple',
                 'followers': '50K',
-                'match_score': 70
+                'follower_count': 50000,
+                'match_score': 70,
+                'is_fallback': True
             })
         
         return influencers
     
     def _categorize_influencer_tier(self, influencer: Dict) -> str:
         """Categorize influencer by follower count tier"""
-        followers_str = str(influencer.get('followers', '0')).upper()
-        
-        # Parse follower count
-        try:
-            # Remove commas and spaces
-            clean_str = followers_str.replace(',', '').replace(' ', '').strip()
-            
-            # Handle K (thousands) and M (millions)
-            if 'K' in clean_str:
-                count = float(clean_str.replace('K', '')) * 1000
-            elif 'M' in clean_str:
-                count = float(clean_str.replace('M', '')) * 1000000
-            else:
-                count = float(clean_str) if clean_str else 0
-        except:
-            count = 0
-        
-        # Categorize by tier
-        if count >= 1000000:
-            return "Top/Macro"
-        elif count >= 100000:
-            return "Mid-tier"
-        elif count >= 10000:
-            return "Micro"
-        elif count >= 1000:
-            return "Nano"
-        else:
-            return "Emerging"
+        count = (
+            parse_follower_count(influencer.get('follower_count'))
+            or parse_follower_count(influencer.get('followers', '0'))
+        )
+        return tier_for_count(count)
     
     def categorize_influencers_by_tier(self, influencers: List[Dict]) -> Dict[str, List[Dict]]:
         """Group influencers by tier"""
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Client Registry
+Process-wide, lazily created instances of the finder, data manager, social
+media API client, influencer store/catalog and LLM clients, so requests share
+HTTP connection pools instead of rebuilding them (and re-reading the
+environment) every time
+"""
+
+import os
+import threading
+from typing import Callable, Dict, Optional
+
+DEFAULT_CHAT_MODEL = "gpt-4o-mini"
+
+_instances: Dict = {}
+_lock = threading.RLock()
+
+
+def _get_or_create(key, factory: Callable):
+    """Return the instance registered under key, creating it once under the lock"""
+    instance = _instances.get(key)
+    if instance is None:
+        with _lock:
+            instance = _instances.get(key)
+            if instance is None:
+                instance = factory()
+                _instances[key] = instance
+    return instance
+
+
+def get_openai_api_key() -> Optional[str]:
+    """OPENAI_API_KEY from the environment, ignoring the .env.example placeholder"""
+    openai_api_key = os.getenv('OPENAI_API_KEY')
+    if openai_api_key and openai_api_key != 'your_openai_api_key_here':
+        return openai_api_key
+    return None
+
+
+def get_influencer_finder():
+    """Shared ChatGPTInfluencerFinder"""
+    def create():
+        from chatgpt_influencer_finder import ChatGPTInfluencerFinder
+        return ChatGPTInfluencerFinder()
+    return _get_or_create('influencer_finder', create)
+
+
+def get_data_manager():
+    """Shared InfluencerDataManager (wraps the shared finder)"""
+    def create():
+        from data_manager import InfluencerDataManager
+        return InfluencerDataManager()
+    return _get_or_create('data_manager', create)
+
+
+def get_social_apis():
+    """Shared SocialMediaAPIs (one pooled requests.Session)"""
+    def create():
+        from social_media_apis import SocialMediaAPIs
+        return SocialMediaAPIs()
+    return _get_or_create('social_apis', create)
+
+
+def get_influencer_store():
+    """Shared InfluencerStore (SQLite, one connection per thread)"""
+    def create():
+        from influencer_store import InfluencerStore
+        return InfluencerStore()
+    return _get_or_create('influencer_store', create)
+
+
+def get_influencer_catalog():
+    """Shared InfluencerCatalog, loaded from the bundled CSVs on first use"""
+    def create():
+        from influencer_catalog import InfluencerCatalog
+        return InfluencerCatalog().load()
+    return _get_or_create('influencer_catalog', create)
+
+
+def get_llm_cache():
+    """Shared on-disk LLM response cache, or None if LLM_CACHE_ENABLED is off"""
+    def create():
+        from llm_cache import LLM_CACHE_ENABLED, LLMCache
+        return LLMCache() if LLM_CACHE_ENABLED else False
+    return _get_or_create('llm_cache', create) or None
+
+
+def get_chat_llm(temperature: float = 0.3, model: str = DEFAULT_CHAT_MODEL):
+    """
+    Shared LangChain ChatOpenAI client for a (model, temperature) pair
+
+    invoke() goes through the shared LLM response cache when it is enabled.
+    Returns None if no API key is configured or langchain-openai is unavailable.
+    """
+    api_key = get_openai_api_key()
+    if not api_key:
+        return None
+
+    def create():
+        try:
+            from langchain_openai import ChatOpenAI
+            llm = ChatOpenAI(model_name=model, temperature=temperature, openai_api_key=api_key)
+            cache = get_llm_cache()
+            if cache is not None:
+                from llm_cache import CachedChatLLM
+                return CachedChatLLM(llm, model, temperature, cache)
+            return llm
+        except Exception as e:
+            print(f"⚠️  Error initializing ChatOpenAI ({model}, temperature={temperature}): {e}")
+            return False  # Cache the failure so it isn't retried on every request
+
+    return _get_or_create(('chat_llm', model, temperature), create) or None
+
+
+def get_openai_client(api_key: Optional[str] = None):
+    """Shared OpenAI SDK client (used for the Assistant and chat-completions APIs)"""
+    api_key = api_key or get_openai_api_key()
+    if not api_key:
+        return None
+
+    def create():
+        from openai import OpenAI
+        return OpenAI(api_key=api_key)
+
+    return _get_or_create(('openai_client', api_key), create)
+
+
+def reset_registry() -> None:
+    """Drop every shared instance (next access recreates them)"""
+    with _lock:
+        _instances.clear()
@@ -4,30 +4,17 @@ Competitor Analyzer
 Analyzes top competitors and their collaboration strategies
 """
 
-import os
 import json
 from typing import Dict, List
-from data_manager import InfluencerDataManager
-from langchain_openai import ChatOpenAI
+from client_registry import get_chat_llm, get_data_manager
 from langchain.schema import HumanMessage
 
 class CompetitorAnalyzer:
     """Analyze competitors and their collaboration strategies"""
     
     def __init__(self):
-        self.data_manager = InfluencerDataManager()
-        self.llm = None
-        
-        openai_api_key = os.getenv('OPENAI_API_KEY')
-        if openai_api_key and openai_api_key != 'your_openai_api_key_here':
-            try:
-                self.llm = ChatOpenAI(
-                    model_name="gpt-4o-mini",
-                    temperature=0.3,
-                    openai_api_key=openai_api_key
-                )
-            except:
-                pass
+        self.data_manager = get_data_manager()
+        self.llm = get_chat_llm(temperature=0.3)
     
     def analyze(self, target_audience: str, industry: str) -> Dict:
         """
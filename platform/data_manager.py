@@ -1,17 +1,18 @@
 #!/usr/bin/env python3
 """
 Influencer Data Manager
-Manages influencer data using ChatGPT API (no database or CSV)
+Manages influencer data using ChatGPT API; influencers it has found are kept
+in the local influencer store for lookups
 """
 
 from typing import List, Dict, Optional
-from chatgpt_influencer_finder import ChatGPTInfluencerFinder
+from client_registry import get_influencer_catalog, get_influencer_finder, get_influencer_store
 
 class InfluencerDataManager:
     """Manage influencer data using ChatGPT API - no database or CSV needed"""
     
     def __init__(self):
-        self.finder = ChatGPTInfluencerFinder()
+        self.finder = get_influencer_finder()
         print("✅ Influencer Data Manager initialized (ChatGPT-based, no database)")
     
     def get_all_influencers(self, filters: Optional[Dict] = None) -> List[Dict]:
@@ -30,11 +31,17 @@ class InfluencerDataManager:
     
     def get_influencer_by_id(self, influencer_id: str, filters: Optional[Dict] = None) -> Optional[Dict]:
         """
-        Get influencer by ID, email, or name
+        Get influencer by ID, email, name or platform handle
         
-        Note: Since we use ChatGPT API, we need to search within recently found influencers.
-        For best results, provide filters to find the influencer first.
+        Influencers found by earlier searches are read from the local store.
+        Otherwise filters are used to search with ChatGPT and the influencer is
+        looked up within the results.
         """
+        store = get_influencer_store()
+        influencer = store.get(influencer_id)
+        if influencer:
+            return influencer
+        
         influencers = self.get_all_influencers(filters)
         
         # Try by numeric ID
@@ -58,6 +65,21 @@ class InfluencerDataManager:
         return None
     
     def get_filter_options(self) -> Dict:
-        """Get available filter options (from ChatGPT finder)"""
-        return self.finder.get_filter_options()
+        """
+        Get available filter options with live counts from the influencer catalog
+        
+        Catalog values come first (most common first); the finder's default
+        industries/locations are kept after them for compatibility.
+        """
+        options = self.finder.get_filter_options()
+        catalog_options = get_influencer_catalog().filter_options()
+        for key, catalog_key in (('industries', 'industries'), ('categories', 'industries'), ('locations', 'locations')):
+            values = catalog_options[catalog_key]
+            seen = {v.lower() for v in values}
+            options[key] = values + [v for v in options[key] if v.lower() not in seen]
+        options['platforms'] = catalog_options['platforms']
+        options['tiers'] = catalog_options['tiers']
+        options['facet_counts'] = catalog_options['facet_counts']
+        options['total_influencers'] = catalog_options['total_influencers']
+        return options
 
@@ -4,30 +4,17 @@ Email Manager
 Drafts and sends collaboration emails
 """
 
-import os
 import json
-from typing import Dict, Optional
-from data_manager import InfluencerDataManager
-from langchain_openai import ChatOpenAI
+from typing import Dict
+from client_registry import get_chat_llm, get_data_manager
 from langchain.schema import HumanMessage
 
 class EmailManager:
     """Manage email drafting and sending"""
     
     def __init__(self):
-        self.data_manager = InfluencerDataManager()
-        self.llm = None
-        
-        openai_api_key = os.getenv('OPENAI_API_KEY')
-        if openai_api_key and openai_api_key != 'your_openai_api_key_here':
-            try:
-                self.llm = ChatOpenAI(
-                    model_name="gpt-4o-mini",
-                    temperature=0.7,  # More creative for email writing
-                    openai_api_key=openai_api_key
-                )
-            except:
-                pass
+        self.data_manager = get_data_manager()
+        self.llm = get_chat_llm(temperature=0.7)  # More creative for email writing
     
     def draft_email(self, influencer_id: str, collaboration_type: str, 
                    company_info: Dict) -> Dict:
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Profile Enrichment Stage
+Fetches real profile data for recommended influencers from social media APIs
+using one shared, bounded thread pool and a single overall deadline
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Dict, Iterator, List, Optional, Tuple
+from client_registry import get_social_apis
+from follower_count import format_follower_count
+from social_media_apis import SocialMediaAPIs
+from timing import submit_in_context
+
+# Worker threads shared by every request (each task is one platform lookup)
+ENRICHMENT_MAX_WORKERS = int(os.getenv('ENRICHMENT_MAX_WORKERS', '16'))
+
+# Overall deadline for enriching a whole result set, in seconds
+ENRICHMENT_DEADLINE = float(os.getenv('ENRICHMENT_DEADLINE_SECONDS', '10'))
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_enrichment_executor() -> ThreadPoolExecutor:
+    """Return the process-wide enrichment executor, creating it on first use"""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=ENRICHMENT_MAX_WORKERS,
+                    thread_name_prefix='enrichment'
+                )
+    return _executor
+
+
+def shutdown_enrichment_executor(wait: bool = True) -> None:
+    """Shut the shared executor down (a later call to get_enrichment_executor recreates it)"""
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor:
+        executor.shutdown(wait=wait, cancel_futures=not wait)
+
+
+class EnrichmentStage:
+    """Fan out social media lookups across all influencers and platforms at once"""
+
+    def __init__(self, social_apis: Optional[SocialMediaAPIs] = None,
+                 executor: Optional[ThreadPoolExecutor] = None):
+        self.social_apis = social_apis or get_social_apis()
+        self.executor = executor or get_enrichment_executor()
+
+    def stream(self, influencers: List[Dict],
+               deadline: Optional[float] = None) -> Iterator[Tuple[int, Dict]]:
+        """
+        Yield (index, api_data) for each influencer as soon as all of its
+        platform lookups have finished
+
+        Args:
+            influencers: Influencer dicts with *_handle fields
+            deadline: Seconds allowed for the whole batch (defaults to ENRICHMENT_DEADLINE)
+
+        Lookups still queued when the deadline passes are cancelled. Influencers
+        with some platforms finished are yielded with the partial results.
+        """
+        deadline = ENRICHMENT_DEADLINE if deadline is None else deadline
+        expires_at = time.monotonic() + deadline
+
+        futures = {}
+        pending_per_influencer = {}
+        results_per_influencer = {}
+
+        for idx, inf in enumerate(influencers):
+            handles = self.social_apis.get_platform_handles(inf)
+            if not handles:
+                continue
+            pending_per_influencer[idx] = len(handles)
+            results_per_influencer[idx] = {}
+            for platform, handle in handles.items():
+                future = submit_in_context(self.executor, self.social_apis.analyze_platform, platform, handle)
+                futures[future] = (idx, platform)
+
+        if not futures:
+            return
+
+        print(f"🔍 Fetching real profile data: {len(futures)} platform lookups for {len(pending_per_influencer)} influencers")
+
+        not_done = set(futures)
+        while not_done:
+            remaining = expires_at - time.monotonic()
+            if remaining <= 0:
+                break
+            done, not_done = wait(not_done, timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in done:
+                idx, platform = futures[future]
+                try:
+                    results_per_influencer[idx][platform] = future.result()
+                except Exception as e:
+                    print(f"  ❌ Error fetching {platform} profile: {e}")
+                    results_per_influencer[idx][platform] = {"success": False, "error": str(e)}
+                pending_per_influencer[idx] -= 1
+                if pending_per_influencer[idx] == 0:
+                    yield idx, self.social_apis.combine_platform_results(results_per_influencer.pop(idx))
+
+        if not_done:
+            cancelled = sum(1 for future in not_done if future.cancel())
+            print(f"⏱️  Enrichment deadline ({deadline:.0f}s) reached - dropped {len(not_done)} lookups ({cancelled} cancelled before starting)")
+            for idx, partial in results_per_influencer.items():
+                if partial:
+                    yield idx, self.social_apis.combine_platform_results(partial)
+
+    def enrich(self, influencers: List[Dict], deadline: Optional[float] = None) -> int:
+        """Enrich influencers in place; returns how many received real data"""
+        enriched = 0
+        for idx, api_data in self.stream(influencers, deadline):
+            if apply_real_profile_data(influencers[idx], api_data):
+                enriched += 1
+        print(f"✅ Real profile data added for {enriched}/{len(influencers)} influencers")
+        return enriched
+
+
+def apply_real_profile_data(inf: Dict, api_data: Dict) -> bool:
+    """Merge analyze_all_platforms output into an influencer dict; returns True if any platform succeeded"""
+    if not api_data or not api_data.get('success'):
+        return False
+
+    # Add real profile data to influencer
+    inf['real_profile_data'] = api_data
+    platforms_data = api_data.get('platforms', {})
+
+    if not any(data and data.get('success') for data in platforms_data.values()):
+        print(f"  ⚠️  No successful platform data for {inf.get('full_name', 'unknown')}")
+        return False
+
+    # Add platform-specific real data
+    if platforms_data.get('instagram') and platforms_data['instagram'].get('success'):
+        insta_data = platforms_data['instagram']
+        inf['real_instagram'] = {
+            'followers': insta_data.get('followers', 0),
+            'posts_count': insta_data.get('posts_count', 0),
+            'total_likes': insta_data.get('total_likes', 0),
+            'average_likes': insta_data.get('average_likes', 0),
+            'hashtags': insta_data.get('hashtags', []),
+            'media_items': insta_data.get('media_items', [])
+        }
+
+        # UPDATE WITH REAL INSTAGRAM DATA
+        if insta_data.get('followers', 0) > 0:
+            inf['follower_count'] = insta_data.get('followers', 0)
+            inf['followers'] = format_follower_count(insta_data.get('followers', 0))
+
+        # Use REAL average likes
+        if insta_data.get('average_likes', 0) > 0:
+            inf['avg_likes_per_post'] = int(insta_data.get('average_likes', 0))
+        elif insta_data.get('total_likes', 0) > 0 and insta_data.get('posts_count', 0) > 0:
+            inf['avg_likes_per_post'] = int(insta_data.get('total_likes', 0) / insta_data.get('posts_count', 1))
+
+        # Calculate REAL engagement rate from actual data
+        if insta_data.get('followers', 0) > 0 and inf.get('avg_likes_per_post', 0) > 0:
+            real_engagement_rate = (inf.get('avg_likes_per_post', 0) / insta_data.get('followers', 1)) * 100
+            inf['engagement_rate'] = round(real_engagement_rate, 2)
+            inf['estimated_reach'] = int(insta_data.get('followers', 0) * (real_engagement_rate / 100))
+
+    if platforms_data.get('twitter') and platforms_data['twitter'].get('success'):
+        twitter_data = platforms_data['twitter']
+        inf['real_twitter'] = {
+            'followers': twitter_data.get('followers', 0),
+            'tweets_count': twitter_data.get('tweets_count', 0),
+            'total_likes': twitter_data.get('total_likes', 0),
+            'bio': twitter_data.get('bio', ''),
+            'hashtags': twitter_data.get('hashtags', [])
+        }
+
+        # UPDATE WITH REAL TWITTER DATA (if no Instagram data)
+        if twitter_data.get('followers', 0) > 0:
+            if not inf.get('follower_count') or inf.get('follower_count', 0) == 0:
+                inf['follower_count'] = twitter_data.get('followers', 0)
+                inf['followers'] = format_follower_count(twitter_data.get('followers', 0))
+
+        # Use REAL Twitter engagement
+        if twitter_data.get('total_likes', 0) > 0 and twitter_data.get('tweets_count', 0) > 0:
+            avg_twitter_likes = int(twitter_data.get('total_likes', 0) / twitter_data.get('tweets_count', 1))
+            if not inf.get('avg_likes_per_post') or inf.get('avg_likes_per_post', 0) == 0:
+                inf['avg_likes_per_post'] = avg_twitter_likes
+
+        # Calculate REAL engagement rate from Twitter
+        if twitter_data.get('followers', 0) > 0 and inf.get('avg_likes_per_post', 0) > 0:
+            real_engagement_rate = (inf.get('avg_likes_per_post', 0) / twitter_data.get('followers', 1)) * 100
+            if not inf.get('engagement_rate') or inf.get('engagement_rate', 0) == 0:
+                inf['engagement_rate'] = round(real_engagement_rate, 2)
+                inf['estimated_reach'] = int(twitter_data.get('followers', 0) * (real_engagement_rate / 100))
+
+    if platforms_data.get('linkedin') and platforms_data['linkedin'].get('success'):
+        linkedin_data = platforms_data['linkedin']
+        inf['real_linkedin'] = {
+            'headline': linkedin_data.get('headline', ''),
+            'summary': linkedin_data.get('summary', ''),
+            'location': linkedin_data.get('location', ''),
+            'posts_count': linkedin_data.get('posts_count', 0),
+            'hashtags': linkedin_data.get('hashtags', [])
+        }
+
+    # Update overall metrics with REAL data from APIs
+    overall = api_data.get('overall', {})
+    if overall.get('total_views', 0) > 0:
+        inf['real_total_views'] = overall.get('total_views', 0)
+        inf['real_average_views'] = overall.get('average_views_per_post', 0)
+        inf['real_hashtags'] = overall.get('all_hashtags', [])
+
+    return True
@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+Recommendation Filter Engine
+Post-filters and scores influencers returned by the finder in a single pass.
+Each influencer is normalized once into a MatchRecord; every filter predicate
+and score boost is then read from that record instead of re-lowercasing fields.
+Keyword filters are also matched semantically (TF-IDF with related-term
+concepts, fitted over the catalog and store) across the whole result set at once.
+"""
+
+from typing import Dict, List, Optional
+import numpy as np
+from batch_scoring import score_influencers
+from follower_count import parse_follower_count
+from semantic_matcher import SemanticMatcher, corpus_matcher
+
+# Influencers below this follower count are treated as micro/nano
+MACRO_MID_MIN_FOLLOWERS = 10000
+
+# Fewer results than this from the finder switches to lenient filtering
+STRICT_FILTERING_MIN_RESULTS = 5
+
+# Keyword filters: a substring match gets KEYWORD_BOOST, and semantic similarity adds
+# up to KEYWORD_BOOST more (the best match in a result set gets all of it, others a
+# share proportional to their similarity)
+KEYWORD_FILTERS = ('product_type', 'content_type', 'target_audience')
+KEYWORD_BOOST = 10
+
+# Cosine similarity at which a record passes a keyword filter without a substring match
+SEMANTIC_MATCH_MIN = 0.15
+
+
+def _clean(value) -> str:
+    """Strip a filter value, treating None/empty as ''"""
+    return value.strip() if value else ''
+
+
+def _overlaps(query: str, value: str) -> bool:
+    """query contains value or value contains query; an empty value never matches"""
+    return bool(value) and (query in value or value in query)
+
+
+class FilterQuery:
+    """Filter values from the request, normalized once"""
+
+    def __init__(self, filters: Dict):
+        self.filters = filters
+        self.location = _clean(filters.get('location')).lower()
+        self.product_type = _clean(filters.get('product_type')).lower()
+        self.target_audience = _clean(filters.get('target_audience')).lower()
+        self.industry = _clean(filters.get('industry')).lower()
+
+        content_type = filters.get('content_type', [])
+        if content_type and isinstance(content_type, list):
+            self.content_types = [str(ct).lower() for ct in content_type]
+        else:
+            self.content_types = []
+
+        self.min_followers = parse_follower_count(filters.get('min_followers'))
+
+    def keyword_queries(self) -> Dict[str, str]:
+        """Text query for each keyword filter that is set"""
+        queries = {
+            'product_type': self.product_type,
+            'content_type': ' '.join(self.content_types),
+            'target_audience': self.target_audience,
+        }
+        return {name: text for name, text in queries.items() if text}
+
+
+class MatchRecord:
+    """One influencer normalized for matching: lowercased fields and parsed follower count"""
+
+    __slots__ = (
+        'influencer', 'location', 'domain_niche', 'job_title', 'use_case',
+        'bio', 'industry', 'follower_count', 'has_real_data', 'matches', 'relevance', 'semantic_only'
+    )
+
+    def __init__(self, influencer: Dict):
+        self.influencer = influencer
+        self.location = str(influencer.get('location', '')).lower()
+        self.domain_niche = str(influencer.get('domain_niche', '')).lower()
+        self.job_title = str(influencer.get('job_title', '')).lower()
+        self.use_case = str(influencer.get('use_case', '')).lower()
+        self.bio = str(influencer.get('bio', '')).lower()
+        self.industry = str(influencer.get('industry', '')).lower()
+
+        # Normally set at ingest; parse the display string for older records
+        self.follower_count = (
+            parse_follower_count(influencer.get('follower_count'))
+            or parse_follower_count(influencer.get('followers'))
+        )
+
+        self.has_real_data = bool(
+            influencer.get('real_instagram') or influencer.get('real_twitter') or influencer.get('real_linkedin')
+        )
+        self.matches = {}
+        self.relevance = {}
+        # Keyword filters passed by similarity alone (no substring match)
+        self.semantic_only = set()
+
+    def evaluate(self, query: FilterQuery) -> 'MatchRecord':
+        """Evaluate every filter predicate for this record (semantic matches are added separately)"""
+        m = self.matches
+
+        if query.location:
+            m['location'] = _overlaps(query.location, self.location)
+
+        # Unknown counts (e.g. catalog rows) can't be classed as micro/nano
+        m['macro_mid'] = not self.follower_count or self.follower_count >= MACRO_MID_MIN_FOLLOWERS
+
+        if query.min_followers:
+            m['min_followers'] = self.follower_count >= query.min_followers
+
+        if query.product_type:
+            p = query.product_type
+            m['product_type'] = (
+                _overlaps(p, self.domain_niche) or _overlaps(p, self.job_title) or p in self.use_case
+            )
+
+        if query.content_types:
+            m['content_type'] = any(
+                _overlaps(ct, self.domain_niche) or _overlaps(ct, self.job_title) or ct in self.bio
+                for ct in query.content_types
+            )
+
+        if query.target_audience:
+            a = query.target_audience
+            m['target_audience'] = (
+                _overlaps(a, self.domain_niche) or _overlaps(a, self.job_title)
+                or a in self.bio or a in self.use_case
+            )
+
+        if query.industry:
+            m['industry'] = _overlaps(query.industry, self.industry)
+
+        return self
+
+
+class FilterPolicy:
+    """
+    Declarative filter stage
+
+    Args:
+        name: Predicate key in MatchRecord.matches
+        strict_only: Only applied when the finder returned enough results
+        on_empty: 'keep_previous' keeps the input when every record is removed,
+                  'allow_empty' lets the stage remove everything
+    """
+
+    def __init__(self, name: str, strict_only: bool, on_empty: str):
+        self.name = name
+        self.strict_only = strict_only
+        self.on_empty = on_empty
+
+    def apply(self, records: List[MatchRecord]) -> List[MatchRecord]:
+        kept = [r for r in records if r.matches[self.name]]
+        if not kept and records and self.on_empty == 'keep_previous':
+            print(f"⚠️  {self.name} filter removed all influencers. Using lenient matching - keeping all {len(records)} influencers.")
+            return records
+        print(f"✅ {self.name} filter: {len(kept)}/{len(records)} influencers kept")
+        return kept
+
+
+# Applied in order; a stage runs only if its predicate was evaluated for the query
+FILTER_POLICIES = [
+    FilterPolicy('location', strict_only=True, on_empty='keep_previous'),
+    FilterPolicy('macro_mid', strict_only=False, on_empty='keep_previous'),
+    FilterPolicy('min_followers', strict_only=False, on_empty='allow_empty'),
+    FilterPolicy('product_type', strict_only=True, on_empty='keep_previous'),
+    FilterPolicy('content_type', strict_only=True, on_empty='keep_previous'),
+    FilterPolicy('target_audience', strict_only=True, on_empty='keep_previous'),
+]
+
+
+class RecommendationFilterEngine:
+    """Filter and score a finder result set against the request filters"""
+
+    def __init__(self, filters: Dict, policies: Optional[List[FilterPolicy]] = None):
+        self.query = FilterQuery(filters)
+        self.policies = FILTER_POLICIES if policies is None else policies
+
+    def compile(self, influencers: List[Dict]) -> List[MatchRecord]:
+        """Normalize each influencer once and evaluate all predicates"""
+        records = [MatchRecord(inf).evaluate(self.query) for inf in influencers]
+        self.match_semantically(records)
+        return records
+
+    def match_semantically(self, records: List[MatchRecord]) -> None:
+        """
+        Score each record against the keyword filters by TF-IDF similarity
+
+        Sets record.relevance[filter_name]; records at least SEMANTIC_MATCH_MIN
+        similar pass that filter even without a substring match ("gym" for
+        product type "fitness"). Uses the shared corpus fit; until its first
+        background fit is done, the model is fitted on this result set instead.
+        """
+        queries = self.query.keyword_queries()
+        if not queries or not records:
+            return
+        influencers = [record.influencer for record in records]
+        matcher = corpus_matcher.get() or SemanticMatcher().fit(influencers)
+        scores = matcher.scores(queries, influencers)
+        for name, similarities in scores.items():
+            for record, similarity in zip(records, similarities.tolist()):
+                record.relevance[name] = similarity
+                if similarity >= SEMANTIC_MATCH_MIN and not record.matches.get(name):
+                    record.matches[name] = True
+                    record.semantic_only.add(name)
+
+    def filter(self, records: List[MatchRecord]) -> List[MatchRecord]:
+        """Run the filter policies over compiled records"""
+        use_strict_filtering = len(records) >= STRICT_FILTERING_MIN_RESULTS
+        if not use_strict_filtering:
+            print(f"⚠️  Only {len(records)} influencers found - using LENIENT filtering to preserve results")
+
+        for policy in self.policies:
+            if policy.strict_only and not use_strict_filtering:
+                continue
+            if not records or policy.name not in records[0].matches:
+                continue
+            records = policy.apply(records)
+        return records
+
+    def score(self, records: List[MatchRecord]) -> List[Dict]:
+        """Set match_score, estimated engagement metrics and data_source; returns the influencers"""
+        keyword_filters = [name for name in KEYWORD_FILTERS if name in self.query.keyword_queries()]
+        best_scores = {
+            name: max((record.relevance.get(name, 0.0) for record in records), default=0.0)
+            for name in keyword_filters
+        }
+
+        keyword_boost = np.zeros(len(records))
+        for idx, record in enumerate(records):
+            inf = record.influencer
+
+            # Keyword relevance bonuses (product type, content type, target audience)
+            if keyword_filters:
+                keyword_relevance = 0.0
+                for name in keyword_filters:
+                    if record.matches.get(name) and name not in record.semantic_only:
+                        keyword_boost[idx] += KEYWORD_BOOST
+                    similarity = record.relevance.get(name, 0.0)
+                    if similarity >= SEMANTIC_MATCH_MIN:
+                        keyword_boost[idx] += KEYWORD_BOOST * similarity / best_scores[name]
+                        keyword_relevance += similarity
+                    if record.matches.get(name):
+                        inf[f'matches_{name}'] = True
+                inf['keyword_relevance'] = round(keyword_relevance, 3)
+
+            # Strong match bonuses
+            if record.matches.get('industry'):
+                inf['matches_industry'] = True
+            if record.matches.get('location'):
+                inf['matches_location'] = True
+
+            if not inf.get('follower_count'):
+                inf['follower_count'] = int(record.follower_count)
+
+        influencers = [record.influencer for record in records]
+        flags = {
+            'matches_industry': np.array([bool(r.matches.get('industry')) for r in records], dtype=bool),
+            'matches_location': np.array([bool(r.matches.get('location')) for r in records], dtype=bool),
+        }
+        # Boosts, estimated metrics and rank penalty are computed column-wise
+        return score_influencers(influencers, keyword_boost, flags)
+
+    def run(self, influencers: List[Dict]) -> List[Dict]:
+        """Compile, filter and score in one pass over the result set"""
+        print(f"📊 Starting with {len(influencers)} influencers from ChatGPT")
+        return self.score(self.filter(self.compile(influencers)))
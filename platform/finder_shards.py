@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Finder Shards
+Splits a large influencer search into smaller prompts that run concurrently:
+by platform when several are selected, then by follower band, then by name
+initials. Each shard asks ChatGPT for at most FINDER_SHARD_SIZE influencers,
+so 100 influencers take about as long as 20. Results are merged with
+duplicates (same name or same platform handle) removed.
+"""
+
+import math
+import os
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from follower_count import parse_follower_count
+from influencer_store import HANDLE_FIELDS, normalize_handle, normalize_name
+from range_index import FOLLOWER_TIERS
+from timing import submit_in_context
+
+# Largest number of influencers asked for in one prompt (bigger answers get slow and truncated)
+FINDER_SHARD_SIZE = int(os.getenv('FINDER_SHARD_SIZE', '20'))
+
+# Shard prompts in flight at once, across all requests in the process
+FINDER_SHARD_CONCURRENCY = int(os.getenv('FINDER_SHARD_CONCURRENCY', '8'))
+
+# Follower bands only split searches whose floor is at least this ("approximately N"
+# searches below it already target a narrow range)
+BAND_MIN_FOLLOWERS = 50000
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_shard_executor() -> ThreadPoolExecutor:
+    """Return the process-wide shard executor, creating it on first use"""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=FINDER_SHARD_CONCURRENCY,
+                    thread_name_prefix='finder-shard'
+                )
+    return _executor
+
+
+def shutdown_shard_executor(wait: bool = True) -> None:
+    """Shut the shared executor down (a later call to get_shard_executor recreates it)"""
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor:
+        executor.shutdown(wait=wait, cancel_futures=not wait)
+
+
+class Shard:
+    """One slice of a search: filters, how many to ask for, and an extra prompt instruction"""
+
+    def __init__(self, filters: Dict, limit: int, hint: Optional[str] = None):
+        self.filters = filters
+        self.limit = limit
+        self.hint = hint
+
+    def __repr__(self) -> str:
+        return f"Shard(limit={self.limit}, platforms={self.filters.get('platforms')}, hint={self.hint!r})"
+
+
+def _platform_slices(filters: Dict) -> List[Tuple[Dict, List[str]]]:
+    platforms = filters.get('platforms') or []
+    if not isinstance(platforms, list) or len(platforms) < 2:
+        return []
+    return [({'platforms': [platform]}, []) for platform in platforms]
+
+
+def _band_slices(filters: Dict) -> List[Tuple[Dict, List[str]]]:
+    """Follower tier bands from the requested floor up (min 10K, as the prompt asks)"""
+    floor = parse_follower_count(filters.get('min_followers'))
+    if filters.get('min_followers') and floor < BAND_MIN_FOLLOWERS:
+        return []
+    floor = max(floor, 10000)
+    bounds = [floor] + [bound for _, bound in FOLLOWER_TIERS if bound > floor]
+    slices = []
+    for low, high in zip(bounds, bounds[1:] + [None]):
+        if high is None:
+            hint = f"with at least {low:,} followers"
+        else:
+            hint = f"with {low:,}-{high:,} followers"
+        slices.append(({}, [hint]))
+    return slices if len(slices) > 1 else []
+
+
+def _initial_slices(count: int) -> List[Tuple[Dict, List[str]]]:
+    """Split A-Z into count contiguous ranges of name initials"""
+    letters = [chr(code) for code in range(ord('A'), ord('Z') + 1)]
+    size = math.ceil(len(letters) / count)
+    groups = [letters[i:i + size] for i in range(0, len(letters), size)]
+    return [({}, [f"whose names start with a letter from {group[0]} to {group[-1]}"]) for group in groups]
+
+
+def plan_shards(filters: Dict, limit: int, shard_size: int = FINDER_SHARD_SIZE) -> List[Shard]:
+    """
+    Shards covering a search for limit influencers
+
+    Dimensions are added (platform, then follower band, then name initials)
+    until there are enough shards for each to ask for at most shard_size.
+    A search within shard_size is a single shard.
+    """
+    needed = math.ceil(limit / shard_size)
+    if needed <= 1:
+        return [Shard(filters, limit)]
+
+    slices: List[Tuple[Dict, List[str]]] = [({}, [])]
+    for dimension in (_platform_slices(filters), _band_slices(filters)):
+        if len(slices) >= needed:
+            break
+        if dimension:
+            slices = [({**f1, **f2}, h1 + h2) for f1, h1 in slices for f2, h2 in dimension]
+    if len(slices) < needed:
+        initials = _initial_slices(math.ceil(needed / len(slices)))
+        slices = [({**f1, **f2}, h1 + h2) for f1, h1 in slices for f2, h2 in initials]
+
+    per_shard = math.ceil(limit / len(slices))
+    return [
+        Shard({**filters, **overrides}, per_shard, ' and '.join(hints) or None)
+        for overrides, hints in slices
+    ]
+
+
+def _identity_keys(influencer: Dict) -> List[Tuple[str, str]]:
+    keys = []
+    name = normalize_name(influencer.get('full_name'))
+    if name:
+        keys.append(('name', name))
+    for platform, field in HANDLE_FIELDS.items():
+        handle = normalize_handle(influencer.get(field))
+        if handle:
+            keys.append((platform, handle))
+    return keys
+
+
+class ShardMerger:
+    """Accept influencers from several shards, dropping repeats of a name or handle already accepted"""
+
+    def __init__(self, exclude_names: Optional[Iterable[str]] = None):
+        self._seen = {('name', normalize_name(name)) for name in exclude_names or [] if normalize_name(name)}
+        self.duplicates = 0
+
+    def add(self, influencer: Dict) -> bool:
+        if influencer.get('is_fallback'):
+            return False
+        keys = _identity_keys(influencer)
+        if any(key in self._seen for key in keys):
+            self.duplicates += 1
+            return False
+        self._seen.update(keys)
+        return True
+
+
+def run_shards(shards: List[Shard], find, exclude_names: Optional[List[str]] = None) -> List[Dict]:
+    """Run find(filters, limit, hint) for every shard concurrently; merged results in shard order"""
+    executor = get_shard_executor()
+    futures = [submit_in_context(executor, find, shard.filters, shard.limit, shard.hint) for shard in shards]
+    merger = ShardMerger(exclude_names)
+    merged = []
+    for shard, future in zip(shards, futures):
+        try:
+            found = future.result()
+        except Exception as e:
+            print(f"⚠️  Finder shard failed ({shard}): {e}")
+            continue
+        merged.extend(inf for inf in found if merger.add(inf))
+    print(f"🧩 {len(shards)} shards returned {len(merged)} influencers ({merger.duplicates} duplicates dropped)")
+    return merged
+
+
+def stream_shards(shards: List[Shard], stream, exclude_names: Optional[List[str]] = None) -> Iterator[Dict]:
+    """Run stream(filters, limit, hint) for every shard concurrently, yielding merged results as they arrive"""
+    executor = get_shard_executor()
+    results: queue.Queue = queue.Queue()
+    done = object()
+    stopped = threading.Event()
+
+    def pump(shard: Shard) -> None:
+        try:
+            for inf in stream(shard.filters, shard.limit, shard.hint):
+                if stopped.is_set():
+                    break
+                results.put(inf)
+        except Exception as e:
+            print(f"⚠️  Finder shard failed ({shard}): {e}")
+        finally:
+            results.put(done)
+
+    for shard in shards:
+        submit_in_context(executor, pump, shard)
+    merger = ShardMerger(exclude_names)
+    remaining = len(shards)
+    try:
+        while remaining:
+            item = results.get()
+            if item is done:
+                remaining -= 1
+            elif merger.add(item):
+                yield item
+    finally:
+        # Shards still streaming stop at their next influencer
+        stopped.set()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Follower Counts
+One parser for follower counts as ChatGPT, CSVs and users write them
+("1.2M", "12,500", "50K+", "3 lakh", "1.5 crore") and the matching formatter
+"""
+
+import re
+from functools import lru_cache
+from typing import Optional
+
+# Unit suffix (lowercase) -> multiplier
+FOLLOWER_UNITS = {
+    'k': 1_000, 'thousand': 1_000,
+    'm': 1_000_000, 'mn': 1_000_000, 'million': 1_000_000,
+    'b': 1_000_000_000, 'bn': 1_000_000_000, 'billion': 1_000_000_000,
+    'l': 100_000, 'lac': 100_000, 'lacs': 100_000, 'lakh': 100_000, 'lakhs': 100_000,
+    'cr': 10_000_000, 'crore': 10_000_000, 'crores': 10_000_000,
+}
+
+# A leading number with an optional unit; anything after it ("+", " followers",
+# the upper end of "10K-50K") is ignored
+_FOLLOWERS_RE = re.compile(
+    r'(\d+(?:\.\d+)?|\.\d+)\s*('
+    + '|'.join(sorted(FOLLOWER_UNITS, key=len, reverse=True))
+    + r')?(?![a-z])'
+)
+
+
+@lru_cache(maxsize=4096)
+def _parse_text(text: str) -> Optional[int]:
+    """Parse a follower string; None if it holds no number"""
+    match = _FOLLOWERS_RE.match(text.strip().lower().replace(',', '').lstrip('~≈'))
+    if not match:
+        return None
+    number, unit = match.groups()
+    return int(round(float(number) * FOLLOWER_UNITS.get(unit, 1)))
+
+
+def parse_follower_count(value, default: int = 0) -> int:
+    """
+    Parse a follower count to an int
+
+    Accepts ints/floats and strings like "1.2M", "12,500", "50K+",
+    "1,20,000", "3 lakh" or "1.5 crore". Returns default if value is empty
+    or not a count.
+    """
+    value_type = type(value)
+    if value_type is int:
+        return value
+    if value_type is str:
+        parsed = _parse_text(value)
+    elif value is None or value_type is bool:
+        return default
+    elif isinstance(value, (int, float)):
+        return int(value)
+    else:
+        parsed = _parse_text(str(value))
+    return default if parsed is None else parsed
+
+
+def format_follower_count(count: int) -> str:
+    """Format follower count as string (e.g., 50.0K, 1.2M)"""
+    if count >= 1000000:
+        return f"{count / 1000000:.1f}M"
+    elif count >= 1000:
+        return f"{count / 1000:.1f}K"
+    else:
+        return str(count)
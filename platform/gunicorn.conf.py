@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Gunicorn configuration for the platform
+Start with: gunicorn -c gunicorn.conf.py wsgi:app
+
+Every setting can be overridden with the environment variables below.
+"""
+
+import multiprocessing
+import os
+
+# Bind to the port Render (or the shell) gives us
+bind = f"0.0.0.0:{os.getenv('PORT', '5001')}"
+
+# Worker processes use more than one core; each runs a thread pool so slow
+# LLM calls don't block other requests in the same worker. Recommendation
+# job state is written to the shared SQLite store, so job polls can land on
+# any worker
+workers = int(os.getenv('WEB_CONCURRENCY', os.getenv('GUNICORN_WORKERS', min(multiprocessing.cpu_count() * 2 + 1, 4))))
+worker_class = 'gthread'
+threads = int(os.getenv('GUNICORN_THREADS', '8'))
+
+# Import the app (and build shared clients) once in the master, then fork
+preload_app = os.getenv('GUNICORN_PRELOAD', 'true').lower() == 'true'
+
+# Assistant API polling can take 60s and enrichment follows, so allow slow requests
+timeout = int(os.getenv('GUNICORN_TIMEOUT', '120'))
+
+# On SIGTERM, wait this long for in-flight requests and background jobs to finish
+graceful_timeout = int(os.getenv('GUNICORN_GRACEFUL_TIMEOUT', '90'))
+
+keepalive = int(os.getenv('GUNICORN_KEEPALIVE', '5'))
+
+# Recycle workers now and then to bound memory growth
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', '1000'))
+max_requests_jitter = int(os.getenv('GUNICORN_MAX_REQUESTS_JITTER', '100'))
+
+accesslog = '-'
+errorlog = '-'
+loglevel = os.getenv('GUNICORN_LOG_LEVEL', 'info')
+
+
+# Workers write metric snapshots here so /metrics reports totals over every worker
+# (whichever one answers the scrape); METRICS_MULTIPROC_DIR in the environment wins
+os.environ.setdefault('METRICS_MULTIPROC_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), '.metrics'))
+
+
+def on_starting(server):
+    """Drop metric snapshots from the previous run, so totals start from zero like the workers do"""
+    from metrics import clear_multiproc_dir
+    clear_multiproc_dir()
+
+
+def post_fork(server, worker):
+    """Start per-worker background threads (threads don't survive the fork from a preloaded master)"""
+    from wsgi import start_background_work
+    start_background_work()
+    server.log.info(f"✅ Worker {worker.pid} started ({threads} threads)")
+
+
+def worker_exit(server, worker):
+    """Drain this worker's background jobs and enrichment lookups before it exits (their final state is saved to the store)"""
+    from wsgi import shutdown_background_work
+    shutdown_background_work()
+    server.log.info(f"👋 Worker {worker.pid} drained background work")
+
+
+def child_exit(server, worker):
+    """Fold the exited worker's metrics into the dead-workers snapshot (runs in the master, also after a kill)"""
+    from metrics import mark_process_dead
+    mark_process_dead(worker.pid)
@@ -8,8 +8,7 @@ import os
 import hashlib
 import json
 from typing import Dict, Optional
-from data_manager import InfluencerDataManager
-from langchain_openai import ChatOpenAI
+from client_registry import get_chat_llm, get_data_manager
 from langchain.schema import HumanMessage
 
 class InfluencerAuth:
@@ -18,20 +17,9 @@ class InfluencerAuth:
     USERS_FILE = 'influencer_users.json'
     
     def __init__(self):
-        self.data_manager = InfluencerDataManager()
+        self.data_manager = get_data_manager()
         self.users = self._load_users()
-        self.llm = None
-        
-        openai_api_key = os.getenv('OPENAI_API_KEY')
-        if openai_api_key and openai_api_key != 'your_openai_api_key_here':
-            try:
-                self.llm = ChatOpenAI(
-                    model_name="gpt-4o-mini",
-                    temperature=0.3,
-                    openai_api_key=openai_api_key
-                )
-            except:
-                pass
+        self.llm = get_chat_llm(temperature=0.3)
     
     def _load_users(self) -> Dict:
         """Load registered users"""
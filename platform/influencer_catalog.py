@@ -0,0 +1,417 @@
+#!/usr/bin/env python3
+"""
+Influencer Catalog
+Offline catalog built from the bundled CSV corpora (800_influencers_balanced.csv
+and Indian_Influencers_Master_List.csv) plus any later imports. Rows are held
+column by column (categorical columns dictionary-encoded, follower counts in a
+compact int array) and can be queried by industry, location, platform, tier
+and follower / engagement range without calling ChatGPT. Bitmap indexes over
+industry, location, platform and tier give live facet counts for the filter
+panel.
+"""
+
+import csv
+import os
+import re
+import threading
+from array import array
+from typing import Dict, Iterable, List, Optional, Set
+from bitmap_index import BitmapIndex, bitmap_from_rows, bitmap_rows
+from follower_count import format_follower_count, parse_follower_count
+from range_index import FOLLOWER_TIERS, RangeIndex, tier_for_count
+from text_index import InvertedIndex, filter_keywords
+
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_CATALOG_PATHS = [
+    os.path.join(_REPO_ROOT, '800_influencers_balanced.csv'),
+    os.path.join(_REPO_ROOT, 'Indian_Influencers_Master_List.csv'),
+]
+# Extra CSVs can be listed with os.pathsep (':' on Linux)
+CATALOG_PATHS = [p for p in os.getenv('INFLUENCER_CATALOG_PATHS', os.pathsep.join(DEFAULT_CATALOG_PATHS)).split(os.pathsep) if p]
+
+# Platform keyword in a contact type / URL -> platform name
+PLATFORM_KEYWORDS = (
+    ('instagram', 'instagram'),
+    ('youtube', 'youtube'),
+    ('linkedin', 'linkedin'),
+    ('facebook', 'facebook'),
+    ('twitter', 'twitter'),
+    ('x.com', 'twitter'),
+)
+
+PLATFORM_DISPLAY_NAMES = {
+    'instagram': 'Instagram', 'youtube': 'YouTube', 'linkedin': 'LinkedIn',
+    'facebook': 'Facebook', 'twitter': 'Twitter',
+}
+
+# Profile URL patterns the handle can be read from
+_HANDLE_PATTERNS = {
+    'instagram': re.compile(r'instagram\.com/([A-Za-z0-9_.]+)'),
+    'youtube': re.compile(r'youtube\.com/(?:@|c/|channel/|user/)([A-Za-z0-9_.-]+)'),
+    'linkedin': re.compile(r'linkedin\.com/in/([A-Za-z0-9_-]+)'),
+    'facebook': re.compile(r'facebook\.com/([A-Za-z0-9_.]+)'),
+    'twitter': re.compile(r'(?:twitter|x)\.com/([A-Za-z0-9_]+)'),
+}
+
+
+def _detect_platform(*texts: str) -> str:
+    for text in texts:
+        lowered = (text or '').lower()
+        for keyword, platform in PLATFORM_KEYWORDS:
+            if keyword in lowered:
+                return platform
+    return ''
+
+
+def _parse_rate(value) -> float:
+    """Engagement rate in percent from 3.2 / '3.2%' (NaN when missing)"""
+    try:
+        return float(str(value).strip().rstrip('%'))
+    except (TypeError, ValueError):
+        return float('nan')
+
+
+def _handle_from_url(platform: str, url: str) -> str:
+    pattern = _HANDLE_PATTERNS.get(platform)
+    match = pattern.search(url or '') if pattern else None
+    return match.group(1) if match else ''
+
+
+def _balanced_list_row(row: Dict) -> Dict:
+    """Row of 800_influencers_balanced.csv (username,name,profile_url,followers,platform,location,source)"""
+    platform = (row.get('platform') or '').strip().lower()
+    return {
+        'name': row.get('name', ''),
+        'industry': '',
+        'domain_niche': '',
+        'location': row.get('location', ''),
+        'platform': platform,
+        'handle': (row.get('username') or '').strip(),
+        'followers': row.get('followers', ''),
+        'email': '',
+        'contact_type': PLATFORM_DISPLAY_NAMES.get(platform, platform.title()),
+        'contact_link': row.get('profile_url', ''),
+        'use_case': '',
+        'source_url': row.get('profile_url', ''),
+        'source': row.get('source', ''),
+    }
+
+
+def _master_list_row(row: Dict) -> Dict:
+    """Row of Indian_Influencers_Master_List.csv (Category,Name/Brand,Domain/Niche,Public Email,...)"""
+    contact_type = row.get('Contact Type', '')
+    link = row.get('Contact/Link', '')
+    platform = _detect_platform(contact_type, link)
+    return {
+        'name': row.get('Name/Brand', ''),
+        'industry': row.get('Category', ''),
+        'domain_niche': row.get('Domain/Niche', ''),
+        'location': row.get('Location', '') or 'India',
+        'platform': platform,
+        'handle': _handle_from_url(platform, link),
+        'followers': row.get('Followers', ''),
+        'email': row.get('Public Email', ''),
+        'contact_type': contact_type,
+        'contact_link': link,
+        'use_case': row.get('What to use for', ''),
+        'source_url': row.get('Source URL', ''),
+        'source': 'master_list',
+    }
+
+
+# Header column that identifies each supported CSV layout -> row converter
+CSV_LAYOUTS = (
+    ('username', _balanced_list_row),
+    ('Name/Brand', _master_list_row),
+)
+
+
+class CategoricalColumn:
+    """Dictionary-encoded string column: each distinct value stored once, rows hold codes"""
+
+    def __init__(self):
+        self.values: List[str] = []
+        self.lowered: List[str] = []
+        self._codes_by_value: Dict[str, int] = {}
+        self.codes = array('I')
+
+    def append(self, value: str) -> None:
+        value = (value or '').strip()
+        code = self._codes_by_value.get(value)
+        if code is None:
+            code = len(self.values)
+            self._codes_by_value[value] = code
+            self.values.append(value)
+            self.lowered.append(value.lower())
+        self.codes.append(code)
+
+    def __getitem__(self, row: int) -> str:
+        return self.values[self.codes[row]]
+
+    def matching_codes(self, needle: str) -> set:
+        """Codes whose value contains needle (or is contained in it), case-insensitive"""
+        needle = needle.strip().lower()
+        return {
+            code for code, value in enumerate(self.lowered)
+            if value and (needle in value or value in needle)
+        }
+
+
+class InfluencerCatalog:
+    """Column-oriented in-memory influencer catalog"""
+
+    CATEGORICAL = ('industry', 'location', 'platform', 'contact_type', 'source')
+    TEXT = ('name', 'domain_niche', 'handle', 'email', 'contact_link', 'use_case', 'source_url')
+    FACETS = ('industry', 'location', 'platform', 'tier')
+
+    def __init__(self):
+        self.columns = {name: CategoricalColumn() for name in self.CATEGORICAL}
+        self.text = {name: [] for name in self.TEXT}
+        self.follower_counts = array('q')  # 0 = unknown
+        self.engagement_rates = array('d')  # NaN = unknown
+        self.follower_index = RangeIndex()  # known follower counts only
+        self.engagement_index = RangeIndex()
+        self.text_index = InvertedIndex()
+        self.bitmaps = BitmapIndex(self.FACETS)
+        self.sources: List[str] = []
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.follower_counts)
+
+    def add_records(self, records: Iterable[Dict]) -> int:
+        """Append normalized records (see _balanced_list_row); returns rows added"""
+        added = 0
+        with self._lock:
+            for record in records:
+                if not (record.get('name') or '').strip():
+                    continue
+                for name, column in self.columns.items():
+                    column.append(record.get(name, ''))
+                for name, values in self.text.items():
+                    values.append((record.get(name) or '').strip())
+                row = len(self.follower_counts)
+                follower_count = parse_follower_count(record.get('follower_count') or record.get('followers'))
+                engagement_rate = _parse_rate(record.get('engagement_rate'))
+                self.follower_counts.append(follower_count)
+                self.engagement_rates.append(engagement_rate)
+                self.follower_index.add(row, follower_count or None)
+                self.engagement_index.add(row, engagement_rate)
+                self.bitmaps.add({
+                    'industry': self.columns['industry'][row],
+                    'location': self.columns['location'][row],
+                    'platform': self.columns['platform'][row],
+                    'tier': tier_for_count(follower_count) if follower_count else '',
+                })
+                self.text_index.add(row, {
+                    'domain_niche': record.get('domain_niche'),
+                    'industry': record.get('industry'),
+                    'use_case': record.get('use_case'),
+                    'bio': record.get('name'),
+                })
+                added += 1
+        return added
+
+    def import_csv(self, path: str) -> int:
+        """Load a CSV in one of the supported layouts; returns rows added"""
+        with open(path, newline='', encoding='utf-8') as f:
+            reader = csv.DictReader(f)
+            header = reader.fieldnames or []
+            for column, convert in CSV_LAYOUTS:
+                if column in header:
+                    added = self.add_records(convert(row) for row in reader)
+                    self.sources.append(path)
+                    print(f"📚 Catalog: loaded {added} influencers from {os.path.basename(path)}")
+                    return added
+        raise ValueError(f"Unrecognized catalog CSV layout in {path}: {header}")
+
+    def load(self, paths: Iterable[str] = None) -> 'InfluencerCatalog':
+        for path in (CATALOG_PATHS if paths is None else paths):
+            if not os.path.exists(path):
+                print(f"⚠️  Catalog CSV not found: {path}")
+                continue
+            try:
+                self.import_csv(path)
+            except Exception as e:
+                print(f"⚠️  Could not load catalog CSV {path}: {e}")
+        return self
+
+    def record(self, row: int) -> Dict:
+        """Materialize one row in the influencer shape the finder returns"""
+        name = self.text['name'][row]
+        industry = self.columns['industry'][row]
+        niche = self.text['domain_niche'][row]
+        platform = self.columns['platform'][row]
+        handle = self.text['handle'][row]
+        follower_count = self.follower_counts[row]
+        influencer = {
+            'id': f"catalog_{row}",
+            'full_name': name,
+            'email': self.text['email'][row],
+            'industry': industry,
+            'category': industry,
+            'job_title': niche,
+            'domain_niche': niche,
+            'company_name': name,
+            'location': self.columns['location'][row],
+            'contact_type': self.columns['contact_type'][row],
+            'contact_link': self.text['contact_link'][row],
+            'use_case': self.text['use_case'][row],
+            'source_url': self.text['source_url'][row],
+            'bio': f"{name} - {niche}" if niche else name,
+            'platform': PLATFORM_DISPLAY_NAMES.get(platform, platform.title()) if platform else 'Multiple',
+            'followers': format_follower_count(follower_count) if follower_count else '',
+            'follower_count': follower_count,
+            'catalog_source': self.columns['source'][row],
+        }
+        engagement_rate = self.engagement_rates[row]
+        if engagement_rate == engagement_rate:
+            influencer['engagement_rate'] = engagement_rate
+        for handle_platform in ('instagram', 'twitter', 'linkedin', 'youtube', 'facebook'):
+            influencer[f'{handle_platform}_handle'] = handle if platform == handle_platform else ''
+        return influencer
+
+    def _column_filters(self, industry: Optional[str] = None, location: Optional[str] = None,
+                        platforms: Optional[List[str]] = None, tiers: Optional[List[str]] = None) -> Dict[str, Set[str]]:
+        """
+        Bitmap index filters: column -> accepted values
+
+        industry/location match case-insensitive substrings (either way round,
+        like the recommendation filters); platforms and tiers match any listed
+        value.
+        """
+        filters = {}
+        for name, needle in (('industry', industry), ('location', location)):
+            if needle:
+                column = self.columns[name]
+                filters[name] = {column.values[code] for code in column.matching_codes(needle)}
+        if platforms:
+            column = self.columns['platform']
+            wanted = set()
+            for platform in platforms:
+                name = 'twitter' if platform.strip().lower() == 'x' else (_detect_platform(platform) or platform)
+                wanted |= {column.values[code] for code in column.matching_codes(name)}
+            filters['platform'] = wanted
+        if tiers:
+            wanted = {str(t).strip().lower() for t in tiers}
+            filters['tier'] = {name for name, _ in FOLLOWER_TIERS if name.lower() in wanted}
+        return filters
+
+    def _range_rows(self, min_followers: int = 0, max_followers: int = 0,
+                    min_engagement: Optional[float] = None,
+                    max_engagement: Optional[float] = None) -> Optional[Set[int]]:
+        """Rows within the follower / engagement bounds (None if no bound is set)"""
+        in_range = None
+        if min_followers or max_followers:
+            in_range = set(self.follower_index.range(min_followers or None, max_followers or None))
+        if min_engagement is not None or max_engagement is not None:
+            engagement_rows = set(self.engagement_index.range(min_engagement, max_engagement))
+            in_range = engagement_rows if in_range is None else in_range & engagement_rows
+        return in_range
+
+    def query_rows(self, industry: Optional[str] = None, location: Optional[str] = None,
+                   platforms: Optional[List[str]] = None, tiers: Optional[List[str]] = None,
+                   min_followers: int = 0, max_followers: int = 0,
+                   min_engagement: Optional[float] = None, max_engagement: Optional[float] = None,
+                   keywords: Optional[str] = None, limit: Optional[int] = None) -> List[int]:
+        """
+        Row numbers matching every given filter
+
+        Categorical filters (see _column_filters) are ANDed as bitmaps.
+        Follower and engagement bounds are answered by the range indexes and
+        exclude rows whose value is unknown. With keywords, only rows matching
+        at least one keyword are considered (read from the inverted index) and
+        rows come back by BM25 relevance.
+        """
+        column_filters = self._column_filters(industry, location, platforms, tiers)
+        in_range = self._range_rows(min_followers, max_followers, min_engagement, max_engagement)
+
+        if keywords:
+            rows = [row for row, _ in self.text_index.search(keywords)]
+            if in_range is not None:
+                rows = [row for row in rows if row in in_range]
+            if column_filters:
+                allowed = set(bitmap_rows(self.bitmaps.query(column_filters), len(self.bitmaps)))
+                rows = [row for row in rows if row in allowed]
+        else:
+            mask = None if in_range is None else bitmap_from_rows(in_range, len(self.bitmaps))
+            rows = bitmap_rows(self.bitmaps.query(column_filters, mask), len(self.bitmaps))
+        return rows[:limit] if limit else rows
+
+    def query(self, limit: Optional[int] = None, **filters) -> List[Dict]:
+        """query_rows(...) materialized as influencer dicts"""
+        return [self.record(row) for row in self.query_rows(limit=limit, **filters)]
+
+    def _filter_args(self, filters: Dict) -> Dict:
+        """query_rows keyword arguments for a /api/recommendations filters dict"""
+        platforms = filters.get('platforms') or []
+        if isinstance(platforms, str):
+            platforms = [platforms]
+        tiers = filters.get('tiers') or filters.get('tier') or []
+        if isinstance(tiers, str):
+            tiers = [tiers]
+        min_engagement = _parse_rate(filters.get('min_engagement_rate'))
+        max_engagement = _parse_rate(filters.get('max_engagement_rate'))
+        return dict(
+            industry=(filters.get('industry') or '').strip() or None,
+            location=(filters.get('location') or '').strip() or None,
+            platforms=[p for p in platforms if p and p.lower() != 'any'],
+            tiers=[t for t in tiers if t and t.lower() != 'any'],
+            min_followers=parse_follower_count(filters.get('min_followers')),
+            max_followers=parse_follower_count(filters.get('max_followers')),
+            min_engagement=min_engagement if min_engagement == min_engagement else None,
+            max_engagement=max_engagement if max_engagement == max_engagement else None,
+            keywords=filter_keywords(filters),
+        )
+
+    def query_filters(self, filters: Dict, limit: Optional[int] = None) -> List[Dict]:
+        """Query with a /api/recommendations filters dict"""
+        return self.query(limit=limit, **self._filter_args(filters))
+
+    def facets(self, filters: Optional[Dict] = None) -> Dict:
+        """
+        Matching row count and per-value facet counts for a filters dict
+
+        Each facet column is counted under every filter except its own, e.g.
+        with tier=Micro and location=Pune the tier facet shows how many Pune
+        influencers are in each tier.
+        """
+        args = self._filter_args(filters or {})
+        column_filters = self._column_filters(args['industry'], args['location'], args['platforms'], args['tiers'])
+        in_range = self._range_rows(args['min_followers'], args['max_followers'],
+                                    args['min_engagement'], args['max_engagement'])
+        if args['keywords']:
+            matched = self.text_index.match_any(args['keywords'])
+            in_range = matched if in_range is None else in_range & matched
+        mask = None if in_range is None else bitmap_from_rows(in_range, len(self.bitmaps))
+        return {
+            "total": self.bitmaps.query(column_filters, mask).bit_count(),
+            "facets": self.bitmaps.facets(column_filters, mask),
+        }
+
+    def filter_options(self) -> Dict:
+        """Filter panel options from the catalog's values, most common first"""
+        facets = self.bitmaps.facets({})
+        return {
+            "industries": list(facets['industry']),
+            "locations": list(facets['location']),
+            "platforms": [PLATFORM_DISPLAY_NAMES.get(p, p.title()) for p in facets['platform']],
+            "tiers": [name for name, _ in reversed(FOLLOWER_TIERS)],
+            "facet_counts": facets,
+            "total_influencers": len(self),
+        }
+
+    def tier_counts(self) -> Dict[str, int]:
+        """Influencers per follower tier from the follower index ('Unknown' = no follower count)"""
+        counts = self.follower_index.facet_counts()
+        counts['Unknown'] = len(self) - len(self.follower_index)
+        return counts
+
+    def stats(self) -> Dict:
+        return {
+            "influencers": len(self),
+            "sources": [os.path.basename(p) for p in self.sources],
+            "industries": len([v for v in self.columns['industry'].values if v]),
+            "platforms": sorted(v for v in self.columns['platform'].values if v),
+            "tiers": self.tier_counts(),
+        }
@@ -4,29 +4,20 @@ Influencer Evaluator
 Evaluates influencers on outreach, reactions, views, and engagement
 """
 
-import os
 from typing import Dict, List, Optional
-from data_manager import InfluencerDataManager
-from langchain_openai import ChatOpenAI
+import numpy as np
+from batch_scoring import evaluation_scores
+from client_registry import get_chat_llm, get_data_manager
 from langchain.schema import HumanMessage
 
+SOCIAL_PLATFORMS = ('linkedin', 'twitter', 'instagram', 'youtube', 'facebook')
+
 class InfluencerEvaluator:
     """Evaluate influencer performance metrics"""
     
     def __init__(self):
-        self.data_manager = InfluencerDataManager()
-        self.llm = None
-        
-        openai_api_key = os.getenv('OPENAI_API_KEY')
-        if openai_api_key and openai_api_key != 'your_openai_api_key_here':
-            try:
-                self.llm = ChatOpenAI(
-                    model_name="gpt-4o-mini",
-                    temperature=0.3,
-                    openai_api_key=openai_api_key
-                )
-            except:
-                pass
+        self.data_manager = get_data_manager()
+        self.llm = get_chat_llm(temperature=0.3)
     
     def evaluate(self, influencer_id: str, filters: Optional[Dict] = None) -> Dict:
         """
@@ -66,43 +57,29 @@ class InfluencerEvaluator:
     
     def _calculate_metrics(self, influencer: Dict) -> Dict:
         """Calculate basic metrics"""
-        # Outreach score (based on social media presence)
-        social_platforms = sum([
-            bool(influencer.get('linkedin_handle')),
-            bool(influencer.get('twitter_handle')),
-            bool(influencer.get('instagram_handle')),
-            bool(influencer.get('youtube_handle')),
-            bool(influencer.get('facebook_handle'))
-        ])
-        outreach_score = min(100, social_platforms * 20)
-        
-        # Reactions score (estimated from social presence)
-        # In real implementation, would fetch actual data
-        reactions_score = 70 if social_platforms >= 3 else 50
-        
-        # Views score (estimated)
-        views_score = 65 if social_platforms >= 2 else 40
-        
-        # Engagement rate (estimated)
-        engagement_rate = (outreach_score + reactions_score + views_score) / 3
+        return self._calculate_metrics_batch([influencer])[0]
+    
+    def _calculate_metrics_batch(self, influencers: List[Dict]) -> List[Dict]:
+        """
+        Calculate basic metrics for many influencers at once
         
-        overall_score = (outreach_score + reactions_score + views_score) / 3
+        Outreach is based on social media presence; reactions and views are
+        estimated from it (in real implementation, would fetch actual data).
+        """
+        presence = np.array([
+            [bool(inf.get(f'{platform}_handle')) for platform in SOCIAL_PLATFORMS]
+            for inf in influencers
+        ], dtype=bool).reshape(len(influencers), len(SOCIAL_PLATFORMS))
+        platform_counts = presence.sum(axis=1)
+        scores = {name: values.tolist() for name, values in evaluation_scores(platform_counts).items()}
         
-        return {
-            "outreach_score": round(outreach_score, 2),
-            "reactions_score": round(reactions_score, 2),
-            "views_score": round(views_score, 2),
-            "engagement_rate": round(engagement_rate, 2),
-            "overall_score": round(overall_score, 2),
-            "social_platforms_count": social_platforms,
-            "metrics": {
-                "linkedin": bool(influencer.get('linkedin_handle')),
-                "twitter": bool(influencer.get('twitter_handle')),
-                "instagram": bool(influencer.get('instagram_handle')),
-                "youtube": bool(influencer.get('youtube_handle')),
-                "facebook": bool(influencer.get('facebook_handle'))
-            }
-        }
+        results = []
+        for i, row in enumerate(presence.tolist()):
+            result = {name: values[i] for name, values in scores.items()}
+            result["social_platforms_count"] = int(platform_counts[i])
+            result["metrics"] = dict(zip(SOCIAL_PLATFORMS, row))
+            results.append(result)
+        return results
     
     def _ai_evaluate(self, influencer: Dict, metrics: Dict) -> Dict:
         """Use AI to provide evaluation insights"""
@@ -129,10 +106,22 @@ Return as JSON."""
             return {}
     
     def evaluate_batch(self, influencer_ids: List[str]) -> List[Dict]:
-        """Evaluate multiple influencers"""
+        """Evaluate multiple influencers (basic metrics computed in one batch)"""
+        influencers = [
+            inf_id if isinstance(inf_id, dict) else self.data_manager.get_influencer_by_id(inf_id)
+            for inf_id in influencer_ids
+        ]
+        found = [inf for inf in influencers if inf]
+        metrics = iter(self._calculate_metrics_batch(found)) if found else iter(())
+        
         evaluations = []
-        for inf_id in influencer_ids:
-            eval_result = self.evaluate(inf_id)
+        for inf_id, influencer in zip(influencer_ids, influencers):
+            if not influencer:
+                eval_result = {"error": "Influencer not found"}
+            else:
+                eval_result = next(metrics)
+                if self.llm:
+                    eval_result.update(self._ai_evaluate(influencer, eval_result))
             eval_result['influencer_id'] = inf_id
             evaluations.append(eval_result)
         return evaluations
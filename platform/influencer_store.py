@@ -0,0 +1,496 @@
+#!/usr/bin/env python3
+"""
+Influencer Store
+Embedded SQLite store of every influencer the finder has returned. Each
+influencer gets a stable id, and lookups by id, email, name or platform handle
+are index reads instead of a new ChatGPT search. Industry, location and
+follower count are kept in columns so stored influencers can be searched,
+and their text fields in a BM25 inverted index for keyword matching.
+"""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from typing import Dict, Iterable, List, Optional
+from follower_count import parse_follower_count
+from text_index import InvertedIndex
+
+INFLUENCER_DB_PATH = os.getenv(
+    'INFLUENCER_DB_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'influencers.db')
+)
+
+# Influencer field holding the handle for each platform
+HANDLE_FIELDS = {
+    'instagram': 'instagram_handle',
+    'twitter': 'twitter_handle',
+    'youtube': 'youtube_handle',
+    'linkedin': 'linkedin_handle',
+    'facebook': 'facebook_handle',
+}
+
+# Per-request fields that don't belong to the influencer record
+REQUEST_FIELDS = ('match_score', 'selected_platforms')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS influencers (
+    id TEXT PRIMARY KEY,
+    full_name TEXT NOT NULL,
+    name_norm TEXT NOT NULL,
+    email_lower TEXT,
+    data TEXT NOT NULL,
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL,
+    seen_count INTEGER NOT NULL DEFAULT 1,
+    industry_lower TEXT NOT NULL DEFAULT '',
+    location_lower TEXT NOT NULL DEFAULT '',
+    follower_count INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_influencers_email ON influencers(email_lower);
+CREATE INDEX IF NOT EXISTS idx_influencers_name ON influencers(name_norm);
+CREATE TABLE IF NOT EXISTS influencer_handles (
+    platform TEXT NOT NULL,
+    handle_norm TEXT NOT NULL,
+    influencer_id TEXT NOT NULL REFERENCES influencers(id),
+    PRIMARY KEY (platform, handle_norm)
+);
+CREATE INDEX IF NOT EXISTS idx_handles_handle ON influencer_handles(handle_norm);
+CREATE INDEX IF NOT EXISTS idx_handles_influencer ON influencer_handles(influencer_id);
+CREATE TABLE IF NOT EXISTS ranking_views (
+    view_key TEXT PRIMARY KEY,
+    filters TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    computed_at REAL NOT NULL,
+    compute_seconds REAL NOT NULL DEFAULT 0,
+    hits INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS leases (
+    name TEXT PRIMARY KEY,
+    owner TEXT NOT NULL,
+    expires_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS recommendation_jobs (
+    job_id TEXT PRIMARY KEY,
+    state TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_updated ON recommendation_jobs(updated_at);
+"""
+
+# Search columns added after the first release: column -> definition (existing databases are migrated)
+SEARCH_COLUMNS = {
+    'industry_lower': "TEXT NOT NULL DEFAULT ''",
+    'location_lower': "TEXT NOT NULL DEFAULT ''",
+    'follower_count': 'INTEGER NOT NULL DEFAULT 0',
+}
+SEARCH_INDEXES = """
+CREATE INDEX IF NOT EXISTS idx_influencers_industry ON influencers(industry_lower);
+CREATE INDEX IF NOT EXISTS idx_influencers_location ON influencers(location_lower);
+CREATE INDEX IF NOT EXISTS idx_influencers_followers ON influencers(follower_count);
+"""
+
+
+def normalize_name(name: str) -> str:
+    """Lowercase, strip accents and punctuation, collapse whitespace"""
+    name = unicodedata.normalize('NFKD', str(name or '')).encode('ascii', 'ignore').decode('ascii')
+    return ' '.join(re.sub(r'[^a-z0-9]+', ' ', name.lower()).split())
+
+
+def normalize_handle(handle: str) -> str:
+    """Lowercase handle without '@', URL prefix or trailing slash"""
+    handle = str(handle or '').strip().lower()
+    handle = re.sub(r'^https?://(www\.)?[^/]+/', '', handle)
+    return handle.lstrip('@').strip('/')
+
+
+def lookup_email(email: str) -> Optional[str]:
+    """Lowercased email, or None for the placeholders the finder makes up"""
+    email = str(email or '').strip().lower()
+    if not email or '@' not in email or 'example.com' in email or email.endswith('@influencer.com'):
+        return None
+    return email
+
+
+def stable_id(influencer: Dict) -> str:
+    """Deterministic id from the influencer's first handle, else their name"""
+    for platform, field in HANDLE_FIELDS.items():
+        handle = normalize_handle(influencer.get(field))
+        if handle:
+            identity = f"{platform}:{handle}"
+            break
+    else:
+        identity = f"name:{normalize_name(influencer.get('full_name') or influencer.get('name'))}"
+    return 'inf_' + hashlib.sha1(identity.encode('utf-8')).hexdigest()[:12]
+
+
+def search_values(influencer: Dict) -> tuple:
+    """(industry_lower, location_lower, follower_count) column values for an influencer"""
+    industry = str(influencer.get('industry') or influencer.get('category') or '').strip().lower()
+    location = str(influencer.get('location') or '').strip().lower()
+    follower_count = (
+        parse_follower_count(influencer.get('follower_count'))
+        or parse_follower_count(influencer.get('followers'))
+    )
+    return industry, location, follower_count
+
+
+class InfluencerStore:
+    """SQLite-backed influencer records (one connection per thread, WAL mode)"""
+
+    def __init__(self, path: str = INFLUENCER_DB_PATH):
+        self.path = path
+        self._local = threading.local()
+        self._schema_lock = threading.Lock()
+        self._schema_ready = False
+        # In-process keyword index over stored records; synced from last_seen, so
+        # records written by other processes sharing the database are picked up too
+        self.text_index = InvertedIndex()
+        self._index_lock = threading.Lock()
+        self._indexed_through = None
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.row_factory = sqlite3.Row
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            with self._schema_lock:
+                if not self._schema_ready:
+                    conn.executescript(SCHEMA)
+                    self._migrate(conn)
+                    conn.executescript(SEARCH_INDEXES)
+                    self._schema_ready = True
+            self._local.conn = conn
+        return conn
+
+    def _migrate(self, conn: sqlite3.Connection) -> None:
+        """Add search columns missing from an older database and fill them from the stored records"""
+        existing = {row[1] for row in conn.execute('PRAGMA table_info(influencers)')}
+        missing = [column for column in SEARCH_COLUMNS if column not in existing]
+        if not missing:
+            return
+        with conn:
+            for column in missing:
+                conn.execute(f'ALTER TABLE influencers ADD COLUMN {column} {SEARCH_COLUMNS[column]}')
+            rows = conn.execute('SELECT id, data FROM influencers').fetchall()
+            conn.executemany(
+                'UPDATE influencers SET industry_lower = ?, location_lower = ?, follower_count = ? WHERE id = ?',
+                [search_values(json.loads(row[1])) + (row[0],) for row in rows]
+            )
+        print(f"🗄️  Influencer store: added search columns {missing} ({len(rows)} records backfilled)")
+
+    def _find_existing_id(self, conn: sqlite3.Connection, handles: Dict[str, str],
+                          email: Optional[str], name_norm: str) -> Optional[str]:
+        """
+        Id of a stored record for the same person (handle, then email, then name)
+
+        An email match is ignored if the stored record has a different handle
+        on a platform the incoming record also has. Names alone are ambiguous
+        ("Rahul Sharma" the fitness creator vs the chef), so a name only
+        matches a record that has no handles and no email, and only when
+        exactly one stored record has that name.
+        """
+        for platform, handle in handles.items():
+            row = conn.execute(
+                'SELECT influencer_id FROM influencer_handles WHERE platform = ? AND handle_norm = ?',
+                (platform, handle)
+            ).fetchone()
+            if row:
+                return row[0]
+        if email:
+            row = conn.execute('SELECT id FROM influencers WHERE email_lower = ?', (email,)).fetchone()
+            if row and not self._has_conflicting_handle(conn, row[0], handles):
+                return row[0]
+            return None
+        if name_norm and not handles:
+            rows = conn.execute('SELECT id FROM influencers WHERE name_norm = ? LIMIT 2', (name_norm,)).fetchall()
+            if len(rows) == 1:
+                return rows[0][0]
+        return None
+
+    def _has_conflicting_handle(self, conn: sqlite3.Connection, influencer_id: str, handles: Dict[str, str]) -> bool:
+        """True if the stored record has a different handle on one of the given platforms"""
+        for platform, handle in handles.items():
+            row = conn.execute(
+                'SELECT handle_norm FROM influencer_handles WHERE influencer_id = ? AND platform = ?',
+                (influencer_id, platform)
+            ).fetchone()
+            if row and row[0] != handle:
+                return True
+        return False
+
+    def upsert_many(self, influencers: Iterable[Dict]) -> int:
+        """
+        Record influencers, setting each one's 'id' to its stable store id
+
+        Records for the same person (matched by handle, email or, for records
+        without either, name) are merged; newer non-empty values win. Fallback placeholders are skipped.
+        Returns the number of influencers recorded.
+        """
+        conn = self._connect()
+        now = time.time()
+        recorded = 0
+        with conn:
+            for inf in influencers:
+                if inf.get('is_fallback'):
+                    continue
+                name = inf.get('full_name') or inf.get('name') or ''
+                name_norm = normalize_name(name)
+                handles = {
+                    platform: normalize_handle(inf.get(field))
+                    for platform, field in HANDLE_FIELDS.items()
+                    if normalize_handle(inf.get(field))
+                }
+                if not name_norm and not handles:
+                    continue
+                email = lookup_email(inf.get('email'))
+
+                influencer_id = self._find_existing_id(conn, handles, email, name_norm) or stable_id(inf)
+                inf['id'] = influencer_id
+
+                data = {k: v for k, v in inf.items() if k not in REQUEST_FIELDS}
+                row = conn.execute('SELECT data FROM influencers WHERE id = ?', (influencer_id,)).fetchone()
+                if row:
+                    merged = json.loads(row[0])
+                    merged.update({k: v for k, v in data.items() if v not in (None, '', [], {})})
+                    data = merged
+                    email = email or lookup_email(data.get('email'))
+
+                conn.execute(
+                    """INSERT INTO influencers (id, full_name, name_norm, email_lower, data, first_seen, last_seen,
+                                                industry_lower, location_lower, follower_count)
+                       VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                       ON CONFLICT(id) DO UPDATE SET
+                           full_name = excluded.full_name,
+                           name_norm = excluded.name_norm,
+                           email_lower = excluded.email_lower,
+                           data = excluded.data,
+                           last_seen = excluded.last_seen,
+                           seen_count = seen_count + 1,
+                           industry_lower = excluded.industry_lower,
+                           location_lower = excluded.location_lower,
+                           follower_count = excluded.follower_count""",
+                    (influencer_id, name, name_norm, email, json.dumps(data, default=str), now, now)
+                    + search_values(data)
+                )
+                conn.executemany(
+                    'INSERT OR REPLACE INTO influencer_handles (platform, handle_norm, influencer_id) VALUES (?, ?, ?)',
+                    [(platform, handle, influencer_id) for platform, handle in handles.items()]
+                )
+                recorded += 1
+        return recorded
+
+    def _load(self, conn: sqlite3.Connection, influencer_id: str) -> Optional[Dict]:
+        row = conn.execute('SELECT data FROM influencers WHERE id = ?', (influencer_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Look up an influencer by stable id, email, platform handle or name"""
+        key = str(key or '').strip()
+        if not key:
+            return None
+        conn = self._connect()
+
+        influencer = self._load(conn, key)
+        if influencer:
+            return influencer
+
+        email = lookup_email(key)
+        if email:
+            row = conn.execute(
+                'SELECT data FROM influencers WHERE email_lower = ? ORDER BY last_seen DESC LIMIT 1', (email,)
+            ).fetchone()
+            if row:
+                return json.loads(row[0])
+
+        handle = normalize_handle(key)
+        if handle:
+            row = conn.execute(
+                'SELECT influencer_id FROM influencer_handles WHERE handle_norm = ? LIMIT 1', (handle,)
+            ).fetchone()
+            if row:
+                return self._load(conn, row[0])
+
+        name_norm = normalize_name(key)
+        if name_norm:
+            row = conn.execute(
+                'SELECT data FROM influencers WHERE name_norm = ? ORDER BY last_seen DESC LIMIT 1', (name_norm,)
+            ).fetchone()
+            if row:
+                return json.loads(row[0])
+        return None
+
+    def _search_where(self, industry: Optional[str], location: Optional[str],
+                      min_followers: int, max_followers: int) -> tuple:
+        """WHERE clause and parameters for search()/count_matching()"""
+        clauses, params = [], []
+        for column, needle in (('industry_lower', industry), ('location_lower', location)):
+            needle = (needle or '').strip().lower()
+            if needle:
+                # Same either-way substring match as the recommendation filters; empty values never match
+                clauses.append(f"({column} != '' AND (instr({column}, ?) > 0 OR instr(?, {column}) > 0))")
+                params += [needle, needle]
+        if min_followers:
+            clauses.append('follower_count >= ?')
+            params.append(int(min_followers))
+        if max_followers:
+            clauses.append('follower_count BETWEEN 1 AND ?')
+            params.append(int(max_followers))
+        return (' WHERE ' + ' AND '.join(clauses)) if clauses else '', params
+
+    def sync_text_index(self) -> InvertedIndex:
+        """Index records added or updated since the last sync (by any process) and return the index"""
+        with self._index_lock:
+            conn = self._connect()
+            if self._indexed_through is None:
+                rows = conn.execute('SELECT id, data, last_seen FROM influencers').fetchall()
+            else:
+                # >= so rows sharing the watermark timestamp aren't missed (re-adding replaces)
+                rows = conn.execute(
+                    'SELECT id, data, last_seen FROM influencers WHERE last_seen >= ?', (self._indexed_through,)
+                ).fetchall()
+            self.text_index.add_many((row[0], json.loads(row[1])) for row in rows)
+            if rows:
+                self._indexed_through = max(row[2] for row in rows)
+            elif self._indexed_through is None:
+                self._indexed_through = 0.0
+        return self.text_index
+
+    def search(self, industry: Optional[str] = None, location: Optional[str] = None,
+               min_followers: int = 0, max_followers: int = 0, limit: Optional[int] = None,
+               keywords: Optional[str] = None) -> List[Dict]:
+        """
+        Stored influencers matching industry/location (substring) and follower bounds, most seen first
+
+        With keywords, only influencers matching at least one keyword (read
+        from the inverted index) are returned, ranked by BM25 relevance.
+        """
+        where, params = self._search_where(industry, location, min_followers, max_followers)
+        if keywords:
+            ranked = [doc_id for doc_id, _ in self.sync_text_index().search(keywords)]
+            if where:
+                allowed = {row[0] for row in self._connect().execute(f'SELECT id FROM influencers{where}', params)}
+                ranked = [doc_id for doc_id in ranked if doc_id in allowed]
+            conn = self._connect()
+            records = (self._load(conn, doc_id) for doc_id in (ranked[:limit] if limit else ranked))
+            return [record for record in records if record is not None]
+        sql = f'SELECT data FROM influencers{where} ORDER BY seen_count DESC, last_seen DESC'
+        if limit:
+            sql += ' LIMIT ?'
+            params.append(int(limit))
+        return [json.loads(row[0]) for row in self._connect().execute(sql, params).fetchall()]
+
+    def count_matching(self, industry: Optional[str] = None, location: Optional[str] = None,
+                       min_followers: int = 0, max_followers: int = 0) -> int:
+        where, params = self._search_where(industry, location, min_followers, max_followers)
+        return self._connect().execute(f'SELECT COUNT(*) FROM influencers{where}', params).fetchone()[0]
+
+    def count(self) -> int:
+        return self._connect().execute('SELECT COUNT(*) FROM influencers').fetchone()[0]
+
+    def stats(self) -> Dict:
+        try:
+            return {"path": self.path, "influencers": self.count()}
+        except sqlite3.Error as e:
+            return {"path": self.path, "error": str(e)}
+
+    def recent(self, limit: int = 50) -> List[Dict]:
+        rows = self._connect().execute(
+            'SELECT data FROM influencers ORDER BY last_seen DESC LIMIT ?', (limit,)
+        ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def save_view(self, view_key: str, filters: Dict, payload: Dict, compute_seconds: float = 0.0) -> None:
+        """Store a precomputed ranking view (hit count survives refreshes)"""
+        conn = self._connect()
+        with conn:
+            conn.execute(
+                """INSERT INTO ranking_views (view_key, filters, payload, computed_at, compute_seconds)
+                   VALUES (?, ?, ?, ?, ?)
+                   ON CONFLICT(view_key) DO UPDATE SET
+                       filters = excluded.filters,
+                       payload = excluded.payload,
+                       computed_at = excluded.computed_at,
+                       compute_seconds = excluded.compute_seconds""",
+                (view_key, json.dumps(filters), json.dumps(payload, default=str), time.time(), compute_seconds)
+            )
+
+    def load_view(self, view_key: str, count_hit: bool = True) -> Optional[Dict]:
+        """Ranking view with its freshness metadata ({'payload', 'computed_at', ...}), or None"""
+        conn = self._connect()
+        row = conn.execute('SELECT * FROM ranking_views WHERE view_key = ?', (view_key,)).fetchone()
+        if row is None:
+            return None
+        if count_hit:
+            with conn:
+                conn.execute('UPDATE ranking_views SET hits = hits + 1 WHERE view_key = ?', (view_key,))
+        view = dict(row)
+        view['filters'] = json.loads(view['filters'])
+        view['payload'] = json.loads(view['payload'])
+        return view
+
+    def list_views(self) -> List[Dict]:
+        """Freshness metadata of every ranking view (without payloads), most used first"""
+        rows = self._connect().execute(
+            'SELECT view_key, filters, computed_at, compute_seconds, hits FROM ranking_views ORDER BY hits DESC, view_key'
+        ).fetchall()
+        return [dict(row, filters=json.loads(row['filters'])) for row in rows]
+
+    def acquire_lease(self, name: str, owner: str, ttl: float) -> bool:
+        """
+        Take or renew a named lease for ttl seconds
+
+        Returns True if owner holds it afterwards. Lets one process among
+        several (e.g. Gunicorn workers sharing the database) run a periodic
+        task.
+        """
+        conn = self._connect()
+        now = time.time()
+        with conn:
+            conn.execute(
+                """INSERT INTO leases (name, owner, expires_at) VALUES (?, ?, ?)
+                   ON CONFLICT(name) DO UPDATE SET owner = excluded.owner, expires_at = excluded.expires_at
+                   WHERE leases.expires_at < ? OR leases.owner = excluded.owner""",
+                (name, owner, now + ttl, now)
+            )
+            row = conn.execute('SELECT owner FROM leases WHERE name = ?', (name,)).fetchone()
+        return bool(row) and row[0] == owner
+
+    def release_lease(self, name: str, owner: str) -> None:
+        """Give up a lease owner holds (another process can take it at once)"""
+        conn = self._connect()
+        with conn:
+            conn.execute('DELETE FROM leases WHERE name = ? AND owner = ?', (name, owner))
+
+    def save_job(self, job_id: str, state: Dict) -> None:
+        """Store a recommendation job's state so any worker process can answer polls for it"""
+        conn = self._connect()
+        with conn:
+            conn.execute(
+                """INSERT INTO recommendation_jobs (job_id, state, updated_at) VALUES (?, ?, ?)
+                   ON CONFLICT(job_id) DO UPDATE SET state = excluded.state, updated_at = excluded.updated_at""",
+                (job_id, json.dumps(state, default=str), time.time())
+            )
+
+    def load_job(self, job_id: str) -> Optional[Dict]:
+        row = self._connect().execute('SELECT state FROM recommendation_jobs WHERE job_id = ?', (job_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def delete_jobs_before(self, cutoff: float) -> int:
+        """Drop jobs last updated before cutoff (finished ones, or ones whose worker died); returns the count"""
+        conn = self._connect()
+        with conn:
+            return conn.execute('DELETE FROM recommendation_jobs WHERE updated_at < ?', (cutoff,)).rowcount
+
+    def close(self) -> None:
+        """Close this thread's connection"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
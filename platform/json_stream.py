@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+JSON Stream
+Incremental parser for an LLM's JSON array of objects. Text is fed in as it
+arrives (token chunks) and each top-level object is returned as soon as its
+closing brace is seen, so the first result is usable long before the array
+is complete. Prose, code fences and array brackets around the objects are
+skipped, and a truncated or malformed array still gives up every complete
+object in it.
+"""
+
+import json
+import re
+from typing import Dict, List
+
+# ",}" / ",]" - the most common slip in model-written JSON
+_TRAILING_COMMA = re.compile(r',\s*([}\]])')
+
+
+class JSONObjectStream:
+    """
+    Feed text chunks, get back each complete top-level JSON object
+
+    Brace depth is tracked outside string literals (escapes included), so
+    braces inside values never end an object early. A span that fails
+    json.loads is retried without trailing commas, then dropped and counted
+    in skipped.
+    """
+
+    def __init__(self):
+        self._buffer: List[str] = []
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self.parsed = 0
+        self.skipped = 0
+
+    def feed(self, chunk: str) -> List[Dict]:
+        """Consume chunk; returns the objects it completed, in order"""
+        objects = []
+        for char in chunk:
+            if self._depth == 0:
+                if char == '{':
+                    self._buffer = [char]
+                    self._depth = 1
+                continue
+            self._buffer.append(char)
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == '\\':
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char == '{':
+                self._depth += 1
+            elif char == '}':
+                self._depth -= 1
+                if self._depth == 0:
+                    obj = self._load(''.join(self._buffer))
+                    self._buffer = []
+                    if obj is not None:
+                        objects.append(obj)
+        return objects
+
+    def _load(self, text: str):
+        try:
+            obj = json.loads(text)
+        except json.JSONDecodeError:
+            try:
+                obj = json.loads(_TRAILING_COMMA.sub(r'\1', text))
+            except json.JSONDecodeError:
+                self.skipped += 1
+                return None
+        if not isinstance(obj, dict):
+            self.skipped += 1
+            return None
+        self.parsed += 1
+        return obj
+
+    @property
+    def pending(self) -> bool:
+        """True while an object has been opened but not closed (e.g. a truncated response)"""
+        return self._depth > 0
+
+
+def salvage_json_objects(text: str) -> List[Dict]:
+    """Every complete top-level object in text, e.g. from an array cut off mid-object"""
+    return JSONObjectStream().feed(text)
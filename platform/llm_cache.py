@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+LLM Response Cache
+On-disk cache of LLM completions shared by every worker process. Entries are
+content-addressed: the key is a SHA-256 of (model, temperature, system
+prompt, user prompt), so any repeated prompt is answered locally. Stored in
+SQLite (WAL mode, safe for concurrent processes) with a TTL and
+least-recently-used eviction once the responses exceed LLM_CACHE_MAX_BYTES.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from metrics import LLM_CACHE_LOOKUPS
+
+LLM_CACHE_ENABLED = os.getenv('LLM_CACHE_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+
+LLM_CACHE_PATH = os.getenv(
+    'LLM_CACHE_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'llm_cache.db')
+)
+
+# Total response text kept, in bytes; least recently used entries go first
+LLM_CACHE_MAX_BYTES = int(os.getenv('LLM_CACHE_MAX_BYTES', str(64 * 1024 * 1024)))
+
+# Entries older than this are treated as misses, in seconds
+LLM_CACHE_TTL_SECONDS = float(os.getenv('LLM_CACHE_TTL_SECONDS', str(7 * 24 * 3600)))
+
+# Eviction runs after this many writes (and on the first write of a process)
+EVICT_EVERY_WRITES = 50
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS llm_responses (
+    key TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    response TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    last_used REAL NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_llm_responses_last_used ON llm_responses(last_used);
+"""
+
+
+def cache_key(model: str, temperature: Optional[float], system: str, prompt: str) -> str:
+    """SHA-256 content address of one LLM request"""
+    identity = json.dumps([model, temperature, system or '', prompt], ensure_ascii=False)
+    return hashlib.sha256(identity.encode('utf-8')).hexdigest()
+
+
+class LLMCache:
+    """SQLite-backed response cache (one connection per thread)"""
+
+    def __init__(self, path: str = LLM_CACHE_PATH, max_bytes: int = LLM_CACHE_MAX_BYTES,
+                 ttl: float = LLM_CACHE_TTL_SECONDS):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._local = threading.local()
+        self._schema_lock = threading.Lock()
+        self._schema_ready = False
+        self._writes = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            with self._schema_lock:
+                if not self._schema_ready:
+                    conn.executescript(SCHEMA)
+                    self._schema_ready = True
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> Optional[str]:
+        """Cached response for key, or None if missing or expired"""
+        conn = self._connect()
+        row = conn.execute('SELECT response, created_at FROM llm_responses WHERE key = ?', (key,)).fetchone()
+        now = time.time()
+        if row is None or now - row[1] > self.ttl:
+            LLM_CACHE_LOOKUPS.inc(result='miss')
+            return None
+        with conn:
+            conn.execute('UPDATE llm_responses SET last_used = ?, hits = hits + 1 WHERE key = ?', (now, key))
+        LLM_CACHE_LOOKUPS.inc(result='hit')
+        return row[0]
+
+    def set(self, key: str, model: str, response: str) -> None:
+        now = time.time()
+        conn = self._connect()
+        with conn:
+            conn.execute(
+                """INSERT OR REPLACE INTO llm_responses (key, model, response, size, created_at, last_used)
+                   VALUES (?, ?, ?, ?, ?, ?)""",
+                (key, model, response, len(response.encode('utf-8')), now, now)
+            )
+        with self._schema_lock:
+            self._writes += 1
+            evict = self._writes % EVICT_EVERY_WRITES == 1
+        if evict:
+            self.evict()
+
+    def evict(self) -> int:
+        """Drop expired entries, then least recently used ones until under max_bytes; returns entries removed"""
+        conn = self._connect()
+        with conn:
+            removed = conn.execute('DELETE FROM llm_responses WHERE created_at < ?', (time.time() - self.ttl,)).rowcount
+            total = conn.execute('SELECT COALESCE(SUM(size), 0) FROM llm_responses').fetchone()[0]
+            if total > self.max_bytes:
+                excess = total - self.max_bytes
+                victims, freed = [], 0
+                for key, size in conn.execute('SELECT key, size FROM llm_responses ORDER BY last_used'):
+                    if freed >= excess:
+                        break
+                    victims.append((key,))
+                    freed += size
+                conn.executemany('DELETE FROM llm_responses WHERE key = ?', victims)
+                removed += len(victims)
+        return removed
+
+    def clear(self) -> None:
+        conn = self._connect()
+        with conn:
+            conn.execute('DELETE FROM llm_responses')
+
+    def stats(self) -> Dict:
+        try:
+            entries, size, hits = self._connect().execute(
+                'SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(hits), 0) FROM llm_responses'
+            ).fetchone()
+        except sqlite3.Error as e:
+            return {"path": self.path, "error": str(e)}
+        return {
+            "path": self.path,
+            "entries": entries,
+            "bytes": size,
+            "max_bytes": self.max_bytes,
+            "ttl_seconds": self.ttl,
+            "hits": hits,
+        }
+
+
+def is_json_reply(text: Optional[str]) -> bool:
+    """
+    True if text holds a non-empty JSON value (bare or in a ``` fence)
+
+    Mirrors how the analyzers read their replies, so refusals and prose
+    they would discard are never cached.
+    """
+    if not text:
+        return False
+    if '```json' in text:
+        text = text.split('```json')[1].split('```')[0]
+    elif '```' in text:
+        text = text.split('```')[1].split('```')[0]
+    try:
+        return bool(json.loads(text.strip()))
+    except (json.JSONDecodeError, IndexError):
+        return False
+
+
+def _lookup(cache: LLMCache, key: str, model: str) -> Optional[str]:
+    try:
+        cached = cache.get(key)
+    except sqlite3.Error as e:
+        print(f"⚠️  LLM cache read failed: {e}")
+        return None
+    if cached is not None:
+        print(f"💾 LLM cache hit ({model}, {len(cached)} chars)")
+    return cached
+
+
+def _store(cache: LLMCache, key: str, model: str, response: Optional[str],
+           validate: Optional[Callable[[str], bool]]) -> None:
+    """Save a response; empty ones, and ones validate rejects, are not stored"""
+    if not response or (validate is not None and not validate(response)):
+        print(f"🚫 LLM response not cached ({model}, {len(response or '')} chars unusable)")
+        return
+    try:
+        cache.set(key, model, response)
+    except sqlite3.Error as e:
+        print(f"⚠️  LLM cache write failed: {e}")
+
+
+def cached_completion(cache: Optional[LLMCache], model: str, temperature: Optional[float], system: str,
+                      prompt: str, compute: Callable[[], Optional[str]],
+                      validate: Optional[Callable[[str], bool]] = None) -> Optional[str]:
+    """
+    compute() through the cache
+
+    Only responses that pass validate (if given) are stored, so a refusal
+    or unparseable reply is asked again next time instead of being replayed.
+    Cache errors are logged and the LLM is called as if there were no cache.
+    """
+    if cache is None:
+        return compute()
+    key = cache_key(model, temperature, system, prompt)
+    cached = _lookup(cache, key, model)
+    if cached is not None:
+        return cached
+    response = compute()
+    _store(cache, key, model, response, validate)
+    return response
+
+
+def cached_stream(cache: Optional[LLMCache], model: str, temperature: Optional[float], system: str,
+                  prompt: str, stream: Callable[[], Iterator[str]],
+                  validate: Optional[Callable[[str], bool]] = None) -> Iterator[str]:
+    """
+    Text chunks of stream() through the cache
+
+    A hit yields the whole cached response as one chunk. A miss is stored
+    only if the caller reads the stream to the end (closing it early, e.g.
+    once enough results arrived, leaves an incomplete answer uncached) and
+    the full text passes validate.
+    """
+    if cache is None:
+        yield from stream()
+        return
+    key = cache_key(model, temperature, system, prompt)
+    cached = _lookup(cache, key, model)
+    if cached is not None:
+        yield cached
+        return
+    chunks = []
+    with closing(stream()) as source:
+        for chunk in source:
+            chunks.append(chunk)
+            yield chunk
+    _store(cache, key, model, ''.join(chunks), validate)
+
+
+def _split_messages(messages: List) -> Tuple[str, str]:
+    """
+    (system prompt, user prompt) of a LangChain message list
+
+    A lone user message keys exactly like a plain prompt; longer
+    conversations keep each message's role in the key.
+    """
+    system = [m.content for m in messages if getattr(m, 'type', '') == 'system']
+    rest = [m for m in messages if getattr(m, 'type', '') != 'system']
+    if len(rest) == 1:
+        prompt = rest[0].content
+    else:
+        prompt = '\n\n'.join(f"{m.type}: {m.content}" for m in rest)
+    return '\n\n'.join(system), prompt
+
+
+class CachedChatLLM:
+    """
+    LangChain chat model whose invoke() goes through an LLMCache
+
+    Returns an AIMessage either way, so callers keep using response.content.
+    Only replies that pass validate are stored (by default, non-empty JSON,
+    which is what every analyzer prompt asks for). Anything else is
+    delegated to the wrapped model.
+    """
+
+    def __init__(self, llm, model: str, temperature: float, cache: LLMCache,
+                 validate: Callable[[str], bool] = is_json_reply):
+        self.llm = llm
+        self.model = model
+        self.temperature = temperature
+        self.cache = cache
+        self.validate = validate
+
+    def invoke(self, messages, *args, **kwargs):
+        from langchain_core.messages import AIMessage
+
+        if isinstance(messages, str):
+            system, prompt = '', messages
+        else:
+            system, prompt = _split_messages(messages)
+        content = cached_completion(
+            self.cache, self.model, self.temperature, system, prompt,
+            lambda: self.llm.invoke(messages, *args, **kwargs).content,
+            self.validate
+        )
+        return AIMessage(content=content or '')
+
+    def __getattr__(self, name):
+        return getattr(self.llm, name)
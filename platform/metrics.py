@@ -0,0 +1,435 @@
+#!/usr/bin/env python3
+"""
+Prometheus Metrics
+In-process counters and histograms rendered in the Prometheus text format at
+/metrics: HTTP requests per route, LLM calls per path, social API calls per
+platform and status code, result cache lookups and fallback usage.
+
+With METRICS_MULTIPROC_DIR set, every worker process writes a snapshot of its
+metrics there and /metrics reports the sum over all workers (including ones
+that have exited), so a scrape gives the same totals whichever worker answers.
+"""
+
+import glob
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional, Tuple
+import timing
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Latency bucket upper bounds, in seconds
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+# Directory shared by the worker processes (e.g. Gunicorn workers) for aggregated
+# metrics; unset, /metrics reports only the process that answers the scrape
+METRICS_MULTIPROC_DIR = os.getenv('METRICS_MULTIPROC_DIR', os.getenv('PROMETHEUS_MULTIPROC_DIR', ''))
+
+# How often each worker writes its snapshot to METRICS_MULTIPROC_DIR, in seconds
+METRICS_FLUSH_SECONDS = float(os.getenv('METRICS_FLUSH_SECONDS', '5'))
+
+# Counters and histograms of exited workers, folded into one file
+DEAD_SNAPSHOT = 'metrics_dead.json'
+
+_registry: List = []
+_registry_lock = threading.Lock()
+
+# Called before metrics are read, to set gauges from their source
+_collectors: List[Callable[[], None]] = []
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _format_labels(labels: Tuple[Tuple[str, str], ...]) -> str:
+    if not labels:
+        return ''
+    escaped = []
+    for name, value in labels:
+        value = str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+        escaped.append(f'{name}="{value}"')
+    return '{' + ','.join(escaped) + '}'
+
+
+class _Metric:
+    """Base class: a named metric family with a fixed set of label names"""
+
+    type_name = 'untyped'
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+        with _registry_lock:
+            _registry.append(self)
+
+    def _label_key(self, labels: Dict) -> Tuple[Tuple[str, str], ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple((name, str(labels[name])) for name in self.labelnames)
+
+    def values(self) -> Dict:
+        """Current value per label key (a copy)"""
+        with self._lock:
+            return dict(self._values)
+
+    def merge(self, total, value):
+        """Combine one process's value into the running total across processes"""
+        return value if total is None else total + value
+
+    def samples(self, values: Optional[Dict] = None) -> List[Tuple[str, Tuple, float]]:
+        values = self.values() if values is None else values
+        return [(self.name, key, value) for key, value in sorted(values.items())]
+
+    def render(self, values: Optional[Dict] = None) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type_name}"]
+        for name, labels, value in self.samples(values):
+            lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        return lines
+
+
+class Counter(_Metric):
+    """Monotonically increasing count"""
+
+    type_name = 'counter'
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    """Value that can go up and down"""
+
+    type_name = 'gauge'
+
+    def set(self, value: float, **labels) -> None:
+        key = self._label_key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(_Metric):
+    """Cumulative histogram with _bucket, _sum and _count series"""
+
+    type_name = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = (),
+                 buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._label_key(labels)
+        index = len(self.buckets)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                index = i
+                break
+        with self._lock:
+            counts, total = self._values.get(key, ([0] * (len(self.buckets) + 1), 0.0))
+            counts[index] += 1
+            self._values[key] = (counts, total + value)
+
+    @contextmanager
+    def time(self, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def values(self) -> Dict:
+        with self._lock:
+            return {key: (list(counts), total) for key, (counts, total) in self._values.items()}
+
+    def merge(self, total, value):
+        if total is None:
+            return list(value[0]), value[1]
+        return [a + b for a, b in zip(total[0], value[0])], total[1] + value[1]
+
+    def samples(self, values: Optional[Dict] = None):
+        values = self.values() if values is None else values
+        samples = []
+        for key, (counts, total) in sorted(values.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += count
+                samples.append((f"{self.name}_bucket", key + (('le', _format_value(bound)),), cumulative))
+            samples.append((f"{self.name}_sum", key, total))
+            samples.append((f"{self.name}_count", key, cumulative))
+        return samples
+
+
+HTTP_REQUESTS = Counter(
+    'nova_http_requests_total', 'HTTP requests handled, by route, method and status code',
+    ('route', 'method', 'status')
+)
+HTTP_REQUEST_SECONDS = Histogram(
+    'nova_http_request_duration_seconds', 'Time to produce the HTTP response (until headers for streams), by route',
+    ('route', 'method')
+)
+LLM_CALLS = Counter(
+    'nova_llm_calls_total', 'LLM calls by path (langchain, assistant, chat_completions) and outcome',
+    ('path', 'outcome')
+)
+LLM_CALL_SECONDS = Histogram(
+    'nova_llm_call_duration_seconds', 'LLM call latency by path, including failed calls',
+    ('path',)
+)
+SOCIAL_API_REQUESTS = Counter(
+    'nova_social_api_requests_total', 'HTTP requests to social media APIs, by platform and status code',
+    ('platform', 'status')
+)
+SOCIAL_LOOKUPS = Counter(
+    'nova_social_lookups_total', 'Per-platform profile lookups, by outcome',
+    ('platform', 'outcome')
+)
+RESULT_CACHE_LOOKUPS = Counter(
+    'nova_result_cache_lookups_total', 'Recommendation result cache lookups, by result (hit, miss, bypass)',
+    ('result',)
+)
+RESULT_CACHE_ENTRIES = Gauge(
+    'nova_result_cache_entries', 'Entries currently held in the recommendation result cache'
+)
+LLM_CACHE_LOOKUPS = Counter(
+    'nova_llm_cache_lookups_total', 'On-disk LLM response cache lookups, by result (hit, miss)',
+    ('result',)
+)
+FALLBACK_RESPONSES = Counter(
+    'nova_fallback_responses_total', 'Searches answered with placeholder fallback influencers, by reason',
+    ('reason',)
+)
+LLM_RESPONSE_RECOVERIES = Counter(
+    'nova_llm_response_recoveries_total', 'Finder responses that were not valid JSON, by outcome (salvaged, failed)',
+    ('outcome',)
+)
+
+
+@contextmanager
+def track_llm_call(path: str):
+    """Count and time one LLM call; also recorded as the llm_<path> timing stage"""
+    start = time.perf_counter()
+    outcome = 'error'
+    try:
+        with timing.span(f'llm_{path}'):
+            yield
+        outcome = 'success'
+    finally:
+        LLM_CALL_SECONDS.observe(time.perf_counter() - start, path=path)
+        LLM_CALLS.inc(path=path, outcome=outcome)
+
+
+def register_collector(collect: Callable[[], None]) -> None:
+    """Run collect() before every snapshot or scrape (e.g. to set a gauge from its source)"""
+    _collectors.append(collect)
+
+
+def _metrics() -> List[_Metric]:
+    for collect in _collectors:
+        try:
+            collect()
+        except Exception as e:
+            print(f"⚠️  Metrics collector failed: {e}")
+    with _registry_lock:
+        return list(_registry)
+
+
+def _snapshot(live: bool = True) -> Dict:
+    """This process's metrics as JSON-safe data (gauges only while the process is alive)"""
+    metrics = {}
+    for metric in _metrics():
+        if isinstance(metric, Gauge) and not live:
+            continue
+        metrics[metric.name] = [[list(key), value] for key, value in metric.values().items()]
+    return {"metrics": metrics, "stages": timing.histogram_snapshot()}
+
+
+def _snapshot_path(pid: int) -> str:
+    return os.path.join(METRICS_MULTIPROC_DIR, f"metrics_{pid}.json")
+
+
+def _read_snapshot(path: str) -> Optional[Dict]:
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        print(f"⚠️  Skipping unreadable metrics snapshot {path}: {e}")
+        return None
+
+
+def _write_json(path: str, data: Dict) -> None:
+    """Write atomically, so readers never see a partial file"""
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, 'w') as f:
+        json.dump(data, f)
+    os.replace(tmp, path)
+
+
+def write_snapshot() -> None:
+    """Save this process's metrics to METRICS_MULTIPROC_DIR (no-op when unset)"""
+    if not METRICS_MULTIPROC_DIR:
+        return
+    try:
+        _write_json(_snapshot_path(os.getpid()), _snapshot())
+    except OSError as e:
+        print(f"⚠️  Could not write metrics snapshot: {e}")
+
+
+def _merge_stages(total: Dict, stages: Dict) -> None:
+    """Add one process's timing histograms (timing.histogram_snapshot format) into total"""
+    for stage, histogram in stages.items():
+        merged = total.get(stage)
+        if merged is None:
+            total[stage] = dict(histogram, buckets_ms=dict(histogram['buckets_ms']))
+            continue
+        for bound, cumulative in histogram['buckets_ms'].items():
+            merged['buckets_ms'][bound] = merged['buckets_ms'].get(bound, 0) + cumulative
+        merged['count'] += histogram['count']
+        merged['sum_ms'] = round(merged['sum_ms'] + histogram['sum_ms'], 2)
+        merged['max_ms'] = max(merged['max_ms'], histogram['max_ms'])
+        merged['avg_ms'] = round(merged['sum_ms'] / merged['count'], 2) if merged['count'] else 0.0
+
+
+def _merge_snapshots(snapshots: List[Dict]) -> Dict:
+    """Sum snapshots: {"metrics": {name: {label key: value}}, "stages": {...}}"""
+    by_name = {metric.name: metric for metric in _metrics()}
+    metrics, stages = {}, {}
+    for snapshot in snapshots:
+        for name, entries in snapshot.get('metrics', {}).items():
+            metric = by_name.get(name)
+            if metric is None:
+                continue
+            values = metrics.setdefault(name, {})
+            for key, value in entries:
+                key = tuple(tuple(pair) for pair in key)
+                values[key] = metric.merge(values.get(key), value)
+        _merge_stages(stages, snapshot.get('stages', {}))
+    return {"metrics": metrics, "stages": stages}
+
+
+def _all_snapshots() -> List[Dict]:
+    write_snapshot()
+    paths = glob.glob(os.path.join(METRICS_MULTIPROC_DIR, 'metrics_*.json'))
+    return [snapshot for snapshot in map(_read_snapshot, sorted(paths)) if snapshot is not None]
+
+
+def mark_process_dead(pid: int) -> None:
+    """
+    Fold an exited worker's counters and histograms into the dead-workers file
+
+    Keeps cluster totals from going backwards while bounding the number of
+    files; its gauges are dropped. Call from the Gunicorn master (child_exit)
+    after the worker wrote its final snapshot.
+    """
+    if not METRICS_MULTIPROC_DIR:
+        return
+    import fcntl
+
+    path = _snapshot_path(pid)
+    with open(os.path.join(METRICS_MULTIPROC_DIR, 'metrics.lock'), 'w') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        snapshot = _read_snapshot(path)
+        if snapshot is None:
+            return
+        gauges = {metric.name for metric in _metrics() if isinstance(metric, Gauge)}
+        snapshot['metrics'] = {name: entries for name, entries in snapshot['metrics'].items() if name not in gauges}
+        dead_path = os.path.join(METRICS_MULTIPROC_DIR, DEAD_SNAPSHOT)
+        merged = _merge_snapshots([s for s in (_read_snapshot(dead_path), snapshot) if s is not None])
+        _write_json(dead_path, {
+            "metrics": {name: [[list(key), value] for key, value in values.items()]
+                        for name, values in merged['metrics'].items()},
+            "stages": merged['stages']
+        })
+        os.remove(path)
+
+
+def clear_multiproc_dir() -> None:
+    """Remove snapshots left by an earlier run (call once in the Gunicorn master on start)"""
+    if not METRICS_MULTIPROC_DIR:
+        return
+    os.makedirs(METRICS_MULTIPROC_DIR, exist_ok=True)
+    for path in glob.glob(os.path.join(METRICS_MULTIPROC_DIR, 'metrics_*.json')):
+        os.remove(path)
+
+
+class _SnapshotFlusher:
+    """Background thread writing this process's snapshot every METRICS_FLUSH_SECONDS"""
+
+    def __init__(self):
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self) -> None:
+        if not METRICS_MULTIPROC_DIR or (self._thread is not None and self._thread.is_alive()):
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name='metrics-flusher', daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop flushing and write the final snapshot"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(5)
+            self._thread = None
+        write_snapshot()
+
+    def _loop(self) -> None:
+        while not self._stop.wait(METRICS_FLUSH_SECONDS):
+            write_snapshot()
+
+
+def stage_histograms() -> Dict[str, Dict]:
+    """Per-stage latency histograms (milliseconds), summed over workers when METRICS_MULTIPROC_DIR is set"""
+    if not METRICS_MULTIPROC_DIR:
+        return timing.histogram_snapshot()
+    return dict(sorted(_merge_snapshots(_all_snapshots())['stages'].items()))
+
+
+def _render_stage_histograms(snapshot: Dict[str, Dict]) -> List[str]:
+    """Export the timing module's per-stage histograms (milliseconds) in seconds"""
+    if not snapshot:
+        return []
+    name = 'nova_stage_duration_seconds'
+    lines = [f"# HELP {name} Pipeline stage latency, by stage", f"# TYPE {name} histogram"]
+    for stage, histogram in sorted(snapshot.items()):
+        for bound, cumulative in histogram['buckets_ms'].items():
+            le = '+Inf' if bound == '+Inf' else _format_value(float(bound) / 1000)
+            lines.append(f"{name}_bucket{_format_labels((('stage', stage), ('le', le)))} {cumulative}")
+        labels = _format_labels((('stage', stage),))
+        lines.append(f"{name}_sum{labels} {_format_value(histogram['sum_ms'] / 1000)}")
+        lines.append(f"{name}_count{labels} {histogram['count']}")
+    return lines
+
+
+def render_latest() -> str:
+    """Every registered metric in the Prometheus text exposition format (summed over workers if configured)"""
+    lines = []
+    if METRICS_MULTIPROC_DIR:
+        merged = _merge_snapshots(_all_snapshots())
+        for metric in _metrics():
+            lines.extend(metric.render(merged['metrics'].get(metric.name, {})))
+        lines.extend(_render_stage_histograms(merged['stages']))
+    else:
+        for metric in _metrics():
+            lines.extend(metric.render())
+        lines.extend(_render_stage_histograms(timing.histogram_snapshot()))
+    return '\n'.join(lines) + '\n'
+
+
+# Started per worker process by start_background_work
+snapshot_flusher = _SnapshotFlusher()
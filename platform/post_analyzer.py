@@ -4,11 +4,11 @@ Post Analyzer
 Analyzes influencer posts using DINOv2 and calculates Interest Quotient
 """
 
-import os
 import requests
-from typing import Dict, List, Optional
-from data_manager import InfluencerDataManager
-from langchain_openai import ChatOpenAI
+from typing import Dict, List
+import numpy as np
+from batch_scoring import interest_quotients
+from client_registry import get_chat_llm, get_data_manager
 from langchain.schema import HumanMessage
 
 class PostAnalyzer:
@@ -17,19 +17,8 @@ class PostAnalyzer:
     DINOv2_API = "https://dinov2.metademolab.com/"  # DINOv2 API endpoint
     
     def __init__(self):
-        self.data_manager = InfluencerDataManager()
-        self.llm = None
-        
-        openai_api_key = os.getenv('OPENAI_API_KEY')
-        if openai_api_key and openai_api_key != 'your_openai_api_key_here':
-            try:
-                self.llm = ChatOpenAI(
-                    model_name="gpt-4o-mini",
-                    temperature=0.3,
-                    openai_api_key=openai_api_key
-                )
-            except:
-                pass
+        self.data_manager = get_data_manager()
+        self.llm = get_chat_llm(temperature=0.3)
     
     def calculate_interest_quotient(self, influencer_id: str) -> Dict:
         """
@@ -49,11 +38,11 @@ class PostAnalyzer:
         content_quality = posts_analysis.get('content_quality_score', 0)
         relevance = posts_analysis.get('relevance_score', 0)
         
-        interest_quotient = (engagement_rate * content_quality * relevance) / 10000
+        interest_quotient = float(interest_quotients(engagement_rate, content_quality, relevance))
         
         return {
             "influencer_id": influencer_id,
-            "interest_quotient": round(interest_quotient, 2),
+            "interest_quotient": interest_quotient,
             "components": {
                 "engagement_rate": engagement_rate,
                 "content_quality": content_quality,
@@ -186,8 +175,7 @@ Return as JSON."""
         """Calculate average engagement from posts"""
         if not posts_data:
             return 0
-        engagements = [p.get('engagement', 0) for p in posts_data]
-        return sum(engagements) / len(engagements) if engagements else 0
+        return float(np.mean([p.get('engagement', 0) for p in posts_data]))
     
     def _interpret_quotient(self, quotient: float) -> str:
         """Interpret Interest Quotient"""
@@ -4,17 +4,17 @@ Profile Analyzer with GPT
 Analyzes influencer profiles using ChatGPT, including hashtags and views
 """
 
-import os
 import json
 import re
 from typing import Dict, List, Optional
-from data_manager import InfluencerDataManager
-from social_media_apis import SocialMediaAPIs
+from client_registry import get_chat_llm, get_data_manager, get_llm_cache, get_openai_api_key, get_social_apis
+from follower_count import parse_follower_count
+from llm_cache import cached_completion, is_json_reply
 
 # Try to import OpenAI - use direct API if langchain fails
 try:
     from langchain_openai import ChatOpenAI
-    from langchain.schema import HumanMessage, SystemMessage
+    from langchain.schema import HumanMessage
     HAS_LANGCHAIN = True
 except:
     try:
@@ -28,21 +28,16 @@ class ProfileAnalyzer:
     """Analyze influencer profiles using GPT with hashtag and view analysis"""
     
     def __init__(self):
-        self.data_manager = InfluencerDataManager()
-        self.social_apis = SocialMediaAPIs()
+        self.data_manager = get_data_manager()
+        self.social_apis = get_social_apis()
         self.llm = None
         
-        openai_api_key = os.getenv('OPENAI_API_KEY')
-        self.openai_api_key = openai_api_key if openai_api_key and openai_api_key != 'your_openai_api_key_here' else None
+        self.openai_api_key = get_openai_api_key()
         
         if self.openai_api_key:
             try:
                 if HAS_LANGCHAIN:
-                    self.llm = ChatOpenAI(
-                        model_name="gpt-4o-mini",
-                        temperature=0.3,
-                        openai_api_key=self.openai_api_key
-                    )
+                    self.llm = get_chat_llm(temperature=0.3)
                 else:
                     import openai
                     openai.api_key = self.openai_api_key
@@ -212,15 +207,8 @@ class ProfileAnalyzer:
         # Fallback to estimated metrics
         followers = influencer.get('followers', '')
         
-        # Try to parse followers count
-        follower_count = 0
-        if followers:
-            try:
-                # Remove commas and parse
-                follower_str = str(followers).replace(',', '').replace('K', '000').replace('M', '000000')
-                follower_count = int(float(follower_str))
-            except:
-                pass
+        # Parsed at ingest; fall back to the display string for older records
+        follower_count = parse_follower_count(influencer.get('follower_count')) or parse_follower_count(followers)
         
         # Estimate views based on followers (typical engagement rates)
         estimated_views_per_post = 0
@@ -293,12 +281,16 @@ Return as JSON with these keys:
             if self.llm == "openai_direct":
                 # Use OpenAI API directly
                 import openai
-                response = openai.ChatCompletion.create(
-                    model="gpt-4o-mini",
-                    messages=[{"role": "user", "content": prompt}],
-                    temperature=0.3
+                response_text = cached_completion(
+                    get_llm_cache(), "gpt-4o-mini", 0.3, '', prompt,
+                    lambda: openai.ChatCompletion.create(
+                        model="gpt-4o-mini",
+                        messages=[{"role": "user", "content": prompt}],
+                        temperature=0.3
+                    ).choices[0].message.content,
+                    is_json_reply
                 )
-                return self._parse_gpt_response(response.choices[0].message.content)
+                return self._parse_gpt_response(response_text)
             else:
                 response = self.llm.invoke([HumanMessage(content=prompt)])
                 return self._parse_gpt_response(response.content)
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Query Planner
+Sits in front of ChatGPTInfluencerFinder.find_influencers: collects the
+influencers the local store (earlier ChatGPT results) and the offline catalog
+already hold for a filter set, and decides how many ChatGPT still has to find.
+Covered queries need no OpenAI call; partly covered ones ask only for the
+shortfall with the known names excluded.
+"""
+
+from typing import Dict, List
+from client_registry import get_influencer_catalog, get_influencer_store
+from filter_engine import MatchRecord, RecommendationFilterEngine
+from follower_count import parse_follower_count
+from influencer_store import HANDLE_FIELDS, normalize_name
+from metrics import Counter
+from range_index import tier_for_count
+from text_index import filter_keywords
+from timing import span
+
+QUERY_PLANS = Counter(
+    'nova_query_plans_total', 'Recommendation searches by plan (local: no LLM call, partial: LLM for the shortfall, llm: no local matches)',
+    ('plan',)
+)
+
+
+def _selected_platforms(filters: Dict) -> List[str]:
+    platforms = filters.get('platforms') or []
+    if isinstance(platforms, str):
+        platforms = [platforms]
+    selected = []
+    for platform in platforms:
+        name = str(platform).strip().lower()
+        name = 'twitter' if name in ('x', 'x (twitter)') or 'twitter' in name else name
+        if name in HANDLE_FIELDS:
+            selected.append(name)
+    return selected
+
+
+class QueryPlan:
+    """Local influencers for a request and what is left for ChatGPT"""
+
+    def __init__(self, local: List[Dict], limit: int, sources: Dict[str, int]):
+        self.local = local[:limit]
+        self.limit = limit
+        self.sources = sources
+
+    @property
+    def shortfall(self) -> int:
+        return max(0, self.limit - len(self.local))
+
+    @property
+    def exclude_names(self) -> List[str]:
+        return [inf.get('full_name') for inf in self.local if inf.get('full_name')]
+
+    @property
+    def kind(self) -> str:
+        if not self.shortfall:
+            return 'local'
+        return 'partial' if self.local else 'llm'
+
+
+class QueryPlanner:
+    """Build QueryPlans from the influencer store and the offline catalog"""
+
+    def __init__(self, candidate_factor: int = 3):
+        # Fetch this many times the limit from each source before predicate checks drop some
+        self.candidate_factor = candidate_factor
+
+    def _store_candidates(self, filters: Dict, count: int) -> List[Dict]:
+        try:
+            return get_influencer_store().search(
+                industry=filters.get('industry'),
+                location=filters.get('location'),
+                min_followers=parse_follower_count(filters.get('min_followers')),
+                max_followers=parse_follower_count(filters.get('max_followers')),
+                limit=count,
+                keywords=filter_keywords(filters)
+            )
+        except Exception as e:
+            print(f"⚠️  Query planner could not read the influencer store: {e}")
+            return []
+
+    def _catalog_candidates(self, filters: Dict, count: int) -> List[Dict]:
+        return get_influencer_catalog().query_filters(filters, limit=count)
+
+    def _matches(self, records: List[MatchRecord], platforms: List[str]) -> List[MatchRecord]:
+        """Records passing every filter predicate the request sets (and having a selected platform's handle)"""
+        kept = []
+        for record in records:
+            if not all(record.matches.values()):
+                continue
+            if platforms and not any(record.influencer.get(HANDLE_FIELDS[p]) for p in platforms):
+                continue
+            kept.append(record)
+        return kept
+
+    def plan(self, filters: Dict, limit: int) -> QueryPlan:
+        """Local influencers matching filters (store first, then catalog), up to limit"""
+        with span('plan'):
+            count = max(limit * self.candidate_factor, limit)
+            sources = {}
+            local, seen = [], set()
+            engine = RecommendationFilterEngine(filters)
+            platforms = _selected_platforms(filters)
+            for source, candidates in (
+                ('store', self._store_candidates(filters, count)),
+                ('catalog', self._catalog_candidates(filters, count)),
+            ):
+                fresh = []
+                for inf in candidates:
+                    name = normalize_name(inf.get('full_name'))
+                    if name and name not in seen and not inf.get('is_fallback'):
+                        seen.add(name)
+                        fresh.append(inf)
+                matched = self._matches(engine.compile(fresh), platforms)
+                sources[source] = len(matched)
+                for record in matched:
+                    inf = record.influencer
+                    inf['tier'] = tier_for_count(record.follower_count)
+                    inf['local_source'] = source
+                    local.append(inf)
+            plan = QueryPlan(local, limit, sources)
+        QUERY_PLANS.inc(plan=plan.kind)
+        print(f"🧭 Query plan: {plan.kind} - {len(plan.local)} local {sources}, {plan.shortfall} from ChatGPT")
+        return plan
+
+
+# Shared by every request in this process
+query_planner = QueryPlanner()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Range Index
+Sorted array-backed index over a numeric column (follower count, engagement
+rate) answering "value between X and Y" and tier facet counts with binary
+search (NumPy searchsorted) instead of scanning every record
+"""
+
+import threading
+from bisect import bisect_right
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
+import numpy as np
+
+# Follower tiers by lower bound, ascending (a count belongs to the last tier whose bound it reaches)
+FOLLOWER_TIERS: Tuple[Tuple[str, int], ...] = (
+    ('Emerging', 0),
+    ('Nano', 1000),
+    ('Micro', 10000),
+    ('Mid-tier', 100000),
+    ('Top/Macro', 1000000),
+)
+_TIER_NAMES = [name for name, _ in FOLLOWER_TIERS]
+_TIER_BOUNDS = [bound for _, bound in FOLLOWER_TIERS]
+
+
+def tier_for_count(follower_count: float) -> str:
+    """Tier name for a follower count"""
+    return _TIER_NAMES[max(0, bisect_right(_TIER_BOUNDS, follower_count) - 1)]
+
+
+class RangeIndex:
+    """
+    (value, doc_id) pairs kept sorted by value
+
+    Inserts are buffered and merged into the sorted arrays on the next query,
+    so bulk loads cost one sort and queries are O(log n) plus the result size.
+    """
+
+    def __init__(self, dtype=np.float64):
+        self.dtype = dtype
+        self._values = np.empty(0, dtype=dtype)
+        self._doc_ids = np.empty(0, dtype=object)
+        self._pending: List[Tuple[float, Hashable]] = []
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._values) + len(self._pending)
+
+    def add(self, doc_id: Hashable, value: Optional[float]) -> None:
+        """Index value for doc_id (None / NaN values are not indexed)"""
+        if value is None or value != value:
+            return
+        with self._lock:
+            self._pending.append((value, doc_id))
+
+    def add_many(self, pairs: Iterable[Tuple[Hashable, Optional[float]]]) -> None:
+        with self._lock:
+            self._pending.extend((v, d) for d, v in pairs if v is not None and v == v)
+
+    def _merged(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Sorted arrays with pending inserts merged in (caller holds the lock)"""
+        if self._pending:
+            values = np.concatenate([self._values, np.fromiter((v for v, _ in self._pending), dtype=self.dtype, count=len(self._pending))])
+            doc_ids = np.empty(len(values), dtype=object)
+            doc_ids[:len(self._doc_ids)] = self._doc_ids
+            doc_ids[len(self._doc_ids):] = [d for _, d in self._pending]
+            order = np.argsort(values, kind='stable')
+            self._values, self._doc_ids = values[order], doc_ids[order]
+            self._pending = []
+        return self._values, self._doc_ids
+
+    def _bounds(self, values: np.ndarray, low: Optional[float], high: Optional[float]) -> Tuple[int, int]:
+        start = 0 if low is None else int(np.searchsorted(values, low, side='left'))
+        end = len(values) if high is None else int(np.searchsorted(values, high, side='right'))
+        return start, max(start, end)
+
+    def range(self, low: Optional[float] = None, high: Optional[float] = None) -> List[Hashable]:
+        """Doc ids with low <= value <= high (either bound optional), in ascending value order"""
+        with self._lock:
+            values, doc_ids = self._merged()
+            start, end = self._bounds(values, low, high)
+            return list(doc_ids[start:end])
+
+    def count_range(self, low: Optional[float] = None, high: Optional[float] = None) -> int:
+        """Number of docs with low <= value <= high, without materializing them"""
+        with self._lock:
+            values, _ = self._merged()
+            start, end = self._bounds(values, low, high)
+            return end - start
+
+    def facet_counts(self, buckets: Iterable[Tuple[str, float]] = FOLLOWER_TIERS) -> Dict[str, int]:
+        """
+        Count per bucket, buckets given as (name, lower bound) ascending
+
+        One searchsorted call over all bucket bounds.
+        """
+        buckets = list(buckets)
+        with self._lock:
+            values, _ = self._merged()
+            bounds = np.array([bound for _, bound in buckets], dtype=self.dtype)
+            starts = np.searchsorted(values, bounds, side='left')
+            ends = np.append(starts[1:], len(values))
+            return {name: int(end - start) for (name, _), start, end in zip(buckets, starts, ends)}
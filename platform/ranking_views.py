@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""
+Ranking Views
+Precomputed top-N recommendation payloads for every industry x location pair
+offered in the filter options, stored in the influencer store as materialized
+views with freshness metadata. Requests filtering on just an industry and a
+location are answered from a fresh view; a background refresher recomputes
+stale views and warms them all before business hours.
+"""
+
+import copy
+import os
+import threading
+import time
+import traceback
+import uuid
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+from client_registry import get_data_manager, get_influencer_finder, get_influencer_store
+from metrics import Counter
+
+# The refresher only runs when enabled (each view costs a full ChatGPT search)
+RANKING_VIEWS_ENABLED = os.getenv('RANKING_VIEWS_ENABLED', 'false').lower() in ('1', 'true', 'yes')
+
+# Influencers kept per view; requests with a larger limit run the pipeline
+RANKING_VIEW_SIZE = int(os.getenv('RANKING_VIEW_SIZE', '20'))
+
+# Views older than this are recomputed on the next refresher pass, in seconds
+RANKING_VIEW_REFRESH_SECONDS = float(os.getenv('RANKING_VIEW_REFRESH_SECONDS', str(6 * 3600)))
+
+# Views older than this are not served at all, in seconds
+RANKING_VIEW_MAX_AGE_SECONDS = float(os.getenv('RANKING_VIEW_MAX_AGE_SECONDS', str(24 * 3600)))
+
+# Local hour (0-23) at which every view is recomputed ahead of business hours
+RANKING_VIEW_WARM_HOUR = int(os.getenv('RANKING_VIEW_WARM_HOUR', '7'))
+
+# How many of the filter options' industries/locations get views
+RANKING_VIEW_MAX_INDUSTRIES = int(os.getenv('RANKING_VIEW_MAX_INDUSTRIES', '8'))
+RANKING_VIEW_MAX_LOCATIONS = int(os.getenv('RANKING_VIEW_MAX_LOCATIONS', '8'))
+
+# How often the refresher wakes up to look for stale views, in seconds
+REFRESH_CHECK_SECONDS = 900
+
+LEASE_NAME = 'ranking_view_refresh'
+
+# The refresh lease lapses this long after its holder last renewed it (every
+# check and between views), so a recycled or crashed worker blocks the others
+# for at most this long, in seconds
+LEASE_TTL_SECONDS = 2 * REFRESH_CHECK_SECONDS
+
+RANKING_VIEW_LOOKUPS = Counter(
+    'nova_ranking_view_lookups_total', 'Recommendation lookups against precomputed ranking views, by result (hit, miss, stale)',
+    ('result',)
+)
+RANKING_VIEW_REFRESHES = Counter(
+    'nova_ranking_view_refreshes_total', 'Ranking view recomputations, by outcome',
+    ('outcome',)
+)
+
+
+def view_key(industry: str, location: str) -> str:
+    return f"{industry.strip().lower()}|{location.strip().lower()}"
+
+
+def view_pair(filters: Optional[Dict]) -> Optional[Tuple[str, str]]:
+    """(industry, location) if filters set exactly those two and nothing else, else None"""
+    active = {
+        key: value for key, value in (filters or {}).items()
+        if value not in (None, '', [], {}) and not (isinstance(value, str) and not value.strip())
+    }
+    if set(active) != {'industry', 'location'}:
+        return None
+    industry, location = active['industry'], active['location']
+    if not isinstance(industry, str) or not isinstance(location, str):
+        return None
+    return industry.strip(), location.strip()
+
+
+def next_warm_time(now: datetime, hour: int = RANKING_VIEW_WARM_HOUR) -> datetime:
+    """Next local datetime at hour:00 after now"""
+    warm = now.replace(hour=hour, minute=0, second=0, microsecond=0)
+    return warm if warm > now else warm + timedelta(days=1)
+
+
+class RankingViews:
+    """Read, compute and refresh ranking views"""
+
+    def __init__(self, size: int = RANKING_VIEW_SIZE, refresh_seconds: float = RANKING_VIEW_REFRESH_SECONDS,
+                 max_age: float = RANKING_VIEW_MAX_AGE_SECONDS):
+        self.size = size
+        self.refresh_seconds = refresh_seconds
+        self.max_age = max_age
+
+    def lookup(self, filters: Dict, limit: int) -> Optional[Dict]:
+        """
+        Recommendations payload from a fresh view, or None
+
+        Only industry + location requests with limit <= view size qualify.
+        The payload is cut to limit and carries a 'view' freshness block.
+        """
+        pair = view_pair(filters)
+        if pair is None or limit > self.size:
+            return None
+        key = view_key(*pair)
+        try:
+            view = get_influencer_store().load_view(key)
+        except Exception as e:
+            print(f"⚠️  Ranking view lookup failed: {e}")
+            view = None
+        if view is None:
+            RANKING_VIEW_LOOKUPS.inc(result='miss')
+            return None
+        age = time.time() - view['computed_at']
+        if age > self.max_age:
+            RANKING_VIEW_LOOKUPS.inc(result='stale')
+            return None
+        RANKING_VIEW_LOOKUPS.inc(result='hit')
+
+        payload = view['payload']
+        recommendations = payload['recommendations'][:limit]
+        tiered = get_influencer_finder().categorize_influencers_by_tier(recommendations)
+        payload.update({
+            "count": len(recommendations),
+            "recommendations": recommendations,
+            "tiered_influencers": tiered,
+            "tier_counts": {tier: len(inf_list) for tier, inf_list in tiered.items()},
+            "view": {
+                "key": key,
+                "computed_at": view['computed_at'],
+                "age_seconds": round(age, 1),
+                "compute_seconds": round(view['compute_seconds'], 2),
+            },
+        })
+        print(f"📌 Served recommendations from ranking view '{key}' ({age / 60:.0f} min old)")
+        return payload
+
+    def pairs(self) -> List[Tuple[str, str]]:
+        """Industry x location pairs to keep views for, most requested first"""
+        options = get_data_manager().get_filter_options()
+        industries = options.get('industries', [])[:RANKING_VIEW_MAX_INDUSTRIES]
+        locations = options.get('locations', [])[:RANKING_VIEW_MAX_LOCATIONS]
+        hits = {view['view_key']: view['hits'] for view in get_influencer_store().list_views()}
+        pairs = [(industry, location) for industry in industries for location in locations]
+        return sorted(pairs, key=lambda pair: -hits.get(view_key(*pair), 0))
+
+    def compute(self, industry: str, location: str) -> bool:
+        """Run the recommendation pipeline for one pair (local results first, ChatGPT for the rest) and store the view"""
+        from recommendation_pipeline import RecommendationPipeline
+
+        filters = {'industry': industry, 'location': location}
+        start = time.time()
+        try:
+            pipeline = RecommendationPipeline(
+                get_influencer_finder(), filters, self.size, bypass_cache=True, local_first=True
+            )
+            payload, status = pipeline.run()
+        except Exception:
+            traceback.print_exc()
+            RANKING_VIEW_REFRESHES.inc(outcome='error')
+            return False
+        recommendations = payload.get('recommendations') or []
+        if status != 200 or not payload.get('success') or all(inf.get('is_fallback') for inf in recommendations):
+            # Keep the previous view rather than replacing it with an error or placeholders
+            RANKING_VIEW_REFRESHES.inc(outcome='empty')
+            return False
+        payload = copy.deepcopy(payload)
+        payload['source'] = "Precomputed ranking view"
+        get_influencer_store().save_view(view_key(industry, location), filters, payload, time.time() - start)
+        RANKING_VIEW_REFRESHES.inc(outcome='ok')
+        return True
+
+    def refresh(self, force: bool = False, keep_going: Optional[Callable[[], bool]] = None) -> Dict:
+        """
+        Recompute views older than the refresh interval (every view when force)
+
+        keep_going is checked before each recomputation; the pass stops early
+        (summary["aborted"]) once it returns False.
+        """
+        computed_at = {view['view_key']: view['computed_at'] for view in get_influencer_store().list_views()}
+        cutoff = time.time() - self.refresh_seconds
+        summary = {"refreshed": 0, "failed": 0, "fresh": 0}
+        for industry, location in self.pairs():
+            if not force and computed_at.get(view_key(industry, location), 0) > cutoff:
+                summary["fresh"] += 1
+                continue
+            if keep_going is not None and not keep_going():
+                summary["aborted"] = True
+                break
+            if self.compute(industry, location):
+                summary["refreshed"] += 1
+            else:
+                summary["failed"] += 1
+        print(f"📌 Ranking views refresh: {summary}")
+        return summary
+
+    def stats(self) -> Dict:
+        now = time.time()
+        views = get_influencer_store().list_views()
+        for view in views:
+            view['age_seconds'] = round(now - view['computed_at'], 1)
+            view['fresh'] = view['age_seconds'] <= self.refresh_seconds
+        return {"size": self.size, "refresh_seconds": self.refresh_seconds, "views": views}
+
+
+class RankingViewRefresher:
+    """
+    Background thread keeping ranking views fresh
+
+    Wakes every REFRESH_CHECK_SECONDS to recompute stale views, and
+    recomputes every view at RANKING_VIEW_WARM_HOUR. A lease in the store
+    makes sure only one process sharing the database refreshes at a time;
+    it is renewed between views and released on stop(), so a replacement
+    worker can take over straight away.
+    """
+
+    def __init__(self, views: Optional[RankingViews] = None):
+        self.views = views or ranking_views
+        self._owner = None
+        self._owner_pid = None
+        self._stop = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+        # Held for the length of a pass, so a scheduled and a triggered pass never overlap
+        self._pass_lock = threading.Lock()
+
+    @property
+    def owner(self) -> str:
+        """
+        Lease owner id of this process
+
+        Derived on first use in each process: the refresher is built at import,
+        which a preloaded Gunicorn master does once before forking, so an id
+        fixed in __init__ would be shared by every worker and let all of them
+        hold the lease at once.
+        """
+        pid = os.getpid()
+        with self._lock:
+            if self._owner_pid != pid:
+                self._owner = f"{pid}-{uuid.uuid4().hex[:8]}"
+                self._owner_pid = pid
+            return self._owner
+
+    def start(self) -> None:
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, name='ranking-view-refresher', daemon=True)
+            self._thread.start()
+        print(f"📌 Ranking view refresher started (warm-up at {RANKING_VIEW_WARM_HOUR:02d}:00)")
+
+    def trigger(self) -> Dict:
+        """
+        Recompute every view now in a one-off background pass
+
+        The scheduled loop is neither started nor changed. Nothing runs if a
+        pass is already running in this process or another process holds the
+        refresh lease. Returns {"started", "lease_acquired"} plus a "reason"
+        when nothing was started.
+        """
+        if not self._pass_lock.acquire(blocking=False):
+            return {"started": False, "lease_acquired": True, "reason": "A ranking view refresh is already running"}
+        try:
+            acquired = self._renew_lease()
+        except Exception:
+            self._pass_lock.release()
+            raise
+        if not acquired:
+            self._pass_lock.release()
+            return {"started": False, "lease_acquired": False,
+                    "reason": "Another worker holds the ranking view refresh lease"}
+        threading.Thread(target=self._triggered_pass, name='ranking-view-refresh-now', daemon=True).start()
+        return {"started": True, "lease_acquired": True}
+
+    def _triggered_pass(self) -> None:
+        try:
+            self.views.refresh(force=True, keep_going=self._renew_lease)
+        except Exception:
+            traceback.print_exc()
+        finally:
+            self._pass_lock.release()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop.set()
+        with self._lock:
+            thread = self._thread
+            self._thread = None
+        if thread is not None:
+            thread.join(timeout)
+        try:
+            get_influencer_store().release_lease(LEASE_NAME, self.owner)
+        except Exception as e:
+            print(f"⚠️  Could not release the ranking view lease: {e}")
+
+    def _renew_lease(self) -> bool:
+        """Take or extend the refresh lease; False if stopping or another process holds it"""
+        if self._stop.is_set():
+            return False
+        return get_influencer_store().acquire_lease(LEASE_NAME, self.owner, LEASE_TTL_SECONDS)
+
+    def _run_pass(self, force: bool) -> None:
+        if not self._pass_lock.acquire(blocking=False):
+            return  # A triggered pass is already doing the work
+        try:
+            if not self._renew_lease():
+                return
+            self.views.refresh(force=force, keep_going=self._renew_lease)
+        except Exception:
+            traceback.print_exc()
+        finally:
+            self._pass_lock.release()
+
+    def _loop(self) -> None:
+        warm_at = next_warm_time(datetime.now())
+        force = False
+        while not self._stop.is_set():
+            self._run_pass(force)
+            wait = min(REFRESH_CHECK_SECONDS, max(0.0, (warm_at - datetime.now()).total_seconds()))
+            if self._stop.wait(wait):
+                break
+            force = False
+            if datetime.now() >= warm_at:
+                force = True
+                warm_at = next_warm_time(datetime.now())
+
+
+# Shared by every request in this process
+ranking_views = RankingViews()
+ranking_view_refresher = RankingViewRefresher(ranking_views)
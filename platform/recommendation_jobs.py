@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Recommendation Jobs
+Runs recommendation searches in a background worker pool so clients can submit
+a search, poll its progress by stage, and fetch the result when it is ready.
+Job state is written through to the shared SQLite store, so a poll that lands
+on a different Gunicorn worker than the submit still finds the job.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+import traceback
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional
+from client_registry import get_influencer_store
+from recommendation_pipeline import PipelineError, RecommendationPipeline
+
+# Jobs running at once (each holds one worker thread for its whole lifetime)
+JOB_WORKERS = int(os.getenv('JOB_WORKERS', '4'))
+
+# Per-stage concurrency caps, shared by all jobs in this process
+JOB_STAGE_LIMITS = {
+    'find': int(os.getenv('JOB_FIND_CONCURRENCY', '4')),
+    'enrich': int(os.getenv('JOB_ENRICH_CONCURRENCY', '2')),
+}
+
+# Finished jobs are kept this long for clients to fetch, in seconds
+JOB_RESULT_TTL = float(os.getenv('JOB_RESULT_TTL_SECONDS', '3600'))
+
+STAGES = ('queued', 'find', 'enrich', 'finalize', 'done')
+
+
+class RecommendationJob:
+    """State of one submitted search"""
+
+    def __init__(self, pipeline: Optional[RecommendationPipeline]):
+        self.id = uuid.uuid4().hex
+        self.pipeline = pipeline
+        self.status = 'queued'  # queued | running | succeeded | failed
+        self.stage = 'queued'
+        self.progress = {}
+        self.stage_started = {'queued': time.time()}
+        self.created_at = time.time()
+        self.finished_at = None
+        self.result = None
+        self.http_status = None
+
+    def enter_stage(self, stage: str) -> None:
+        self.stage = stage
+        self.stage_started[stage] = time.time()
+
+    def to_dict(self) -> Dict:
+        """Status view (without the result payload)"""
+        now = self.finished_at or time.time()
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "stage": self.stage,
+            "stage_index": STAGES.index(self.stage),
+            "stage_count": len(STAGES),
+            "progress": self.progress,
+            "stage_started_at": self.stage_started,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+            "elapsed_seconds": round(now - self.created_at, 2)
+        }
+
+    def to_state(self) -> Dict:
+        """Everything a poll or result fetch needs, as stored in the shared store"""
+        return {
+            "id": self.id,
+            "status": self.status,
+            "stage": self.stage,
+            "progress": self.progress,
+            "stage_started": self.stage_started,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+            "result": self.result,
+            "http_status": self.http_status,
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict) -> 'RecommendationJob':
+        """Read-only snapshot of a job run by another worker process"""
+        job = cls(None)
+        for key, value in state.items():
+            setattr(job, key, value)
+        return job
+
+
+class RecommendationJobManager:
+    """Bounded worker pool running RecommendationPipeline stages for submitted jobs"""
+
+    def __init__(self, workers: int = JOB_WORKERS, stage_limits: Optional[Dict[str, int]] = None, store=None):
+        self.workers = workers
+        self._store = store
+        self.stage_limits = stage_limits or JOB_STAGE_LIMITS
+        self._stage_semaphores = {
+            stage: threading.BoundedSemaphore(limit) for stage, limit in self.stage_limits.items()
+        }
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self._executor = None
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        # Created lazily so forking servers don't inherit an idle pool
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='recommendation-job')
+            return self._executor
+
+    def submit(self, pipeline: RecommendationPipeline) -> RecommendationJob:
+        """Queue a pipeline run and return its job immediately"""
+        self._purge_expired()
+        job = RecommendationJob(pipeline)
+        with self._lock:
+            self._jobs[job.id] = job
+        self._save(job)
+        self._get_executor().submit(self._run, job)
+        print(f"📥 Queued recommendation job {job.id}")
+        return job
+
+    def get(self, job_id: str) -> Optional[RecommendationJob]:
+        """The job if this process runs it, else its last saved state from the shared store"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is not None:
+            return job
+        try:
+            state = self.store.load_job(job_id)
+        except sqlite3.Error as e:
+            print(f"⚠️  Could not load recommendation job {job_id}: {e}")
+            return None
+        if state is None or (state.get('finished_at') or time.time()) < time.time() - JOB_RESULT_TTL:
+            return None
+        return RecommendationJob.from_state(state)
+
+    @property
+    def store(self):
+        return self._store or get_influencer_store()
+
+    def _save(self, job: RecommendationJob) -> None:
+        try:
+            self.store.save_job(job.id, job.to_state())
+        except sqlite3.Error as e:
+            print(f"⚠️  Could not save recommendation job {job.id}: {e}")
+
+    def stats(self) -> Dict:
+        with self._lock:
+            counts = {}
+            for job in self._jobs.values():
+                counts[job.status] = counts.get(job.status, 0) + 1
+        return {"workers": self.workers, "stage_limits": self.stage_limits, "jobs": counts}
+
+    def _purge_expired(self) -> None:
+        cutoff = time.time() - JOB_RESULT_TTL
+        with self._lock:
+            expired = [job_id for job_id, job in self._jobs.items() if job.finished_at and job.finished_at < cutoff]
+            for job_id in expired:
+                del self._jobs[job_id]
+        try:
+            self.store.delete_jobs_before(cutoff)
+        except sqlite3.Error as e:
+            print(f"⚠️  Could not purge recommendation jobs: {e}")
+
+    def _run(self, job: RecommendationJob) -> None:
+        pipeline = job.pipeline
+        job.status = 'running'
+        try:
+            job.enter_stage('find')
+            self._save(job)
+            with self._stage_semaphores['find']:
+                influencers = pipeline.find()
+            job.progress = {"found": len(influencers), "cache": pipeline.cache_status}
+
+            job.enter_stage('enrich')
+            self._save(job)
+            with self._stage_semaphores['enrich']:
+                enriched = 0
+                job.progress["enriched"] = 0
+                for _ in pipeline.stream_enrichment(influencers):
+                    enriched += 1
+                    job.progress["enriched"] = enriched
+                    self._save(job)
+
+            job.enter_stage('finalize')
+            self._save(job)
+            job.result = pipeline.finalize(influencers)
+            job.http_status = 200
+            job.progress["count"] = job.result.get('count', 0)
+            job.status = 'succeeded'
+        except PipelineError as e:
+            job.result = e.payload
+            job.http_status = e.status
+            job.status = 'failed'
+        except Exception as e:
+            traceback.print_exc()
+            job.result = {"success": False, "error": str(e)}
+            job.http_status = 500
+            job.status = 'failed'
+        finally:
+            job.enter_stage('done')
+            job.finished_at = time.time()
+            self._save(job)
+            print(f"📤 Recommendation job {job.id} {job.status} in {job.finished_at - job.created_at:.2f}s")
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop accepting jobs and optionally wait for running ones"""
+        with self._lock:
+            executor = self._executor
+            self._executor = None
+        if executor:
+            executor.shutdown(wait=wait)
+
+
+# Shared by every request in this process
+job_manager = RecommendationJobManager()
@@ -0,0 +1,421 @@
+#!/usr/bin/env python3
+"""
+Recommendation Pipeline
+The find -> enrich -> filter/score -> tier stages behind /api/recommendations,
+shared by the blocking and streaming endpoints
+"""
+
+import os
+import time
+import traceback
+from typing import Dict, Iterator, List, Optional, Tuple
+from assistant_runs import ASSISTANT_RUN_TIMEOUT_SECONDS
+from enrichment import ENRICHMENT_DEADLINE, EnrichmentStage, apply_real_profile_data
+from filter_engine import RecommendationFilterEngine
+from metrics import FALLBACK_RESPONSES
+from query_planner import query_planner
+from result_cache import cached_find_influencers, cached_stream_influencers, canonical_filters_key
+from influencer_store import normalize_name
+from singleflight import SingleFlight, SingleFlightTimeout
+from timing import span
+
+# Answer from the local store and offline catalog first and ask ChatGPT only for the
+# shortfall (RECOMMENDATIONS_CATALOG_FIRST is the older name of the setting)
+LOCAL_FIRST = os.getenv(
+    'RECOMMENDATIONS_LOCAL_FIRST', os.getenv('RECOMMENDATIONS_CATALOG_FIRST', 'false')
+).lower() in ('1', 'true', 'yes')
+
+# Longest one recommendations run should take: an Assistant run that times out, the
+# 45s chat-completions fallback and the enrichment deadline. Requests coalesced onto
+# an identical run wait this long for it before failing with a 504.
+RECOMMENDATION_DEADLINE = float(os.getenv(
+    'RECOMMENDATION_DEADLINE_SECONDS', str(ASSISTANT_RUN_TIMEOUT_SECONDS + 45 + ENRICHMENT_DEADLINE)
+))
+
+NO_RESULTS_SUGGESTION = "Try removing filters like product type, content type, or target audience to see more results."
+
+# Influencer fields refreshed by enrichment (sent in streaming 'enrichment' events)
+ENRICHED_FIELDS = (
+    'real_instagram', 'real_twitter', 'real_linkedin', 'follower_count', 'followers',
+    'avg_likes_per_post', 'engagement_rate', 'estimated_reach',
+    'real_total_views', 'real_average_views', 'real_hashtags'
+)
+
+
+def finder_unavailable_payload(finder) -> Optional[Dict]:
+    """Return an error payload if the finder has no LLM configured, else None"""
+    if finder.llm:
+        return None
+
+    openai_key = os.getenv('OPENAI_API_KEY')
+    error_msg = "ChatGPT API is not configured. "
+    if not openai_key:
+        error_msg += "OPENAI_API_KEY environment variable is not set."
+    elif openai_key == 'your_openai_api_key_here':
+        error_msg += "OPENAI_API_KEY is set to placeholder value. Please set a real API key."
+    elif len(openai_key) < 20:
+        error_msg += f"OPENAI_API_KEY appears invalid (too short: {len(openai_key)} chars)."
+    else:
+        error_msg += "ChatGPT initialization failed. Check API key validity."
+
+    print(f"❌ {error_msg}")
+    return {
+        "success": False,
+        "error": error_msg,
+        "diagnostics": {
+            "openai_key_exists": bool(openai_key),
+            "openai_key_length": len(openai_key) if openai_key else 0,
+            "finder_llm_available": False
+        },
+        "count": 0,
+        "recommendations": []
+    }
+
+# Coalesces concurrent identical /api/recommendations runs in this process
+recommendation_flights = SingleFlight('recommendations')
+
+
+class PipelineError(Exception):
+    """A stage failed; carries the JSON payload and HTTP status to return"""
+
+    def __init__(self, payload: Dict, status: int):
+        super().__init__(payload.get('error', 'Recommendation pipeline failed'))
+        self.payload = payload
+        self.status = status
+
+
+class RecommendationPipeline:
+    """Run one recommendations request through every stage"""
+
+    def __init__(self, finder, filters: Dict, limit: int, bypass_cache: bool = False,
+                 local_first: bool = LOCAL_FIRST):
+        self.finder = finder
+        self.filters = filters or {}
+        self.limit = limit
+        self.bypass_cache = bypass_cache
+        self.local_first = local_first
+        self.cache_status = None
+        self.coalesced = False
+
+    def find(self) -> List[Dict]:
+        """Stage 1: find influencers locally (if enabled), then with ChatGPT (through the result cache)"""
+        start_time = time.time()
+        try:
+            with span('find'):
+                plan = query_planner.plan(self.filters, self.limit) if self.local_first else None
+                if plan is None:
+                    influencers, self.cache_status = cached_find_influencers(
+                        self.finder, self.filters, self.limit, bypass=self.bypass_cache
+                    )
+                elif not plan.shortfall:
+                    influencers, self.cache_status = plan.local, 'LOCAL'
+                else:
+                    found, self.cache_status = cached_find_influencers(
+                        self.finder, self.filters, plan.shortfall, bypass=self.bypass_cache,
+                        exclude_names=plan.exclude_names
+                    )
+                    influencers = self._fill_gaps(plan.local, found)
+        except Exception as e:
+            print(f"⚠️  Error finding influencers: {e}")
+            traceback.print_exc()
+            raise PipelineError({
+                "success": False,
+                "error": f"Failed to find influencers: {str(e)}. Please try again with different filters.",
+                "count": 0,
+                "recommendations": []
+            }, 500)
+
+        elapsed = time.time() - start_time
+        print(f"✅ Found {len(influencers)} influencers using ChatGPT API (took {elapsed:.2f}s, cache {self.cache_status})")
+
+        if not influencers:
+            self._no_results()
+        return influencers
+
+    def _no_results(self) -> None:
+        """Raise the 'no influencers found' PipelineError"""
+        print(f"⚠️  ChatGPT returned no influencers. This could mean:")
+        print(f"   1. ChatGPT API is not configured (check OPENAI_API_KEY)")
+        print(f"   2. Filters are too restrictive for ChatGPT to find matches")
+        print(f"   3. ChatGPT API call failed silently")
+        raise PipelineError({
+            "success": False,
+            "error": "No influencers found. ChatGPT API returned no results. Try removing some filters or adjusting your requirements.",
+            "count": 0,
+            "recommendations": [],
+            "suggestion": NO_RESULTS_SUGGESTION,
+            "diagnostics": {
+                "filters_applied": self.filters,
+                "limit_requested": self.limit,
+                "finder_llm_available": self.finder.llm is not None
+            }
+        }, 200)
+
+    def find_stream(self) -> Iterator[Dict]:
+        """
+        Stage 1, streaming: yield influencers as they become available
+
+        Local results first, then the result cache or ChatGPT's streamed
+        answer, so the first influencer is out before the model finishes.
+        """
+        start_time = time.time()
+        count = 0
+        try:
+            with span('find'):
+                plan = query_planner.plan(self.filters, self.limit) if self.local_first else None
+                limit, exclude_names = self.limit, None
+                if plan is not None:
+                    for inf in plan.local:
+                        count += 1
+                        yield inf
+                    limit, exclude_names = plan.shortfall, plan.exclude_names
+                if plan is not None and not limit:
+                    self.cache_status = 'LOCAL'
+                else:
+                    found, self.cache_status = cached_stream_influencers(
+                        self.finder, self.filters, limit, bypass=self.bypass_cache, exclude_names=exclude_names
+                    )
+                    for inf in found:
+                        if count and inf.get('is_fallback'):
+                            continue
+                        count += 1
+                        yield inf
+        except Exception as e:
+            print(f"⚠️  Error finding influencers: {e}")
+            traceback.print_exc()
+            raise PipelineError({
+                "success": False,
+                "error": f"Failed to find influencers: {str(e)}. Please try again with different filters.",
+                "count": 0,
+                "recommendations": []
+            }, 500)
+
+        print(f"✅ Streamed {count} influencers (took {time.time() - start_time:.2f}s, cache {self.cache_status})")
+        if not count:
+            self._no_results()
+
+    def _fill_gaps(self, local: List[Dict], found: List[Dict]) -> List[Dict]:
+        """Append ChatGPT results not already in the local results"""
+        if not local:
+            return found
+        seen = {normalize_name(inf.get('full_name')) for inf in local}
+        extra = [
+            inf for inf in found
+            if not inf.get('is_fallback') and normalize_name(inf.get('full_name')) not in seen
+        ]
+        return local + extra
+
+    def enrich(self, influencers: List[Dict]) -> None:
+        """Stage 2: fetch real profile data from social media APIs"""
+        try:
+            with span('enrich'):
+                EnrichmentStage().enrich(influencers)
+        except Exception as e:
+            # If social media APIs are not available, continue without real profile data
+            print(f"⚠️  Social media APIs not available: {e}")
+            print("📝 Continuing with ChatGPT-generated influencer data")
+
+    def stream_enrichment(self, influencers: List[Dict]) -> Iterator[Tuple[int, Dict]]:
+        """Stage 2, streaming: yield (index, influencer) as each one's real data is applied"""
+        try:
+            with span('enrich'):
+                for idx, api_data in EnrichmentStage().stream(influencers):
+                    if apply_real_profile_data(influencers[idx], api_data):
+                        yield idx, influencers[idx]
+        except Exception as e:
+            print(f"⚠️  Social media APIs not available: {e}")
+            print("📝 Continuing with ChatGPT-generated influencer data")
+
+    def _apply_selected_platforms(self, influencers: List[Dict]) -> None:
+        """Store selected platforms and drop handles for platforms that weren't selected"""
+        selected_platforms = self.filters.get('platforms', [])
+
+        if not selected_platforms:
+            # If no platforms selected, keep all handles
+            for inf in influencers:
+                inf['selected_platforms'] = []
+            return
+
+        platforms_lower = [p.lower() for p in selected_platforms] if isinstance(selected_platforms, list) else [selected_platforms.lower()]
+        has_instagram = any('instagram' in p for p in platforms_lower)
+        has_twitter = any('twitter' in p or 'x' in p for p in platforms_lower)
+        has_linkedin = any('linkedin' in p for p in platforms_lower)
+        has_youtube = any('youtube' in p for p in platforms_lower)
+        has_facebook = any('facebook' in p for p in platforms_lower)
+
+        for inf in influencers:
+            inf['selected_platforms'] = selected_platforms
+            if not has_instagram:
+                inf['instagram_handle'] = None
+            if not has_twitter:
+                inf['twitter_handle'] = None
+            if not has_linkedin:
+                inf['linkedin_handle'] = None
+            if not has_youtube:
+                inf['youtube_handle'] = None
+            if not has_facebook:
+                inf['facebook_handle'] = None
+
+    def _recover_empty(self, original_count: int) -> List[Dict]:
+        """Fallback influencers when filtering removed everything"""
+        print(f"❌ No influencers remaining after filtering. Original count: {original_count}")
+        print(f"🔄 Attempting to get fallback influencers...")
+        filters = self.filters
+        try:
+            # Create minimal filters (only industry and location if specified)
+            minimal_filters = {}
+            if filters.get('industry'):
+                minimal_filters['industry'] = filters.get('industry')
+            if filters.get('location'):
+                minimal_filters['location'] = filters.get('location')
+
+            fallback_influencers = self.finder._get_fallback_influencers(minimal_filters, self.limit, reason='filtered_empty')
+
+            if fallback_influencers:
+                print(f"✅ Got {len(fallback_influencers)} fallback influencers")
+                # Mark them as fallback so we know they're not perfect matches
+                for inf in fallback_influencers:
+                    inf['is_fallback'] = True
+                    inf['match_score'] = 60  # Lower score for fallback
+                return fallback_influencers
+
+            # Last resort: create generic influencers
+            print(f"⚠️  Creating generic influencers as last resort")
+            FALLBACK_RESPONSES.inc(reason='generic')
+            influencers = []
+            for i in range(1, min(self.limit + 1, 6)):
+                industry = filters.get('industry', 'General')
+                location = filters.get('location', 'India')
+                influencers.append({
+                    'id': i,
+                    'full_name': f'{industry} Influencer {i}',
+                    'email': f'influencer{i}@example.com',
+                    'industry': industry if industry else 'General',
+                    'category': industry if industry else 'General',
+                    'job_title': f'{industry} Content Creator' if industry else 'Content Creator',
+                    'domain_niche': f'{industry} Content Creator' if industry else 'Content Creator',
+                    'company_name': f'{industry} Brand',
+                    'location': location,
+                    'contact_type': 'Email',
+                    'contact_link': f'https://example.com/influencer{i}',
+                    'use_case': f'{industry} content collaboration' if industry else 'Content collaboration',
+                    'source_url': f'https://example.com/influencer{i}',
+                    'bio': f'Content creator specializing in {industry}' if industry else 'Content creator',
+                    'platform': 'Multiple',
+                    'followers': '50K',
+                    'follower_count': 50000,
+                    'match_score': 50,
+                    'is_fallback': True,
+                    'tier': 'Mid-tier'
+                })
+            print(f"✅ Created {len(influencers)} generic influencers")
+            return influencers
+        except Exception as e:
+            print(f"⚠️  Error getting fallback influencers: {e}")
+            raise PipelineError({
+                "success": False,
+                "error": "No influencers found matching your criteria. Try removing some filters or adjusting your requirements.",
+                "count": 0,
+                "recommendations": [],
+                "suggestion": NO_RESULTS_SUGGESTION
+            }, 200)  # Return 200 so frontend can show the message
+
+    def finalize(self, influencers: List[Dict]) -> Dict:
+        """Stages 3-4: platform handles, filter/score, fallback recovery, ranking and tiering"""
+        self._apply_selected_platforms(influencers)
+
+        # Filter and score in one pass (lenient fallbacks are declared in filter_engine)
+        original_count = len(influencers)
+        with span('filter'):
+            influencers = RecommendationFilterEngine(self.filters).run(influencers)
+
+        if not influencers:
+            influencers = self._recover_empty(original_count)
+
+        with span('tier'):
+            # Sort by match score (highest first) - top matches at the top
+            influencers.sort(key=lambda x: x.get('match_score', 0), reverse=True)
+
+            # Categorize by tier
+            tiered_influencers = self.finder.categorize_influencers_by_tier(influencers)
+            tier_counts = {tier: len(inf_list) for tier, inf_list in tiered_influencers.items()}
+
+        print(f"✅ Final result: {len(influencers)} influencers after all filtering")
+
+        return {
+            "success": True,
+            "count": len(influencers),
+            "recommendations": influencers,
+            "tiered_influencers": tiered_influencers,
+            "tier_counts": tier_counts,
+            "source": "ChatGPT API (no database/CSV)"
+        }
+
+    def run(self) -> Tuple[Dict, int]:
+        """Run every stage; returns (payload, http_status)"""
+        try:
+            influencers = self.find()
+            self.enrich(influencers)
+            return self.finalize(influencers), 200
+        except PipelineError as e:
+            return e.payload, e.status
+
+    def run_coalesced(self) -> Tuple[Dict, int]:
+        """
+        run(), shared with concurrent requests for the same canonical filters
+
+        Identical requests arriving while one is in flight wait for it instead
+        of starting their own LLM call and social API fan-out, for at most
+        RECOMMENDATION_DEADLINE seconds; past that they get a 504 payload.
+        """
+        key = canonical_filters_key(self.filters, self.limit)
+        if self.bypass_cache:
+            key += '|bypass'
+
+        def compute():
+            payload, status = self.run()
+            return payload, status, self.cache_status
+
+        try:
+            (payload, status, cache_status), self.coalesced = recommendation_flights.do(
+                key, compute, timeout=RECOMMENDATION_DEADLINE
+            )
+        except SingleFlightTimeout as e:
+            print(f"⏱️  {e}")
+            self.coalesced = True
+            return {
+                "success": False,
+                "error": "An identical recommendations request is still running. Please try again shortly.",
+                "count": 0,
+                "recommendations": []
+            }, 504
+        self.cache_status = cache_status
+        return payload, status
+
+    def stream(self) -> Iterator[Dict]:
+        """
+        Run every stage, yielding events as results become available:
+
+        - {"event": "influencer", "index": i, "influencer": {...}} for each influencer as ChatGPT writes it
+        - {"event": "enrichment", "index": i, "updates": {...}} as real profile data lands
+        - {"event": "complete", ...final payload incl. tier_counts...} at the end
+        - {"event": "error", ...error payload...} if a stage fails
+        """
+        try:
+            influencers = []
+            for inf in self.find_stream():
+                yield {"event": "influencer", "index": len(influencers), "influencer": inf}
+                influencers.append(inf)
+
+            for idx, inf in self.stream_enrichment(influencers):
+                updates = {field: inf[field] for field in ENRICHED_FIELDS if field in inf}
+                yield {"event": "enrichment", "index": idx, "updates": updates}
+
+            payload = self.finalize(influencers)
+            payload["cache"] = self.cache_status
+            yield dict(payload, event="complete")
+        except PipelineError as e:
+            yield dict(e.payload, event="error", status=e.status)
+        except Exception as e:
+            traceback.print_exc()
+            yield {"event": "error", "success": False, "error": str(e), "status": 500}
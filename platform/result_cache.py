@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Recommendation Result Cache
+In-process TTL + LRU cache for ChatGPTInfluencerFinder.find_influencers results,
+keyed on a canonicalized filters dict plus limit
+"""
+
+import copy
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterator, List, Optional, Tuple
+from metrics import RESULT_CACHE_LOOKUPS
+
+RESULT_CACHE_TTL = float(os.getenv('RESULT_CACHE_TTL_SECONDS', '900'))
+RESULT_CACHE_MAX_ENTRIES = int(os.getenv('RESULT_CACHE_MAX_ENTRIES', '256'))
+
+
+def _canonical_value(value):
+    """Normalize one filter value so equivalent requests compare equal"""
+    if isinstance(value, str):
+        return value.strip().lower()
+    if isinstance(value, (list, tuple, set)):
+        items = {_canonical_value(v) for v in value}
+        return sorted(v for v in items if v not in ('', None))
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def canonical_filters_key(filters: Optional[Dict], limit: int) -> str:
+    """
+    Build a cache key from filters and limit
+
+    Keys are lowercased/stripped, list values are sorted and de-duplicated,
+    and empty values are dropped, so {"location": " Mumbai "} and
+    {"location": "mumbai", "content_type": []} share a key.
+    """
+    canonical = {}
+    for key, value in (filters or {}).items():
+        value = _canonical_value(value)
+        if value in ('', None, []):
+            continue
+        if key == 'min_followers':
+            value = str(value)
+        canonical[str(key).strip().lower()] = value
+    return json.dumps({"filters": canonical, "limit": int(limit)}, sort_keys=True)
+
+
+class ResultCache:
+    """Thread-safe size-bounded LRU with per-entry TTL and hit/miss counters"""
+
+    def __init__(self, ttl: float = RESULT_CACHE_TTL, max_entries: int = RESULT_CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str):
+        """Return a copy of the cached value, or None on miss/expiry"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        # Callers mutate influencer dicts in place, so never hand out the stored object
+        return copy.deepcopy(value)
+
+    def set(self, key: str, value) -> None:
+        """Store a copy of value, evicting least recently used entries past max_entries"""
+        value = copy.deepcopy(value)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+
+# Shared by every request in this process
+recommendation_cache = ResultCache()
+
+
+def _finder_key(filters: Dict, limit: int, exclude_names: Optional[List[str]]) -> str:
+    key = canonical_filters_key(filters, limit)
+    if exclude_names:
+        key += '|exclude:' + json.dumps(sorted({str(name).strip().lower() for name in exclude_names}))
+    return key
+
+
+def cached_find_influencers(finder, filters: Dict, limit: int, bypass: bool = False,
+                            exclude_names: Optional[List[str]] = None) -> Tuple[List[Dict], str]:
+    """
+    find_influencers through the shared cache
+
+    Returns:
+        (influencers, cache_status) where cache_status is 'HIT', 'MISS' or 'BYPASS'.
+        Fallback placeholder results are never cached.
+    """
+    key = _finder_key(filters, limit, exclude_names)
+    if not bypass:
+        cached = recommendation_cache.get(key)
+        if cached is not None:
+            print(f"⚡ Result cache hit ({len(cached)} influencers)")
+            RESULT_CACHE_LOOKUPS.inc(result='hit')
+            return cached, 'HIT'
+
+    status = 'BYPASS' if bypass else 'MISS'
+    RESULT_CACHE_LOOKUPS.inc(result=status.lower())
+    influencers = finder.find_influencers(filters, limit=limit, exclude_names=exclude_names)
+    if influencers and not any(inf.get('is_fallback') for inf in influencers):
+        recommendation_cache.set(key, influencers)
+    return influencers, status
+
+
+def cached_stream_influencers(finder, filters: Dict, limit: int, bypass: bool = False,
+                              exclude_names: Optional[List[str]] = None) -> Tuple[Iterator[Dict], str]:
+    """
+    stream_influencers through the shared cache
+
+    Same keys and statuses as cached_find_influencers. A hit yields the
+    cached list; a miss yields influencers as the finder streams them and
+    caches the full list once the stream is exhausted.
+    """
+    key = _finder_key(filters, limit, exclude_names)
+    if not bypass:
+        cached = recommendation_cache.get(key)
+        if cached is not None:
+            print(f"⚡ Result cache hit ({len(cached)} influencers)")
+            RESULT_CACHE_LOOKUPS.inc(result='hit')
+            return iter(cached), 'HIT'
+
+    status = 'BYPASS' if bypass else 'MISS'
+    RESULT_CACHE_LOOKUPS.inc(result=status.lower())
+
+    def stream():
+        influencers = []
+        for inf in finder.stream_influencers(filters, limit=limit, exclude_names=exclude_names):
+            # Keep the finder's version; callers mutate what they receive
+            influencers.append(copy.deepcopy(inf))
+            yield inf
+        if influencers and not any(inf.get('is_fallback') for inf in influencers):
+            recommendation_cache.set(key, influencers)
+
+    return stream(), status
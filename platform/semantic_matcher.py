@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Semantic Matcher
+TF-IDF vectors (scikit-learn, CPU only, no network) over influencer text
+fields, with a small concept vocabulary so related terms meet ("gym" and
+"workout" both carry the fitness concept). The model is fitted in the
+background over the catalog and the influencer store, and a set of filter
+queries is scored against every result in one sparse matrix product.
+"""
+
+import os
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+import numpy as np
+from scipy import sparse
+from sklearn.feature_extraction.text import TfidfVectorizer
+from text_index import tokenize
+
+# The shared corpus fit is redone at most this often when the store has changed, in seconds
+SEMANTIC_REFIT_SECONDS = float(os.getenv('SEMANTIC_REFIT_SECONDS', '300'))
+
+# Most recently seen store records included in the corpus
+SEMANTIC_CORPUS_MAX_STORED = int(os.getenv('SEMANTIC_CORPUS_MAX_STORED', '20000'))
+
+# Fields making up an influencer's document, repeated by weight
+MATCH_FIELDS = {
+    'domain_niche': 2,
+    'job_title': 1,
+    'industry': 1,
+    'category': 1,
+    'use_case': 1,
+    'bio': 1,
+}
+
+# Concept -> terms that signal it; each term also adds a '#concept' token
+CONCEPTS = {
+    'fitness': ('fitness', 'fit', 'gym', 'workout', 'exercise', 'yoga', 'bodybuilding', 'crossfit',
+                'pilates', 'trainer', 'running', 'marathon', 'athlete', 'sports', 'wellness', 'health'),
+    'food': ('food', 'foodie', 'cooking', 'cook', 'recipe', 'chef', 'cuisine', 'restaurant', 'baking',
+             'kitchen', 'eats', 'snacks', 'nutrition', 'diet'),
+    'technology': ('technology', 'tech', 'gadget', 'gadgets', 'software', 'coding', 'programming',
+                   'developer', 'ai', 'smartphone', 'mobile', 'saas', 'app', 'apps', 'digital'),
+    'beauty': ('beauty', 'makeup', 'skincare', 'cosmetics', 'haircare', 'grooming', 'salon'),
+    'fashion': ('fashion', 'style', 'stylist', 'clothing', 'apparel', 'outfit', 'outfits', 'wear',
+                'streetwear', 'ethnic'),
+    'travel': ('travel', 'traveller', 'traveler', 'tourism', 'trip', 'trips', 'wanderlust', 'backpacking',
+               'destinations', 'vlogger'),
+    'finance': ('finance', 'financial', 'investing', 'investment', 'stocks', 'stock', 'trading', 'money',
+                'crypto', 'banking', 'insurance', 'fintech'),
+    'education': ('education', 'educational', 'learning', 'teaching', 'teacher', 'tutor', 'exam', 'exams',
+                  'upsc', 'study', 'courses', 'edtech', 'students'),
+    'gaming': ('gaming', 'gamer', 'games', 'esports', 'streamer', 'bgmi'),
+    'parenting': ('parenting', 'parent', 'mom', 'mother', 'dad', 'kids', 'baby', 'family'),
+    'entertainment': ('entertainment', 'comedy', 'comedian', 'movies', 'film', 'music', 'dance',
+                      'actor', 'celebrity', 'memes'),
+    'business': ('business', 'startup', 'startups', 'entrepreneur', 'entrepreneurship', 'marketing',
+                 'sales', 'leadership', 'b2b'),
+    'real_estate': ('property', 'realestate', 'housing', 'homes', 'interiors', 'architecture'),
+    'automotive': ('automotive', 'cars', 'car', 'bikes', 'bike', 'motorcycle', 'auto'),
+}
+_TERM_CONCEPTS: Dict[str, List[str]] = {}
+for _concept, _terms in CONCEPTS.items():
+    for _term in _terms:
+        _TERM_CONCEPTS.setdefault(_term, []).append(_concept)
+
+
+def analyze(text: str) -> List[str]:
+    """Tokens of text plus a '#concept' token for each concept a token signals"""
+    tokens = tokenize(text)
+    concepts = []
+    for token in tokens:
+        matched = _TERM_CONCEPTS.get(token)
+        if matched is None and token.endswith('s'):
+            matched = _TERM_CONCEPTS.get(token[:-1])
+        if matched:
+            concepts.extend(f'#{concept}' for concept in matched)
+    return tokens + concepts
+
+
+def influencer_document(influencer: Dict, fields: Optional[Dict[str, int]] = None) -> str:
+    """An influencer's text fields joined into one document, weighted fields repeated"""
+    parts = []
+    for field, weight in (fields or MATCH_FIELDS).items():
+        value = str(influencer.get(field) or '').strip()
+        if value:
+            parts.extend([value] * weight)
+    return ' '.join(parts)
+
+
+class SemanticMatcher:
+    """
+    TF-IDF model fitted over an influencer corpus, scoring influencers against text queries
+
+    fit() learns the vocabulary and IDF from the corpus and keeps each
+    corpus influencer's vector. scores() reuses those vectors for
+    influencers whose text is unchanged and only transforms the rest.
+    """
+
+    def __init__(self, fields: Optional[Dict[str, int]] = None):
+        self.fields = fields or MATCH_FIELDS
+        self.vectorizer = TfidfVectorizer(analyzer=analyze, sublinear_tf=True)
+        self.matrix = None
+        self.size = 0
+        self._rows: Dict[str, int] = {}  # document -> row in matrix
+
+    def fit(self, influencers: Iterable[Dict]) -> 'SemanticMatcher':
+        """Fit on the corpus and vectorize it (rows of the matrix, L2-normalized)"""
+        documents = [influencer_document(inf, self.fields) for inf in influencers]
+        self.size = len(documents)
+        try:
+            self.matrix = self.vectorizer.fit_transform(documents)
+        except ValueError:  # No tokens in any document
+            self.matrix = None
+        self._rows = {document: row for row, document in enumerate(documents)} if self.matrix is not None else {}
+        return self
+
+    @property
+    def fitted(self) -> bool:
+        return self.matrix is not None
+
+    def vectors(self, influencers: List[Dict]):
+        """Vectors for influencers: precomputed rows where the corpus has them, transformed otherwise"""
+        documents = [influencer_document(inf, self.fields) for inf in influencers]
+        missing = [document for document in documents if document not in self._rows]
+        if not missing:
+            return self.matrix[[self._rows[document] for document in documents]]
+        transformed = self.vectorizer.transform(missing)
+        new_rows = iter(range(len(missing)))
+        return sparse.vstack([
+            self.matrix[self._rows[document]] if document in self._rows else transformed[next(new_rows)]
+            for document in documents
+        ]).tocsr()
+
+    def scores(self, queries: Dict[str, str], influencers: List[Dict]) -> Dict[str, np.ndarray]:
+        """
+        Cosine similarity of every influencer to each query
+
+        Returns {query_name: array of similarities in influencer order}; all
+        queries are scored in a single sparse matrix product.
+        """
+        if not queries:
+            return {}
+        names = list(queries)
+        if self.matrix is None or not influencers:
+            return {name: np.zeros(len(influencers)) for name in names}
+        query_matrix = self.vectorizer.transform([queries[name] for name in names])
+        similarities = (self.vectors(influencers) @ query_matrix.T).toarray()
+        return {name: similarities[:, i] for i, name in enumerate(names)}
+
+
+class CorpusMatcher:
+    """
+    Shared SemanticMatcher fitted over the offline catalog and the influencer store
+
+    The fit is reused by every request so IDF weights come from the whole
+    corpus instead of one request's ~20 results. Fitting runs in a
+    background thread, off the request path: the first one when the worker
+    starts (or on first use), then again when the store has changed size,
+    at most every SEMANTIC_REFIT_SECONDS. Requests keep using the current
+    model until the new one is swapped in.
+    """
+
+    def __init__(self, refit_seconds: float = SEMANTIC_REFIT_SECONDS):
+        self.refit_seconds = refit_seconds
+        self._matcher: Optional[SemanticMatcher] = None
+        self._store_count = None
+        self._fitted_at = 0.0
+        self._refitting = False
+        self._lock = threading.Lock()
+
+    def _corpus(self) -> List[Dict]:
+        from client_registry import get_influencer_catalog, get_influencer_store
+
+        catalog = get_influencer_catalog()
+        corpus = [catalog.record(row) for row in range(len(catalog))]
+        corpus += get_influencer_store().recent(SEMANTIC_CORPUS_MAX_STORED)
+        return corpus
+
+    def _current_store_count(self) -> Optional[int]:
+        from client_registry import get_influencer_store
+
+        try:
+            return get_influencer_store().count()
+        except Exception as e:
+            print(f"⚠️  Influencer store unavailable for semantic matching: {e}")
+            return self._store_count
+
+    def get(self) -> Optional[SemanticMatcher]:
+        """
+        The current fitted matcher, or None until the first fit finishes
+
+        Never fits in the caller's thread: a missing or outdated model only
+        starts a background refit.
+        """
+        matcher = self._matcher
+        due = time.monotonic() - self._fitted_at >= self.refit_seconds
+        if due and (matcher is None or self._current_store_count() != self._store_count):
+            self.refit_in_background()
+        return matcher
+
+    def refit_in_background(self) -> bool:
+        """Start a background fit unless one is already running; returns True if one was started"""
+        with self._lock:
+            if self._refitting:
+                return False
+            self._refitting = True
+        threading.Thread(target=self._refit, name='semantic-matcher-fit', daemon=True).start()
+        return True
+
+    def _refit(self) -> None:
+        start = time.perf_counter()
+        try:
+            # Counted before reading the corpus, so records added during the fit trigger the next one
+            store_count = self._current_store_count()
+            matcher = SemanticMatcher().fit(self._corpus())
+            if matcher.fitted:
+                with self._lock:
+                    self._matcher, self._store_count = matcher, store_count
+                print(f"🧠 Semantic matcher fitted on {matcher.size} influencers in {time.perf_counter() - start:.2f}s")
+        except Exception as e:
+            print(f"⚠️  Could not fit the semantic matcher: {e}")
+        finally:
+            with self._lock:
+                self._fitted_at = time.monotonic()
+                self._refitting = False
+
+
+# Shared by every request in this process
+corpus_matcher = CorpusMatcher()
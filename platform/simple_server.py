@@ -3,11 +3,24 @@
 Simple Flask server for the platform
 """
 
-from flask import Flask, request, jsonify, send_from_directory
+from flask import Flask, Response, g, request, jsonify, send_from_directory, stream_with_context
 from flask_cors import CORS
 import os
+import json
+import time
 from dotenv import load_dotenv
+from assistant_runs import assistant_runner
+from client_registry import get_data_manager, get_influencer_catalog, get_influencer_finder, get_influencer_store, get_llm_cache
+from enrichment import shutdown_enrichment_executor
+from finder_shards import shutdown_shard_executor
 from profile_analyzer import ProfileAnalyzer
+from recommendation_pipeline import RecommendationPipeline, finder_unavailable_payload
+from recommendation_jobs import job_manager
+from ranking_views import RANKING_VIEWS_ENABLED, ranking_view_refresher, ranking_views
+from result_cache import recommendation_cache
+from semantic_matcher import corpus_matcher
+import metrics
+import timing
 
 load_dotenv()
 
@@ -17,6 +30,42 @@ CORS(app)
 # Initialize profile analyzer
 profile_analyzer = ProfileAnalyzer()
 
+# Report the result cache size with every metrics snapshot and scrape
+metrics.register_collector(lambda: metrics.RESULT_CACHE_ENTRIES.set(len(recommendation_cache)))
+
+# Load the offline influencer catalog up front (before workers fork under Gunicorn)
+get_influencer_catalog()
+
+@app.before_request
+def _start_request_timing():
+    """Collect stage spans for this request"""
+    g.request_start = time.perf_counter()
+    timing.start_request()
+
+@app.after_request
+def _add_server_timing(response):
+    """
+    Report collected stage spans in a Server-Timing header
+
+    Streamed responses are skipped: headers go out before their generator
+    runs the stages, so they send a trailing 'timing' event instead.
+    """
+    start = g.get('request_start')
+    if start is not None and not response.is_streamed:
+        total_ms = (time.perf_counter() - start) * 1000
+        response.headers['Server-Timing'] = timing.server_timing_header(timing.request_spans(), total_ms)
+    return response
+
+@app.after_request
+def _record_request_metrics(response):
+    """Count the request and its latency under its route pattern (not the raw path)"""
+    start = g.get('request_start')
+    route = request.url_rule.rule if request.url_rule else '<unmatched>'
+    metrics.HTTP_REQUESTS.inc(route=route, method=request.method, status=response.status_code)
+    if start is not None:
+        metrics.HTTP_REQUEST_SECONDS.observe(time.perf_counter() - start, route=route, method=request.method)
+    return response
+
 @app.route('/')
 def index():
     """Serve the frontend"""
@@ -31,24 +80,38 @@ def health_check():
         "version": "2.0"
     })
 
+@app.route('/metrics', methods=['GET'])
+def prometheus_metrics():
+    """Prometheus scrape endpoint (totals over every worker when METRICS_MULTIPROC_DIR is set)"""
+    return Response(metrics.render_latest(), content_type=metrics.CONTENT_TYPE)
+
+@app.route('/api/metrics/stages', methods=['GET'])
+def stage_metrics():
+    """Per-stage latency histograms (prompt build, LLM calls, parsing, social lookups, filtering, tiering)"""
+    return jsonify({
+        "success": True,
+        "unit": "ms",
+        "stages": metrics.stage_histograms()
+    })
+
 @app.route('/api/system-status', methods=['GET'])
 def system_status():
     """Check system status (ChatGPT-based, no CSV)"""
     try:
         import os
-        from chatgpt_influencer_finder import ChatGPTInfluencerFinder
         
         # Check environment variables
         openai_key = os.getenv('OPENAI_API_KEY')
         has_openai_key = bool(openai_key and openai_key != 'your_openai_api_key_here' and len(openai_key) > 20)
         
-        # Initialize finder to check if it works
-        finder = ChatGPTInfluencerFinder()
+        # Shared finder (created once per process)
+        finder = get_influencer_finder()
         has_chatgpt = finder.llm is not None
         
         # Get more diagnostic info
         port = os.getenv('PORT', '5001')
         flask_debug = os.getenv('FLASK_DEBUG', 'False')
+        llm_cache = get_llm_cache()
         
         return jsonify({
             "success": True,
@@ -60,6 +123,12 @@ def system_status():
             "flask_debug": flask_debug,
             "environment": os.getenv('ENVIRONMENT', 'production'),
             "message": "System uses ChatGPT API to find influencers directly based on client requirements.",
+            "result_cache": recommendation_cache.stats(),
+            "recommendation_jobs": job_manager.stats(),
+            "influencer_store": get_influencer_store().stats(),
+            "influencer_catalog": get_influencer_catalog().stats(),
+            "assistant_threads": assistant_runner.pool.stats(),
+            "llm_cache": llm_cache.stats() if llm_cache else None,
             "diagnostics": {
                 "finder_llm_type": str(type(finder.llm)) if finder.llm else None,
                 "finder_has_api_key": bool(finder.openai_api_key),
@@ -74,731 +143,216 @@ def system_status():
             "traceback": traceback.format_exc()
         }), 500
 
-def _format_followers(count: int) -> str:
-    """Format follower count as string (e.g., 50K, 1.2M)"""
-    if count >= 1000000:
-        return f"{count / 1000000:.1f}M"
-    elif count >= 1000:
-        return f"{count / 1000:.1f}K"
-    else:
-        return str(count)
+def _request_bypasses_cache() -> bool:
+    """Clients can skip the result cache with 'X-Cache-Bypass: 1' or 'Cache-Control: no-cache'"""
+    return (
+        request.headers.get('X-Cache-Bypass', '').lower() in ('1', 'true', 'yes') or
+        'no-cache' in request.headers.get('Cache-Control', '').lower()
+    )
+
+def _build_pipeline(data: dict):
+    """Create the finder and pipeline for a recommendations request body"""
+    filters = data.get('filters', {})
+    limit = min(data.get('limit', 10), 100)  # Max 100 recommendations (above FINDER_SHARD_SIZE the search runs as parallel shards)
+    
+    print(f"🔍 Finding influencers with ChatGPT API based on filters: {filters}")
+    
+    # Log environment check
+    openai_key = os.getenv('OPENAI_API_KEY')
+    print(f"🔍 Environment check:")
+    print(f"   OPENAI_API_KEY exists: {bool(openai_key)}")
+    print(f"   OPENAI_API_KEY length: {len(openai_key) if openai_key else 0}")
+    print(f"   OPENAI_API_KEY prefix: {openai_key[:10] + '...' if openai_key and len(openai_key) > 10 else 'N/A'}")
+    
+    finder = get_influencer_finder()
+    return RecommendationPipeline(finder, filters, limit, bypass_cache=_request_bypasses_cache())
 
 @app.route('/api/recommendations', methods=['POST'])
 def get_recommendations():
     """Get recommendations using ChatGPT API (no database/CSV)"""
     try:
-        data = request.json
-        filters = data.get('filters', {})
-        limit = min(data.get('limit', 10), 20)  # Max 20 recommendations
-        
-        print(f"🔍 Finding influencers with ChatGPT API based on filters: {filters}")
-        
-        # Use ChatGPT influencer finder directly
-        from chatgpt_influencer_finder import ChatGPTInfluencerFinder
-        import os
-        
-        # Log environment check
-        openai_key = os.getenv('OPENAI_API_KEY')
-        print(f"🔍 Environment check:")
-        print(f"   OPENAI_API_KEY exists: {bool(openai_key)}")
-        print(f"   OPENAI_API_KEY length: {len(openai_key) if openai_key else 0}")
-        print(f"   OPENAI_API_KEY prefix: {openai_key[:10] + '...' if openai_key and len(openai_key) > 10 else 'N/A'}")
-        
-        finder = ChatGPTInfluencerFinder()
+        pipeline = _build_pipeline(request.json or {})
         
         # Enhanced diagnostics
-        if not finder.llm:
-            error_msg = "ChatGPT API is not configured. "
-            if not openai_key:
-                error_msg += "OPENAI_API_KEY environment variable is not set."
-            elif openai_key == 'your_openai_api_key_here':
-                error_msg += "OPENAI_API_KEY is set to placeholder value. Please set a real API key."
-            elif len(openai_key) < 20:
-                error_msg += f"OPENAI_API_KEY appears invalid (too short: {len(openai_key)} chars)."
-            else:
-                error_msg += "ChatGPT initialization failed. Check API key validity."
-            
-            print(f"❌ {error_msg}")
-            return jsonify({
-                "success": False,
-                "error": error_msg,
-                "diagnostics": {
-                    "openai_key_exists": bool(openai_key),
-                    "openai_key_length": len(openai_key) if openai_key else 0,
-                    "finder_llm_available": False
-                },
-                "count": 0,
-                "recommendations": []
-            }), 500
-        
-        # Find influencers using ChatGPT (with timeout protection)
-        import time
-        start_time = time.time()
-        
-        try:
-            influencers = finder.find_influencers(filters, limit=limit)
-            elapsed = time.time() - start_time
-            print(f"✅ Found {len(influencers)} influencers using ChatGPT API (took {elapsed:.2f}s)")
-            
-            # Check if ChatGPT returned any influencers
-            if not influencers or len(influencers) == 0:
-                print(f"⚠️  ChatGPT returned no influencers. This could mean:")
-                print(f"   1. ChatGPT API is not configured (check OPENAI_API_KEY)")
-                print(f"   2. Filters are too restrictive for ChatGPT to find matches")
-                print(f"   3. ChatGPT API call failed silently")
-                
-                return jsonify({
-                    "success": False,
-                    "error": "No influencers found. ChatGPT API returned no results. Try removing some filters or adjusting your requirements.",
-                    "count": 0,
-                    "recommendations": [],
-                    "suggestion": "Try removing filters like product type, content type, or target audience to see more results.",
-                    "diagnostics": {
-                        "filters_applied": filters,
-                        "limit_requested": limit,
-                        "finder_llm_available": finder.llm is not None
-                    }
-                }), 200
-                
-        except Exception as e:
-            print(f"⚠️  Error finding influencers: {e}")
-            import traceback
-            traceback.print_exc()
-            # Return empty list with error message
-            return jsonify({
-                "success": False,
-                "error": f"Failed to find influencers: {str(e)}. Please try again with different filters.",
-                "count": 0,
-                "recommendations": []
-            }), 500
-        
-        # Fetch real profile data using Instagram/LinkedIn tokens
-        # This assesses their actual profiles from social media APIs
-        try:
-            from social_media_apis import SocialMediaAPIs
-            import threading
-            
-            social_apis = SocialMediaAPIs()
-            
-            # Fetch for all influencers (with timeout to avoid delays)
-            influencers_to_fetch = influencers  # Fetch for all influencers
-            
-            print(f"🔍 Fetching real profile data for {len(influencers_to_fetch)} influencers using Instagram/LinkedIn APIs...")
-            
-            for inf in influencers_to_fetch:
-                try:
-                    # Fetch real profile data with quick timeout (5 seconds max per influencer)
-                    import threading
-                    api_data = None
-                    fetch_error = None
-                    
-                    def fetch_with_timeout():
-                        nonlocal api_data, fetch_error
-                        try:
-                            # Log which handles we're trying to fetch
-                            handles = []
-                            if inf.get('instagram_handle'):
-                                handles.append(f"Instagram: {inf.get('instagram_handle')}")
-                            if inf.get('linkedin_handle'):
-                                handles.append(f"LinkedIn: {inf.get('linkedin_handle')}")
-                            if inf.get('twitter_handle'):
-                                handles.append(f"Twitter: {inf.get('twitter_handle')}")
-                            
-                            if handles:
-                                print(f"  📡 Fetching: {', '.join(handles)}")
-                            
-                            api_data = social_apis.analyze_all_platforms(inf)
-                            
-                            # Log success/failure
-                            if api_data and api_data.get('success'):
-                                platforms_with_data = [p for p, d in api_data.get('platforms', {}).items() if d and d.get('success')]
-                                if platforms_with_data:
-                                    print(f"  ✅ Successfully fetched data from: {', '.join(platforms_with_data)}")
-                                else:
-                                    print(f"  ⚠️  No successful platform data for {inf.get('full_name', 'unknown')}")
-                            elif api_data:
-                                print(f"  ❌ Failed to fetch data for {inf.get('full_name', 'unknown')}")
-                        except Exception as e:
-                            fetch_error = str(e)
-                            print(f"  ❌ Error fetching profile: {e}")
-                    
-                    fetch_thread = threading.Thread(target=fetch_with_timeout)
-                    fetch_thread.daemon = True
-                    fetch_thread.start()
-                    fetch_thread.join(timeout=8)  # 8 second timeout per influencer for better data
-                    
-                    if fetch_thread.is_alive():
-                        # Timeout - skip this influencer's real data
-                        print(f"⏱️  Timeout fetching real profile for {inf.get('full_name', 'unknown')} - skipping")
-                        continue
-                    
-                    if fetch_error:
-                        continue
-                    
-                    if not api_data:
-                        continue
-                    if api_data.get('success'):
-                        # Add real profile data to influencer
-                        inf['real_profile_data'] = api_data
-                        platforms_data = api_data.get('platforms', {})
-                        
-                        # Add platform-specific real data
-                        if platforms_data.get('instagram') and platforms_data['instagram'].get('success'):
-                            insta_data = platforms_data['instagram']
-                            inf['real_instagram'] = {
-                                'followers': insta_data.get('followers', 0),
-                                'posts_count': insta_data.get('posts_count', 0),
-                                'total_likes': insta_data.get('total_likes', 0),
-                                'average_likes': insta_data.get('average_likes', 0),
-                                'hashtags': insta_data.get('hashtags', []),
-                                'media_items': insta_data.get('media_items', [])
-                            }
-                            
-                            # UPDATE WITH REAL INSTAGRAM DATA
-                            if insta_data.get('followers', 0) > 0:
-                                inf['follower_count'] = insta_data.get('followers', 0)
-                                inf['followers'] = _format_followers(insta_data.get('followers', 0))
-                            
-                            # Use REAL average likes
-                            if insta_data.get('average_likes', 0) > 0:
-                                inf['avg_likes_per_post'] = int(insta_data.get('average_likes', 0))
-                            elif insta_data.get('total_likes', 0) > 0 and insta_data.get('posts_count', 0) > 0:
-                                inf['avg_likes_per_post'] = int(insta_data.get('total_likes', 0) / insta_data.get('posts_count', 1))
-                            
-                            # Calculate REAL engagement rate from actual data
-                            if insta_data.get('followers', 0) > 0 and inf.get('avg_likes_per_post', 0) > 0:
-                                real_engagement_rate = (inf.get('avg_likes_per_post', 0) / insta_data.get('followers', 1)) * 100
-                                inf['engagement_rate'] = round(real_engagement_rate, 2)
-                                inf['estimated_reach'] = int(insta_data.get('followers', 0) * (real_engagement_rate / 100))
-                        
-                        if platforms_data.get('twitter') and platforms_data['twitter'].get('success'):
-                            twitter_data = platforms_data['twitter']
-                            inf['real_twitter'] = {
-                                'followers': twitter_data.get('followers', 0),
-                                'tweets_count': twitter_data.get('tweets_count', 0),
-                                'total_likes': twitter_data.get('total_likes', 0),
-                                'bio': twitter_data.get('bio', ''),
-                                'hashtags': twitter_data.get('hashtags', [])
-                            }
-                            
-                            # UPDATE WITH REAL TWITTER DATA (if no Instagram data)
-                            if twitter_data.get('followers', 0) > 0:
-                                if not inf.get('follower_count') or inf.get('follower_count', 0) == 0:
-                                    inf['follower_count'] = twitter_data.get('followers', 0)
-                                    inf['followers'] = _format_followers(twitter_data.get('followers', 0))
-                            
-                            # Use REAL Twitter engagement
-                            if twitter_data.get('total_likes', 0) > 0 and twitter_data.get('tweets_count', 0) > 0:
-                                avg_twitter_likes = int(twitter_data.get('total_likes', 0) / twitter_data.get('tweets_count', 1))
-                                if not inf.get('avg_likes_per_post') or inf.get('avg_likes_per_post', 0) == 0:
-                                    inf['avg_likes_per_post'] = avg_twitter_likes
-                            
-                            # Calculate REAL engagement rate from Twitter
-                            if twitter_data.get('followers', 0) > 0 and inf.get('avg_likes_per_post', 0) > 0:
-                                real_engagement_rate = (inf.get('avg_likes_per_post', 0) / twitter_data.get('followers', 1)) * 100
-                                if not inf.get('engagement_rate') or inf.get('engagement_rate', 0) == 0:
-                                    inf['engagement_rate'] = round(real_engagement_rate, 2)
-                                    inf['estimated_reach'] = int(twitter_data.get('followers', 0) * (real_engagement_rate / 100))
-                        
-                        if platforms_data.get('linkedin') and platforms_data['linkedin'].get('success'):
-                            linkedin_data = platforms_data['linkedin']
-                            inf['real_linkedin'] = {
-                                'headline': linkedin_data.get('headline', ''),
-                                'summary': linkedin_data.get('summary', ''),
-                                'location': linkedin_data.get('location', ''),
-                                'posts_count': linkedin_data.get('posts_count', 0),
-                                'hashtags': linkedin_data.get('hashtags', [])
-                            }
-                        
-                        # Update overall metrics with REAL data from APIs
-                        overall = api_data.get('overall', {})
-                        if overall.get('total_views', 0) > 0:
-                            inf['real_total_views'] = overall.get('total_views', 0)
-                            inf['real_average_views'] = overall.get('average_views_per_post', 0)
-                            inf['real_hashtags'] = overall.get('all_hashtags', [])
-                except Exception as e:
-                    # Skip real profile fetch for this influencer if it fails
-                    print(f"⚠️  Could not fetch real profile for {inf.get('full_name', 'unknown')}: {e}")
-                    continue
-        except Exception as e:
-            # If social media APIs are not available, continue without real profile data
-            print(f"⚠️  Social media APIs not available: {e}")
-            print("📝 Continuing with ChatGPT-generated influencer data")
-        
-        # Store selected platforms in each influencer for frontend display
-        selected_platforms = filters.get('platforms', [])
-        
-        # Filter out handles for platforms that weren't selected
-        if selected_platforms:
-            platforms_lower = [p.lower() for p in selected_platforms] if isinstance(selected_platforms, list) else [selected_platforms.lower()]
-            
-            for inf in influencers:
-                inf['selected_platforms'] = selected_platforms
-                
-                # Remove handles for platforms that weren't selected
-                has_instagram = any('instagram' in p for p in platforms_lower)
-                has_twitter = any('twitter' in p or 'x' in p for p in platforms_lower)
-                has_linkedin = any('linkedin' in p for p in platforms_lower)
-                has_youtube = any('youtube' in p for p in platforms_lower)
-                has_facebook = any('facebook' in p for p in platforms_lower)
-                
-                if not has_instagram:
-                    inf['instagram_handle'] = None
-                if not has_twitter:
-                    inf['twitter_handle'] = None
-                if not has_linkedin:
-                    inf['linkedin_handle'] = None
-                if not has_youtube:
-                    inf['youtube_handle'] = None
-                if not has_facebook:
-                    inf['facebook_handle'] = None
+        error_payload = finder_unavailable_payload(pipeline.finder)
+        if error_payload:
+            return jsonify(error_payload), 500
+        
+        view_payload = None if pipeline.bypass_cache else ranking_views.lookup(pipeline.filters, pipeline.limit)
+        if view_payload is not None:
+            payload, status = view_payload, 200
+            pipeline.cache_status = 'VIEW'
         else:
-            # If no platforms selected, keep all handles
-            for inf in influencers:
-                inf['selected_platforms'] = []
-        
-        # Extract filter values for use throughout the function
-        location = filters.get('location', '').strip() if filters.get('location') else ''
-        product_type = filters.get('product_type', '').strip() if filters.get('product_type') else ''
-        content_type = filters.get('content_type', [])
-        target_audience = filters.get('target_audience', '').strip() if filters.get('target_audience') else ''
-        
-        # Store original count for fallback logic
-        original_count = len(influencers)
-        print(f"📊 Starting with {original_count} influencers from ChatGPT")
-        
-        # If we have very few influencers, be VERY lenient with filtering
-        use_strict_filtering = original_count >= 5
-        
-        if not use_strict_filtering:
-            print(f"⚠️  Only {original_count} influencers found - using LENIENT filtering to preserve results")
-        
-        # CRITICAL: Filter out micro/nano influencers and only show verified influencers
-        # Filter by location first (but be lenient)
-        if location and use_strict_filtering:
-            location_filtered = []
-            for inf in influencers:
-                inf_location = str(inf.get('location', '')).lower()
-                # Check if location matches (exact match or contains the location)
-                if location.lower() in inf_location or inf_location in location.lower():
-                    location_filtered.append(inf)
-                else:
-                    print(f"⚠️  Filtered out {inf.get('full_name', 'Unknown')} - location '{inf.get('location')}' doesn't match '{location}'")
-            
-            # If location filter removed all influencers, be lenient and keep all
-            if len(location_filtered) == 0 and original_count > 0:
-                print(f"⚠️  Location filter removed all influencers. Using lenient matching - keeping all {original_count} influencers.")
-                location_filtered = influencers
-            else:
-                influencers = location_filtered
-                print(f"✅ Filtered to {len(influencers)} influencers from {location}")
-        
-        # Filter out micro/nano influencers (under 10K followers) - but be lenient if no results
-        macro_mid_influencers = []
-        micro_nano_influencers = []
-        
-        for inf in influencers:
-            # Get follower count
-            follower_count = inf.get('follower_count', 0)
-            if follower_count == 0:
-                # Parse from string
-                followers_str = str(inf.get('followers', '0')).upper()
-                try:
-                    clean_str = followers_str.replace(',', '').replace(' ', '').strip()
-                    if 'K' in clean_str:
-                        follower_count = float(clean_str.replace('K', '')) * 1000
-                    elif 'M' in clean_str:
-                        follower_count = float(clean_str.replace('M', '')) * 1000000
-                    else:
-                        follower_count = float(clean_str) if clean_str else 0
-                except:
-                    follower_count = 0
-            
-            # Only include if 10K+ followers (exclude micro/nano)
-            if follower_count >= 10000:
-                macro_mid_influencers.append(inf)
-            else:
-                micro_nano_influencers.append(inf)
-                print(f"⚠️  Filtered out {inf.get('full_name', 'Unknown')} - only {int(follower_count)} followers (micro/nano)")
-        
-        # If we have macro/mid-tier influencers, use them. Otherwise, include micro/nano to show something
-        if len(macro_mid_influencers) > 0:
-            influencers = macro_mid_influencers
-            print(f"✅ Filtered to {len(influencers)} macro/mid-tier influencers (excluded {len(micro_nano_influencers)} micro/nano)")
-        else:
-            # No macro/mid-tier found, include micro/nano to show results
-            influencers = macro_mid_influencers + micro_nano_influencers
-            print(f"⚠️  No macro/mid-tier influencers found. Showing {len(influencers)} influencers (including micro/nano)")
-        
-        # TRUST ChatGPT Results: Don't filter - ChatGPT knows real influencers
-        # The API verification was filtering out real influencers, so we trust ChatGPT completely
-        print(f"✅ Trusting ChatGPT results: {len(influencers)} influencers")
-        # Skip all filtering - just use ChatGPT's results directly
-        
-        # Filter by min_followers using REAL data if available, otherwise use estimated
-        min_followers = filters.get('min_followers')
-        if min_followers:
-            min_followers_int = int(min_followers) if isinstance(min_followers, (int, str)) and str(min_followers).isdigit() else 0
-            if min_followers_int > 0:
-                filtered_influencers = []
-                for inf in influencers:
-                    # Use REAL follower count if available, otherwise estimate from string
-                    real_follower_count = inf.get('follower_count', 0)
-                    if real_follower_count == 0:
-                        # Parse estimated followers string
-                        followers_str = str(inf.get('followers', '0')).upper()
-                        try:
-                            clean_str = followers_str.replace(',', '').replace(' ', '').strip()
-                            if 'K' in clean_str:
-                                real_follower_count = float(clean_str.replace('K', '')) * 1000
-                            elif 'M' in clean_str:
-                                real_follower_count = float(clean_str.replace('M', '')) * 1000000
-                            else:
-                                real_follower_count = float(clean_str) if clean_str else 0
-                        except:
-                            real_follower_count = 0
-                    
-                    # Only include if meets minimum follower requirement
-                    if real_follower_count >= min_followers_int:
-                        inf['follower_count'] = int(real_follower_count)
-                        filtered_influencers.append(inf)
-                    else:
-                        print(f"⚠️  Filtered out {inf.get('full_name', 'Unknown')} - {real_follower_count} followers < {min_followers_int}")
-                
-                influencers = filtered_influencers
-                print(f"✅ Filtered to {len(influencers)} influencers meeting min {min_followers_int} followers requirement")
-        
-        # Filter by product_type (lenient - keep all if filter removes everything)
-        # Only apply if we have enough influencers or user explicitly wants strict filtering
-        if product_type and use_strict_filtering:
-            product_filtered = []
-            for inf in influencers:
-                # Check if influencer's domain_niche, job_title, or use_case matches product_type
-                domain_niche = str(inf.get('domain_niche', '')).lower()
-                job_title = str(inf.get('job_title', '')).lower()
-                use_case = str(inf.get('use_case', '')).lower()
-                product_lower = product_type.lower()
-                
-                # Check if any field contains the product type or is related
-                matches = (
-                    product_lower in domain_niche or 
-                    product_lower in job_title or 
-                    product_lower in use_case or
-                    domain_niche in product_lower or
-                    job_title in product_lower
-                )
-                
-                if matches:
-                    product_filtered.append(inf)
-                else:
-                    print(f"⚠️  Filtered out {inf.get('full_name', 'Unknown')} - doesn't match product type '{product_type}'")
-            
-            # If product filter removed all influencers, be lenient and keep all
-            if len(product_filtered) == 0 and len(influencers) > 0:
-                print(f"⚠️  Product type filter removed all influencers. Using lenient matching - keeping all {len(influencers)} influencers.")
-                product_filtered = influencers
-            else:
-                influencers = product_filtered
-                print(f"✅ Filtered to {len(influencers)} influencers matching product type '{product_type}'")
-        
-        # Filter by content_type (lenient - keep all if filter removes everything)
-        # Only apply if we have enough influencers or user explicitly wants strict filtering
-        if content_type and isinstance(content_type, list) and len(content_type) > 0 and use_strict_filtering:
-            content_filtered = []
-            for inf in influencers:
-                # Check if influencer's content matches any of the selected content types
-                domain_niche = str(inf.get('domain_niche', '')).lower()
-                job_title = str(inf.get('job_title', '')).lower()
-                bio = str(inf.get('bio', '')).lower()
-                
-                matches = False
-                for ct in content_type:
-                    ct_lower = str(ct).lower()
-                    if (ct_lower in domain_niche or 
-                        ct_lower in job_title or 
-                        ct_lower in bio or
-                        domain_niche in ct_lower or
-                        job_title in ct_lower):
-                        matches = True
-                        break
-                
-                if matches:
-                    content_filtered.append(inf)
-                else:
-                    print(f"⚠️  Filtered out {inf.get('full_name', 'Unknown')} - doesn't match content types {content_type}")
-            
-            # If content filter removed all influencers, be lenient and keep all
-            if len(content_filtered) == 0 and len(influencers) > 0:
-                print(f"⚠️  Content type filter removed all influencers. Using lenient matching - keeping all {len(influencers)} influencers.")
-                content_filtered = influencers
-            else:
-                influencers = content_filtered
-                print(f"✅ Filtered to {len(influencers)} influencers matching content types {content_type}")
-        
-        # Filter by target_audience (lenient - keep all if filter removes everything)
-        # Only apply if we have enough influencers or user explicitly wants strict filtering
-        if target_audience and use_strict_filtering:
-            audience_filtered = []
-            for inf in influencers:
-                # Check if influencer's bio, domain_niche, or use_case indicates they reach the target audience
-                domain_niche = str(inf.get('domain_niche', '')).lower()
-                job_title = str(inf.get('job_title', '')).lower()
-                bio = str(inf.get('bio', '')).lower()
-                use_case = str(inf.get('use_case', '')).lower()
-                audience_lower = target_audience.lower()
-                
-                # Check if any field contains the target audience or is related
-                matches = (
-                    audience_lower in domain_niche or 
-                    audience_lower in job_title or 
-                    audience_lower in bio or
-                    audience_lower in use_case or
-                    domain_niche in audience_lower or
-                    job_title in audience_lower
-                )
-                
-                if matches:
-                    audience_filtered.append(inf)
-                else:
-                    print(f"⚠️  Filtered out {inf.get('full_name', 'Unknown')} - doesn't match target audience '{target_audience}'")
-            
-            # If audience filter removed all influencers, be lenient and keep all
-            if len(audience_filtered) == 0 and len(influencers) > 0:
-                print(f"⚠️  Target audience filter removed all influencers. Using lenient matching - keeping all {len(influencers)} influencers.")
-                audience_filtered = influencers
-            else:
-                influencers = audience_filtered
-                print(f"✅ Filtered to {len(influencers)} influencers matching target audience '{target_audience}'")
-        
-        # Calculate engagement metrics and match scores
-        for idx, inf in enumerate(influencers):
-            base_score = 70  # Start with base score
-            
-            # Boost score for matching product_type
-            if product_type:
-                domain_niche = str(inf.get('domain_niche', '')).lower()
-                job_title = str(inf.get('job_title', '')).lower()
-                use_case = str(inf.get('use_case', '')).lower()
-                product_lower = product_type.lower()
-                if (product_lower in domain_niche or product_lower in job_title or product_lower in use_case):
-                    base_score += 10  # Strong match bonus
-                    inf['matches_product_type'] = True
-            
-            # Boost score for matching content_type
-            if content_type and isinstance(content_type, list) and len(content_type) > 0:
-                domain_niche = str(inf.get('domain_niche', '')).lower()
-                job_title = str(inf.get('job_title', '')).lower()
-                bio = str(inf.get('bio', '')).lower()
-                matches_content = False
-                for ct in content_type:
-                    ct_lower = str(ct).lower()
-                    if (ct_lower in domain_niche or ct_lower in job_title or ct_lower in bio):
-                        matches_content = True
-                        break
-                if matches_content:
-                    base_score += 10  # Strong match bonus
-                    inf['matches_content_type'] = True
-            
-            # Boost score for matching target_audience
-            if target_audience:
-                domain_niche = str(inf.get('domain_niche', '')).lower()
-                job_title = str(inf.get('job_title', '')).lower()
-                bio = str(inf.get('bio', '')).lower()
-                use_case = str(inf.get('use_case', '')).lower()
-                audience_lower = target_audience.lower()
-                if (audience_lower in domain_niche or audience_lower in job_title or audience_lower in bio or audience_lower in use_case):
-                    base_score += 10  # Strong match bonus
-                    inf['matches_target_audience'] = True
-            
-            # Boost score for matching industry
-            industry = filters.get('industry', '').strip() if filters.get('industry') else ''
-            if industry:
-                inf_industry = str(inf.get('industry', '')).lower()
-                if industry.lower() in inf_industry or inf_industry in industry.lower():
-                    base_score += 10
-                    inf['matches_industry'] = True
-            
-            # Boost score for matching location
-            location = filters.get('location', '').strip() if filters.get('location') else ''
-            if location:
-                inf_location = str(inf.get('location', '')).lower()
-                if location.lower() in inf_location or inf_location in location.lower():
-                    base_score += 5
-                    inf['matches_location'] = True
-            
-            # Boost score if has email (better contactability)
-            if inf.get('email') and inf.get('email').strip() and '@' in inf.get('email', '') and 'example.com' not in inf.get('email', '').lower():
-                base_score += 5
-            
-            # Boost score if has contact link
-            if inf.get('contact_link') and inf.get('contact_link').strip():
-                base_score += 5
-            
-            # Boost score if has use_case (clear collaboration purpose)
-            if inf.get('use_case') and inf.get('use_case').strip():
-                base_score += 5
-            
-            # Boost score for top/macro influencers (they have more reach)
-            if inf.get('tier') == 'Top/Macro':
-                base_score += 10
-            
-            # Boost score if has REAL data from APIs
-            if inf.get('real_instagram') or inf.get('real_twitter') or inf.get('real_linkedin'):
-                base_score += 15  # Significant boost for verified real data
-            
-            # Slight decrease for ranking (lower index = higher score)
-            base_score -= (idx * 1)
-            
-            inf['match_score'] = max(10, min(100, int(base_score)))
-            
-            # Use REAL follower count if available, otherwise calculate from string
-            follower_count = inf.get('follower_count', 0)
-            if follower_count == 0:
-                # Calculate engagement metrics from estimated data
-                followers_str = str(inf.get('followers', '0')).upper()
-                try:
-                    clean_str = followers_str.replace(',', '').replace(' ', '').strip()
-                    if 'K' in clean_str:
-                        follower_count = float(clean_str.replace('K', '')) * 1000
-                    elif 'M' in clean_str:
-                        follower_count = float(clean_str.replace('M', '')) * 1000000
-                    else:
-                        follower_count = float(clean_str) if clean_str else 0
-                except:
-                    follower_count = 0
-                inf['follower_count'] = int(follower_count)
-            
-            # Only calculate ESTIMATED metrics if we don't have REAL data
-            if not inf.get('real_instagram') and not inf.get('real_twitter'):
-                # Calculate estimated engagement metrics based on tier
-                tier = inf.get('tier', 'Emerging')
-                if tier == 'Top/Macro':
-                    engagement_rate = 1.5  # 1.5% typical for macro
-                    avg_likes = int(follower_count * 0.015)
-                    avg_comments = int(follower_count * 0.001)
-                elif tier == 'Mid-tier':
-                    engagement_rate = 2.5  # 2.5% typical for mid-tier
-                    avg_likes = int(follower_count * 0.025)
-                    avg_comments = int(follower_count * 0.002)
-                elif tier == 'Micro':
-                    engagement_rate = 4.0  # 4% typical for micro
-                    avg_likes = int(follower_count * 0.04)
-                    avg_comments = int(follower_count * 0.003)
-                elif tier == 'Nano':
-                    engagement_rate = 6.0  # 6% typical for nano
-                    avg_likes = int(follower_count * 0.06)
-                    avg_comments = int(follower_count * 0.005)
-                else:
-                    engagement_rate = 3.0
-                    avg_likes = int(follower_count * 0.03)
-                    avg_comments = int(follower_count * 0.002)
-                
-                # Only set estimated metrics if real ones aren't already set
-                if not inf.get('engagement_rate') or inf.get('engagement_rate', 0) == 0:
-                    inf['engagement_rate'] = round(engagement_rate, 2)
-                if not inf.get('avg_likes_per_post') or inf.get('avg_likes_per_post', 0) == 0:
-                    inf['avg_likes_per_post'] = avg_likes
-                if not inf.get('avg_comments_per_post') or inf.get('avg_comments_per_post', 0) == 0:
-                    inf['avg_comments_per_post'] = avg_comments
-                if not inf.get('estimated_reach') or inf.get('estimated_reach', 0) == 0:
-                    inf['estimated_reach'] = int(follower_count * (engagement_rate / 100))
-            
-            # Mark if data is estimated vs real
-            inf['data_source'] = 'real' if (inf.get('real_instagram') or inf.get('real_twitter') or inf.get('real_linkedin')) else 'estimated'
-        
-        # Final check: if we have no influencers after all filtering, try to recover
-        if len(influencers) == 0:
-            print(f"❌ No influencers remaining after filtering. Original count: {original_count}")
-            
-            # Try to get fallback influencers that match at least some criteria
-            print(f"🔄 Attempting to get fallback influencers...")
-            try:
-                # Create minimal filters (only industry and location if specified)
-                minimal_filters = {}
-                if filters.get('industry'):
-                    minimal_filters['industry'] = filters.get('industry')
-                if filters.get('location'):
-                    minimal_filters['location'] = filters.get('location')
-                
-                # Get fallback influencers with minimal filters
-                # Use the same finder instance that was used earlier
-                fallback_influencers = finder._get_fallback_influencers(minimal_filters, limit)
-                
-                if fallback_influencers and len(fallback_influencers) > 0:
-                    print(f"✅ Got {len(fallback_influencers)} fallback influencers")
-                    influencers = fallback_influencers
-                    # Mark them as fallback so we know they're not perfect matches
-                    for inf in influencers:
-                        inf['is_fallback'] = True
-                        inf['match_score'] = 60  # Lower score for fallback
-                else:
-                    # Last resort: create generic influencers
-                    print(f"⚠️  Creating generic influencers as last resort")
-                    influencers = []
-                    for i in range(1, min(limit + 1, 6)):
-                        industry = filters.get('industry', 'General')
-                        location = filters.get('location', 'India')
-                        influencers.append({
-                            'id': i,
-                            'full_name': f'{industry} Influencer {i}',
-                            'email': f'influencer{i}@example.com',
-                            'industry': industry if industry else 'General',
-                            'category': industry if industry else 'General',
-                            'job_title': f'{industry} Content Creator' if industry else 'Content Creator',
-                            'domain_niche': f'{industry} Content Creator' if industry else 'Content Creator',
-                            'company_name': f'{industry} Brand',
-                            'location': location,
-                            'contact_type': 'Email',
-                            'contact_link': f'https://example.com/influencer{i}',
-                            'use_case': f'{industry} content collaboration' if industry else 'Content collaboration',
-                            'source_url': f'https://example.com/influencer{i}',
-                            'bio': f'Content creator specializing in {industry}' if industry else 'Content creator',
-                            'platform': 'Multiple',
-                            'followers': '50K',
-                            'follower_count': 50000,
-                            'match_score': 50,
-                            'is_fallback': True,
-                            'tier': 'Mid-tier'
-                        })
-                    print(f"✅ Created {len(influencers)} generic influencers")
-            except Exception as e:
-                print(f"⚠️  Error getting fallback influencers: {e}")
-                return jsonify({
-                    "success": False,
-                    "error": "No influencers found matching your criteria. Try removing some filters or adjusting your requirements.",
-                    "count": 0,
-                    "recommendations": [],
-                    "suggestion": "Try removing filters like product type, content type, or target audience to see more results."
-                }), 200  # Return 200 so frontend can show the message
-        
-        # Sort by match score (highest first) - top matches at the top
-        influencers.sort(key=lambda x: x.get('match_score', 0), reverse=True)
-        
-        # Categorize by tier
-        tiered_influencers = finder.categorize_influencers_by_tier(influencers)
-        
-        # Count influencers per tier
-        tier_counts = {tier: len(inf_list) for tier, inf_list in tiered_influencers.items()}
-        
-        print(f"✅ Final result: {len(influencers)} influencers after all filtering")
-        
+            payload, status = pipeline.run_coalesced()
+        response = jsonify(payload)
+        if pipeline.cache_status:
+            response.headers['X-Cache'] = pipeline.cache_status
+        if pipeline.coalesced:
+            response.headers['X-Coalesced'] = '1'
+        return response, status
+    except Exception as e:
+        import traceback
+        error_msg = str(e)
+        traceback.print_exc()
+        return jsonify({
+            "success": False,
+            "error": error_msg
+        }), 500
+
+@app.route('/api/catalog/search', methods=['POST'])
+def search_catalog():
+    """Query the offline influencer catalog (bundled CSVs) - no ChatGPT call"""
+    try:
+        data = request.json or {}
+        filters = data.get('filters', {})
+        limit = min(data.get('limit', 50), 500)
+        influencers = get_influencer_catalog().query_filters(filters, limit=limit)
         return jsonify({
             "success": True,
             "count": len(influencers),
-            "recommendations": influencers,
-            "tiered_influencers": tiered_influencers,
-            "tier_counts": tier_counts,
-            "source": "ChatGPT API (no database/CSV)"
+            "influencers": influencers,
+            "source": "Offline catalog"
         })
+    except Exception as e:
+        return jsonify({"success": False, "error": str(e)}), 500
+
+@app.route('/api/catalog/facets', methods=['POST'])
+def catalog_facets():
+    """Live facet counts (industry, location, platform, tier) for the filter panel"""
+    try:
+        data = request.json or {}
+        result = get_influencer_catalog().facets(data.get('filters', {}))
+        return jsonify({"success": True, **result})
+    except Exception as e:
+        return jsonify({"success": False, "error": str(e)}), 500
+
+@app.route('/api/filter-options', methods=['GET'])
+def filter_options():
+    """Filter panel options (industries, locations, platforms, tiers) with catalog counts"""
+    try:
+        return jsonify({"success": True, "options": get_data_manager().get_filter_options()})
+    except Exception as e:
+        return jsonify({"success": False, "error": str(e)}), 500
+
+@app.route('/api/ranking-views', methods=['GET'])
+def list_ranking_views():
+    """Precomputed industry x location ranking views and their freshness"""
+    try:
+        return jsonify({"success": True, "enabled": RANKING_VIEWS_ENABLED, **ranking_views.stats()})
+    except Exception as e:
+        return jsonify({"success": False, "error": str(e)}), 500
+
+@app.route('/api/ranking-views/refresh', methods=['POST'])
+def refresh_ranking_views():
+    """Recompute every ranking view now in a one-off background pass (409 if disabled or another pass has the lease)"""
+    if not RANKING_VIEWS_ENABLED:
+        return jsonify({"success": False, "error": "Ranking views are disabled (set RANKING_VIEWS_ENABLED=true)"}), 409
+    try:
+        outcome = ranking_view_refresher.trigger()
+    except Exception as e:
+        return jsonify({"success": False, "error": str(e)}), 500
+    if not outcome["started"]:
+        return jsonify({"success": False, "error": outcome["reason"], **outcome}), 409
+    return jsonify({"success": True, "message": "Ranking view refresh started", **outcome}), 202
+
+@app.route('/api/recommendations/stream', methods=['POST'])
+def stream_recommendations():
+    """
+    Streaming variant of /api/recommendations
+    
+    Sends newline-delimited JSON events (or Server-Sent Events when the client
+    sends "Accept: text/event-stream" or ?format=sse): one 'influencer' event per
+    result as soon as it is parsed, 'enrichment' events as real profile data
+    arrives, then a final 'complete' event with the ranked list and tier counts,
+    followed by a 'timing' event with the stage spans (the Server-Timing header
+    is sent before any stage runs, so it is left off).
+    """
+    try:
+        pipeline = _build_pipeline(request.json or {})
+        
+        error_payload = finder_unavailable_payload(pipeline.finder)
+        if error_payload:
+            return jsonify(error_payload), 500
+        
+        use_sse = request.args.get('format') == 'sse' or 'text/event-stream' in request.headers.get('Accept', '')
+        
+        start = g.request_start
+        
+        def encode(event):
+            body = json.dumps(event)
+            if use_sse:
+                return f"event: {event['event']}\ndata: {body}\n\n"
+            return body + "\n"
+        
+        def generate():
+            # Collect the spans recorded while the stream is being produced
+            timing.start_request()
+            for event in pipeline.stream():
+                yield encode(event)
+            total_ms = (time.perf_counter() - start) * 1000
+            yield encode({
+                "event": "timing",
+                "server_timing": timing.server_timing_header(timing.request_spans(), total_ms)
+            })
+        
+        response = Response(
+            stream_with_context(generate()),
+            mimetype='text/event-stream' if use_sse else 'application/x-ndjson'
+        )
+        # Stop proxies from buffering the stream
+        response.headers['Cache-Control'] = 'no-cache'
+        response.headers['X-Accel-Buffering'] = 'no'
+        return response
     except Exception as e:
         import traceback
-        error_msg = str(e)
         traceback.print_exc()
         return jsonify({
             "success": False,
-            "error": error_msg
+            "error": str(e)
         }), 500
 
+@app.route('/api/recommendations/jobs', methods=['POST'])
+def submit_recommendation_job():
+    """Submit a recommendations search to run in the background; returns a job id immediately"""
+    try:
+        pipeline = _build_pipeline(request.json or {})
+        
+        error_payload = finder_unavailable_payload(pipeline.finder)
+        if error_payload:
+            return jsonify(error_payload), 500
+        
+        job = job_manager.submit(pipeline)
+        return jsonify({
+            "success": True,
+            "job_id": job.id,
+            "status": job.status,
+            "status_url": f"/api/recommendations/jobs/{job.id}",
+            "result_url": f"/api/recommendations/jobs/{job.id}/result"
+        }), 202
+    except Exception as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 500
+
+@app.route('/api/recommendations/jobs/<job_id>', methods=['GET'])
+def get_recommendation_job(job_id):
+    """Poll a recommendations job: status, current stage and progress"""
+    job = job_manager.get(job_id)
+    if not job:
+        return jsonify({"success": False, "error": "Job not found or expired"}), 404
+    return jsonify(dict(job.to_dict(), success=True))
+
+@app.route('/api/recommendations/jobs/<job_id>/result', methods=['GET'])
+def get_recommendation_job_result(job_id):
+    """Fetch a finished job's result (same body as /api/recommendations); 202 while still running"""
+    job = job_manager.get(job_id)
+    if not job:
+        return jsonify({"success": False, "error": "Job not found or expired"}), 404
+    if not job.finished_at:
+        return jsonify(dict(job.to_dict(), success=True)), 202
+    return jsonify(job.result), job.http_status
+
 @app.route('/api/analyze-profile/<influencer_id>', methods=['POST'])
 def analyze_profile(influencer_id):
     """Analyze influencer profile with GPT, hashtags, and views"""
@@ -808,8 +362,7 @@ def analyze_profile(influencer_id):
         filters = data.get('filters', {})
         
         # Find the influencer first using ChatGPT
-        from data_manager import InfluencerDataManager
-        dm = InfluencerDataManager()
+        dm = get_data_manager()
         influencer = dm.get_influencer_by_id(influencer_id, filters)
         
         if not influencer:
@@ -844,8 +397,7 @@ def analyze_profiles_batch():
         influencer_ids = data.get('influencer_ids', [])
         filters = data.get('filters', {})  # Get filters to help find influencers
         
-        from data_manager import InfluencerDataManager
-        dm = InfluencerDataManager()
+        dm = get_data_manager()
         
         results = []
         for inf_id in influencer_ids:
@@ -870,6 +422,23 @@ def analyze_profiles_batch():
             "error": str(e)
         }), 500
 
+def start_background_work():
+    """Start the metrics snapshot flusher, the semantic matcher's corpus fit, and the ranking view refresher if enabled (once per worker process)"""
+    metrics.snapshot_flusher.start()
+    corpus_matcher.refit_in_background()
+    if RANKING_VIEWS_ENABLED:
+        ranking_view_refresher.start()
+
+def shutdown_background_work():
+    """Wait for running recommendation jobs and enrichment lookups to finish (graceful shutdown)"""
+    print("🛑 Draining background work before shutdown...")
+    ranking_view_refresher.stop(timeout=5)
+    job_manager.shutdown(wait=True)
+    shutdown_enrichment_executor(wait=True)
+    shutdown_shard_executor(wait=True)
+    # Last, so the final snapshot includes the drained work
+    metrics.snapshot_flusher.stop()
+
 if __name__ == '__main__':
     port = int(os.getenv('PORT', 5001))
     debug_mode = os.getenv('FLASK_DEBUG', 'False').lower() == 'true'
@@ -878,6 +447,8 @@ if __name__ == '__main__':
     print(f"{'='*70}")
     print(f"✅ Server starting on http://0.0.0.0:{port}")
     print(f"🔧 Debug mode: {debug_mode}")
+    print("💡 Development server - for production run: gunicorn -c gunicorn.conf.py wsgi:app")
     print(f"{'='*70}\n")
+    start_background_work()
     app.run(host='0.0.0.0', port=port, debug=debug_mode)
 
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Single-Flight Request Coalescing
+Concurrent calls with the same key share one in-flight computation: the first
+caller runs it, the rest wait (up to a timeout) and receive (a copy of) its
+result or exception
+"""
+
+import copy
+import threading
+from typing import Callable, Dict, Optional, Tuple
+from metrics import Counter
+
+SINGLEFLIGHT_CALLS = Counter(
+    'nova_singleflight_calls_total',
+    'Coalesced computations, by group and role (leader runs it, follower waits, timeout: follower gave up waiting)',
+    ('group', 'role')
+)
+
+
+class SingleFlightTimeout(TimeoutError):
+    """A follower waited longer than its timeout for the leader's result"""
+
+
+class _Call:
+    """One in-flight computation"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.followers = 0
+
+
+class SingleFlight:
+    """Deduplicate concurrent calls per key"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._calls: Dict[str, _Call] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: str, fn: Callable, timeout: Optional[float] = None) -> Tuple[object, bool]:
+        """
+        Run fn() once for all concurrent callers using key
+
+        Followers wait at most timeout seconds (None: no limit) for the
+        leader, then raise SingleFlightTimeout instead of hanging on a stuck
+        computation. The leader itself is not interrupted.
+
+        Returns:
+            (result, shared) where shared is True for callers that waited on
+            another caller's computation. Followers get deep copies, since
+            callers mutate results in place.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+            else:
+                call.followers += 1
+
+        if not leader:
+            SINGLEFLIGHT_CALLS.inc(group=self.name, role='follower')
+            if not call.done.wait(timeout):
+                SINGLEFLIGHT_CALLS.inc(group=self.name, role='timeout')
+                raise SingleFlightTimeout(f"{self.name}: gave up after {timeout:g}s waiting for an identical call")
+            if call.error is not None:
+                raise call.error
+            return copy.deepcopy(call.result), True
+
+        SINGLEFLIGHT_CALLS.inc(group=self.name, role='leader')
+        try:
+            call.result = fn()
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            # No follower can join once the call is unregistered
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+        # Keep the stored result pristine for followers still copying it
+        if call.followers:
+            return copy.deepcopy(call.result), False
+        return call.result, False
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
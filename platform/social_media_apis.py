@@ -7,7 +7,24 @@ Fetches real data from Instagram, LinkedIn, Twitter, and Facebook APIs
 import os
 import requests
 from typing import Dict, List, Optional
+from urllib.parse import urlparse
 import json
+from metrics import SOCIAL_API_REQUESTS, SOCIAL_LOOKUPS
+from timing import span
+
+# API host -> platform label for request metrics
+API_HOST_PLATFORMS = {
+    "graph.instagram.com": "instagram",
+    "api.twitter.com": "twitter",
+    "api.linkedin.com": "linkedin",
+    "graph.facebook.com": "facebook"
+}
+
+
+def _count_api_response(response, *args, **kwargs):
+    """requests response hook: count every API response by platform and status code"""
+    host = urlparse(response.url).hostname or ''
+    SOCIAL_API_REQUESTS.inc(platform=API_HOST_PLATFORMS.get(host, host), status=response.status_code)
 
 class SocialMediaAPIs:
     """Integrate with social media APIs to fetch real profile data"""
@@ -20,6 +37,12 @@ class SocialMediaAPIs:
         self.linkedin_client_id = os.getenv('LINKEDIN_CLIENT_ID')
         self.linkedin_client_secret = os.getenv('LINKEDIN_CLIENT_SECRET')
         self.facebook_token = os.getenv('FACEBOOK_ACCESS_TOKEN')
+        
+        # One pooled session so repeated lookups reuse connections
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=8, pool_maxsize=32)
+        self.session.mount('https://', adapter)
+        self.session.hooks['response'].append(_count_api_response)
     
     def analyze_instagram_profile(self, username: str) -> Dict:
         """Analyze Instagram profile using Instagram Graph API"""
@@ -46,7 +69,7 @@ class SocialMediaAPIs:
                 'access_token': self.instagram_token
             }
             
-            response = requests.get(url, params=params, timeout=10)
+            response = self.session.get(url, params=params, timeout=10)
             
             # If that fails, try alternative methods
             if response.status_code != 200:
@@ -58,7 +81,7 @@ class SocialMediaAPIs:
                 # This might work if the token is a user access token
                 alt_url = f"https://graph.instagram.com/me"
                 alt_params = {'fields': 'id,username', 'access_token': self.instagram_token}
-                alt_response = requests.get(alt_url, params=alt_params, timeout=10)
+                alt_response = self.session.get(alt_url, params=alt_params, timeout=10)
                 
                 if alt_response.status_code == 200:
                     # Token is valid but can't access other users - return partial data
@@ -77,7 +100,7 @@ class SocialMediaAPIs:
                     'limit': 25
                 }
                 
-                media_response = requests.get(media_url, params=media_params, timeout=10)
+                media_response = self.session.get(media_url, params=media_params, timeout=10)
                 posts = []
                 media_items = []  # Store actual images/videos
                 hashtags = []
@@ -115,7 +138,7 @@ class SocialMediaAPIs:
                                 'metric': 'impressions,reach',
                                 'access_token': self.instagram_token
                             }
-                            insights_response = requests.get(insights_url, params=insights_params, timeout=10)
+                            insights_response = self.session.get(insights_url, params=insights_params, timeout=10)
                             if insights_response.status_code == 200:
                                 insights = insights_response.json()
                                 total_views += insights.get('data', [{}])[0].get('values', [{}])[0].get('value', 0)
@@ -153,7 +176,7 @@ class SocialMediaAPIs:
                 'Authorization': f'Bearer {self.twitter_bearer}'
             }
             
-            user_response = requests.get(user_url, headers=headers, timeout=10)
+            user_response = self.session.get(user_url, headers=headers, timeout=10)
             
             if user_response.status_code == 200:
                 user_data = user_response.json()
@@ -167,7 +190,7 @@ class SocialMediaAPIs:
                 user_details_params = {
                     'user.fields': 'public_metrics,description,created_at'
                 }
-                user_details_response = requests.get(user_details_url, headers=headers, params=user_details_params, timeout=10)
+                user_details_response = self.session.get(user_details_url, headers=headers, params=user_details_params, timeout=10)
                 
                 user_info = user_details_response.json().get('data', {})
                 metrics = user_info.get('public_metrics', {})
@@ -179,7 +202,7 @@ class SocialMediaAPIs:
                     'tweet.fields': 'public_metrics,created_at,text',
                     'expansions': 'author_id'
                 }
-                tweets_response = requests.get(tweets_url, headers=headers, params=tweets_params, timeout=10)
+                tweets_response = self.session.get(tweets_url, headers=headers, params=tweets_params, timeout=10)
                 
                 tweets = []
                 hashtags = []
@@ -235,7 +258,7 @@ class SocialMediaAPIs:
                 'projection': '(id,firstName,lastName,headline,summary,location,profilePicture(displayImage~:playableStreams))'
             }
             
-            response = requests.get(url, headers=headers, params=params, timeout=10)
+            response = self.session.get(url, headers=headers, params=params, timeout=10)
             
             if response.status_code == 200:
                 profile_data = response.json()
@@ -246,7 +269,7 @@ class SocialMediaAPIs:
                     'q': 'authors',
                     'authors': f"List({profile_data.get('id')})"
                 }
-                posts_response = requests.get(posts_url, headers=headers, params=posts_params, timeout=10)
+                posts_response = self.session.get(posts_url, headers=headers, params=posts_params, timeout=10)
                 
                 posts = []
                 hashtags = []
@@ -292,7 +315,7 @@ class SocialMediaAPIs:
                 'access_token': self.facebook_token
             }
             
-            response = requests.get(url, params=params, timeout=10)
+            response = self.session.get(url, params=params, timeout=10)
             
             if response.status_code == 200:
                 page_data = response.json()
@@ -339,37 +362,48 @@ class SocialMediaAPIs:
         except Exception as e:
             return {"success": False, "error": str(e)}
     
-    def analyze_all_platforms(self, influencer_data: Dict) -> Dict:
-        """Analyze influencer across all platforms"""
-        results = {
-            "instagram": None,
-            "twitter": None,
-            "linkedin": None,
-            "facebook": None
+    # Influencer field holding the handle for each platform, in analysis order
+    PLATFORM_HANDLE_FIELDS = {
+        "instagram": "instagram_handle",
+        "twitter": "twitter_handle",
+        "linkedin": "linkedin_handle",
+        "facebook": "facebook_handle"
+    }
+    
+    def get_platform_handles(self, influencer_data: Dict) -> Dict[str, str]:
+        """Return {platform: handle} for every platform the influencer has a handle on"""
+        return {
+            platform: influencer_data[field]
+            for platform, field in self.PLATFORM_HANDLE_FIELDS.items()
+            if influencer_data.get(field)
         }
-        
-        # Analyze Instagram
-        if influencer_data.get('instagram_handle'):
-            results['instagram'] = self.analyze_instagram_profile(influencer_data['instagram_handle'])
-        
-        # Analyze Twitter
-        if influencer_data.get('twitter_handle'):
-            results['twitter'] = self.analyze_twitter_profile(influencer_data['twitter_handle'])
-        
-        # Analyze LinkedIn
-        if influencer_data.get('linkedin_handle'):
-            results['linkedin'] = self.analyze_linkedin_profile(influencer_data['linkedin_handle'])
-        
-        # Analyze Facebook
-        if influencer_data.get('facebook_handle'):
-            results['facebook'] = self.analyze_facebook_profile(influencer_data['facebook_handle'])
+    
+    def analyze_platform(self, platform: str, handle: str) -> Dict:
+        """Analyze a single platform profile by platform name"""
+        with span(f'social_{platform}'):
+            if platform == 'instagram':
+                result = self.analyze_instagram_profile(handle)
+            elif platform == 'twitter':
+                result = self.analyze_twitter_profile(handle)
+            elif platform == 'linkedin':
+                result = self.analyze_linkedin_profile(handle)
+            elif platform == 'facebook':
+                result = self.analyze_facebook_profile(handle)
+            else:
+                result = {"success": False, "error": f"Unsupported platform: {platform}"}
+        SOCIAL_LOOKUPS.inc(platform=platform, outcome='success' if result.get('success') else 'failed')
+        return result
+    
+    def combine_platform_results(self, results: Dict[str, Optional[Dict]]) -> Dict:
+        """Combine per-platform results into the analyze_all_platforms response shape"""
+        platforms = {platform: results.get(platform) for platform in self.PLATFORM_HANDLE_FIELDS}
         
         # Calculate overall metrics
         all_hashtags = []
         total_views = 0
         total_posts = 0
         
-        for platform, data in results.items():
+        for platform, data in platforms.items():
             if data and data.get('success'):
                 all_hashtags.extend(data.get('hashtags', []))
                 total_views += data.get('total_views', 0)
@@ -377,7 +411,7 @@ class SocialMediaAPIs:
         
         return {
             "success": True,
-            "platforms": results,
+            "platforms": platforms,
             "overall": {
                 "total_views": total_views,
                 "total_posts": total_posts,
@@ -386,5 +420,11 @@ class SocialMediaAPIs:
                 "hashtag_count": len(set(all_hashtags))
             }
         }
-
-
+    
+    def analyze_all_platforms(self, influencer_data: Dict) -> Dict:
+        """Analyze influencer across all platforms"""
+        results = {}
+        for platform, handle in self.get_platform_handles(influencer_data).items():
+            results[platform] = self.analyze_platform(platform, handle)
+        
+        return self.combine_platform_results(results)
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Ranking view refresher lease tests
+Run with: python -m pytest test_ranking_views.py
+"""
+
+import os
+import sys
+
+import pytest
+
+import ranking_views
+from influencer_store import InfluencerStore
+
+
+@pytest.mark.skipif(not hasattr(os, 'fork'), reason="needs os.fork")
+def test_forked_workers_do_not_share_the_lease(tmp_path, monkeypatch):
+    """Like a preloaded Gunicorn master: the refresher is built (and its owner read) before forking"""
+    store = InfluencerStore(str(tmp_path / 'influencers.db'))
+    monkeypatch.setattr(ranking_views, 'get_influencer_store', lambda: store)
+    refresher = ranking_views.RankingViewRefresher(ranking_views.RankingViews())
+    master_owner = refresher.owner
+
+    results = []
+    for _ in range(2):
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(read_fd)
+            acquired = refresher._renew_lease()
+            os.write(write_fd, f"{int(acquired)} {refresher.owner}".encode())
+            os._exit(0)
+        os.close(write_fd)
+        os.waitpid(pid, 0)
+        with os.fdopen(read_fd) as pipe:
+            acquired, owner = pipe.read().split()
+        results.append((acquired == '1', owner))
+
+    assert [acquired for acquired, _ in results] == [True, False]
+    owners = {owner for _, owner in results}
+    assert len(owners) == 2 and master_owner not in owners
+
+
+if __name__ == '__main__':
+    sys.exit(pytest.main([__file__, '-q']))
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Full-Text Index
+Tokenized inverted index over influencer text fields (bio, domain_niche,
+job_title, use_case, industry, category) with posting-list intersection and
+BM25 relevance ranking
+"""
+
+import math
+import re
+import threading
+from bisect import bisect_left
+from typing import Dict, Hashable, Iterable, List, Optional, Set
+
+# Indexed fields and their BM25F-style weights
+INDEXED_FIELDS = {
+    'domain_niche': 2.0,
+    'job_title': 1.5,
+    'industry': 1.5,
+    'category': 1.0,
+    'use_case': 1.0,
+    'bio': 1.0,
+}
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Query tokens at least this long also match index tokens they prefix ("tech" -> "technology")
+PREFIX_MIN_LENGTH = 3
+
+STOPWORDS = frozenset((
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'in', 'into', 'is', 'it',
+    'of', 'on', 'or', 'the', 'to', 'with', 'who', 'their', 'your', 'our', 'etc',
+))
+
+_TOKEN_RE = re.compile(r'[a-z0-9]+')
+
+
+def tokenize(text) -> List[str]:
+    """Lowercase alphanumeric tokens without stopwords"""
+    return [t for t in _TOKEN_RE.findall(str(text or '').lower()) if t not in STOPWORDS]
+
+
+def filter_keywords(filters: Dict) -> Optional[str]:
+    """Keyword query for a /api/recommendations filters dict (product type, target audience, content types)"""
+    content_type = filters.get('content_type') or []
+    if isinstance(content_type, str):
+        content_type = [content_type]
+    keywords = [filters.get('product_type'), filters.get('target_audience')] + list(content_type)
+    keywords = [str(k).strip() for k in keywords if k and str(k).strip().lower() not in ('any', 'any audience')]
+    return ' '.join(keywords) or None
+
+
+class InvertedIndex:
+    """Field-weighted inverted index with BM25 scoring"""
+
+    def __init__(self, fields: Optional[Dict[str, float]] = None):
+        self.fields = fields or INDEXED_FIELDS
+        self.postings: Dict[str, Dict[Hashable, float]] = {}  # token -> {doc_id: weighted tf}
+        self.doc_lengths: Dict[Hashable, float] = {}
+        self.doc_terms: Dict[Hashable, List[str]] = {}
+        self._total_length = 0.0
+        self._vocabulary: List[str] = []
+        self._vocabulary_dirty = False
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self.doc_lengths)
+
+    def add(self, doc_id: Hashable, doc: Dict) -> None:
+        """Index doc's fields under doc_id (replacing any previous version)"""
+        with self._lock:
+            if doc_id in self.doc_lengths:
+                self.remove(doc_id)
+            term_weights: Dict[str, float] = {}
+            length = 0.0
+            for field, weight in self.fields.items():
+                for token in tokenize(doc.get(field)):
+                    term_weights[token] = term_weights.get(token, 0.0) + weight
+                    length += weight
+            for token, tf in term_weights.items():
+                posting = self.postings.get(token)
+                if posting is None:
+                    posting = self.postings[token] = {}
+                    self._vocabulary_dirty = True
+                posting[doc_id] = tf
+            self.doc_lengths[doc_id] = length
+            self.doc_terms[doc_id] = list(term_weights)
+            self._total_length += length
+
+    def add_many(self, docs: Iterable) -> None:
+        """Index (doc_id, doc) pairs"""
+        with self._lock:
+            for doc_id, doc in docs:
+                self.add(doc_id, doc)
+
+    def remove(self, doc_id: Hashable) -> None:
+        with self._lock:
+            length = self.doc_lengths.pop(doc_id, None)
+            if length is None:
+                return
+            self._total_length -= length
+            for token in self.doc_terms.pop(doc_id, ()):
+                del self.postings[token][doc_id]
+                if not self.postings[token]:
+                    del self.postings[token]
+                    self._vocabulary_dirty = True
+
+    def _expand(self, token: str) -> List[str]:
+        """Index tokens a query token matches: itself, plus tokens it prefixes"""
+        if len(token) < PREFIX_MIN_LENGTH:
+            return [token] if token in self.postings else []
+        if self._vocabulary_dirty:
+            self._vocabulary = sorted(self.postings)
+            self._vocabulary_dirty = False
+        vocabulary = self._vocabulary
+        matches = []
+        i = bisect_left(vocabulary, token)
+        while i < len(vocabulary) and vocabulary[i].startswith(token):
+            matches.append(vocabulary[i])
+            i += 1
+        return matches
+
+    def _term_docs(self, token: str) -> Set[Hashable]:
+        docs = set()
+        for term in self._expand(token):
+            docs.update(self.postings[term])
+        return docs
+
+    def match_all(self, query: str) -> Set[Hashable]:
+        """Docs containing every query token (smallest posting lists intersected first)"""
+        with self._lock:
+            tokens = tokenize(query)
+            if not tokens:
+                return set()
+            doc_sets = sorted((self._term_docs(t) for t in set(tokens)), key=len)
+            result = doc_sets[0]
+            for docs in doc_sets[1:]:
+                if not result:
+                    break
+                result = result & docs
+            return result
+
+    def match_any(self, query: str) -> Set[Hashable]:
+        """Docs containing at least one query token"""
+        with self._lock:
+            result = set()
+            for token in set(tokenize(query)):
+                result |= self._term_docs(token)
+            return result
+
+    def score(self, query: str, doc_ids: Optional[Iterable[Hashable]] = None) -> Dict[Hashable, float]:
+        """BM25 score of every doc matching any query token (optionally only among doc_ids)"""
+        with self._lock:
+            n_docs = len(self.doc_lengths)
+            if not n_docs:
+                return {}
+            avg_length = self._total_length / n_docs or 1.0
+            allowed = set(doc_ids) if doc_ids is not None else None
+            scores: Dict[Hashable, float] = {}
+            for token in set(tokenize(query)):
+                for term in self._expand(token):
+                    posting = self.postings[term]
+                    idf = math.log(1 + (n_docs - len(posting) + 0.5) / (len(posting) + 0.5))
+                    for doc_id, tf in posting.items():
+                        if allowed is not None and doc_id not in allowed:
+                            continue
+                        norm = BM25_K1 * (1 - BM25_B + BM25_B * self.doc_lengths[doc_id] / avg_length)
+                        scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (BM25_K1 + 1) / (tf + norm)
+            return scores
+
+    def search(self, query: str, limit: Optional[int] = None, require_all: bool = False) -> List[tuple]:
+        """(doc_id, score) pairs ranked by BM25; require_all restricts to docs with every token"""
+        candidates = self.match_all(query) if require_all else None
+        scores = self.score(query, candidates)
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        return ranked[:limit] if limit else ranked
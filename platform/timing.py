@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Stage Timing
+Lightweight spans for timing pipeline stages. Every span feeds an in-process
+latency histogram per stage, and spans recorded while serving a request are
+collected so the server can report them in a Server-Timing header.
+"""
+
+import contextvars
+import re
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+
+# Histogram bucket upper bounds, in milliseconds
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000)
+
+# Spans recorded for the current request: list of (stage, duration_ms), or None outside a request
+_request_spans: contextvars.ContextVar[Optional[List[Tuple[str, float]]]] = contextvars.ContextVar(
+    'request_spans', default=None
+)
+
+
+class StageHistogram:
+    """Cumulative latency histogram for one stage"""
+
+    def __init__(self, buckets: Tuple = LATENCY_BUCKETS_MS):
+        self.buckets = buckets
+        self.bucket_counts = [0] * (len(buckets) + 1)  # last slot is +Inf
+        self.count = 0
+        self.sum_ms = 0.0
+        self.max_ms = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, duration_ms: float) -> None:
+        index = len(self.buckets)
+        for i, bound in enumerate(self.buckets):
+            if duration_ms <= bound:
+                index = i
+                break
+        with self._lock:
+            self.bucket_counts[index] += 1
+            self.count += 1
+            self.sum_ms += duration_ms
+            self.max_ms = max(self.max_ms, duration_ms)
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            cumulative = 0
+            buckets = {}
+            for bound, count in zip(list(self.buckets) + ['+Inf'], self.bucket_counts):
+                cumulative += count
+                buckets[str(bound)] = cumulative
+            return {
+                "count": self.count,
+                "sum_ms": round(self.sum_ms, 2),
+                "avg_ms": round(self.sum_ms / self.count, 2) if self.count else 0.0,
+                "max_ms": round(self.max_ms, 2),
+                "buckets_ms": buckets
+            }
+
+
+_histograms: Dict[str, StageHistogram] = {}
+_histograms_lock = threading.Lock()
+
+
+def get_histogram(stage: str) -> StageHistogram:
+    histogram = _histograms.get(stage)
+    if histogram is None:
+        with _histograms_lock:
+            histogram = _histograms.setdefault(stage, StageHistogram())
+    return histogram
+
+
+def record(stage: str, duration_ms: float) -> None:
+    """Record a finished stage in its histogram and the current request's spans"""
+    get_histogram(stage).observe(duration_ms)
+    spans = _request_spans.get()
+    if spans is not None:
+        spans.append((stage, duration_ms))
+
+
+@contextmanager
+def span(stage: str):
+    """Time the enclosed block as `stage`"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(stage, (time.perf_counter() - start) * 1000)
+
+
+def start_request() -> None:
+    """Begin collecting spans for the current request"""
+    _request_spans.set([])
+
+
+def request_spans() -> List[Tuple[str, float]]:
+    return list(_request_spans.get() or [])
+
+
+def submit_in_context(executor, fn, *args, **kwargs):
+    """executor.submit that keeps the caller's request context, so spans in worker threads are collected"""
+    ctx = contextvars.copy_context()
+    return executor.submit(ctx.run, fn, *args, **kwargs)
+
+
+def server_timing_header(spans: List[Tuple[str, float]], total_ms: Optional[float] = None) -> str:
+    """
+    Format spans as a Server-Timing header value
+
+    Repeated stages (e.g. one social lookup per influencer) are summed and
+    their call count goes in desc.
+    """
+    totals = {}
+    counts = {}
+    for stage, duration_ms in spans:
+        totals[stage] = totals.get(stage, 0.0) + duration_ms
+        counts[stage] = counts.get(stage, 0) + 1
+
+    entries = []
+    for stage, duration_ms in totals.items():
+        name = re.sub(r'[^A-Za-z0-9_.-]', '_', stage)
+        entry = f"{name};dur={duration_ms:.1f}"
+        if counts[stage] > 1:
+            entry += f';desc="{counts[stage]} calls"'
+        entries.append(entry)
+    if total_ms is not None:
+        entries.append(f"total;dur={total_ms:.1f}")
+    return ", ".join(entries)
+
+
+def histogram_snapshot() -> Dict[str, Dict]:
+    """Per-stage latency histograms for scraping"""
+    with _histograms_lock:
+        stages = dict(_histograms)
+    return {stage: histogram.snapshot() for stage, histogram in sorted(stages.items())}
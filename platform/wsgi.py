@@ -0,0 +1,11 @@
+#!/usr/bin/env python3
+"""
+WSGI entry point for production servers
+Run with: gunicorn -c gunicorn.conf.py wsgi:app
+"""
+
+from simple_server import app, shutdown_background_work, start_background_work
+
+application = app
+
+__all__ = ['app', 'application', 'shutdown_background_work', 'start_background_work']
@@ -65,6 +65,10 @@ def main():
     if check_file_exists("platform/simple_server.py", "Server file"):
         checks_passed += 1
     
+    checks_total += 1
+    if check_file_exists("platform/gunicorn.conf.py", "Gunicorn config"):
+        checks_passed += 1
+    
     checks_total += 1
     if check_file_exists("platform/frontend/index.html", "Frontend HTML"):
         checks_passed += 1
@@ -79,7 +83,7 @@ def main():
     
     # Check Procfile content
     checks_total += 1
-    if check_file_content("Procfile", "cd platform && python simple_server.py", 
+    if check_file_content("Procfile", "cd platform && gunicorn -c gunicorn.conf.py wsgi:app", 
                          "Procfile has correct start command"):
         checks_passed += 1
     